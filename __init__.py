@@ -1,32 +1,108 @@
-from importlib import reload
-from . import constants
-from . import utils
-from . import node_inspector_ui
-from . import generate_wrapper
-from . import widgets_construct
-from . import explode_hda_to_subnet
-from . import get_all_labels
-from . import edit_widget
-from . import style
-from . import populate_buttons
-from . import button_callback_manager
-
-
-# Reload modules
-reload(constants)
-reload(utils)
-reload(button_callback_manager)
-reload(populate_buttons)
-reload(edit_widget)
-reload(explode_hda_to_subnet)
-reload(get_all_labels)
-reload(node_inspector_ui)
-reload(generate_wrapper)
-reload(widgets_construct)
-reload(style)
-
-
-# Import into package namespace
-from . import node_inspector_ui as ni
-from . import generate_wrapper
-from . import widgets_construct
+"""Node inspection tools for Houdini.
+
+Importing the package loads nothing but this file. Submodules and the names
+below are imported on first access, so batch code using ``ParmInfo`` never
+pays for Qt or the UI modules::
+
+    import node_inspector
+    node_inspector.ParmInfo(node)  # imports utils now
+
+While working on the package, set ``NODE_INSPECTOR_DEV_RELOAD=1`` and
+``importlib.reload(node_inspector)`` reloads every submodule already loaded,
+or call ``node_inspector.reload_package()`` directly.
+"""
+import importlib
+import os
+import sys
+
+# Public names of the package and the submodule defining them
+_LAZY_ATTRIBUTES = {
+    "pretty_print_dict": "utils",
+    "ParmInfo": "utils",
+    "traverse_parms_from_node": "get_all_labels",
+    "generate_properties": "generate_wrapper",
+    "explode_me": "explode_hda_to_subnet",
+    "iter_node_results": "batch",
+}
+
+# Short module names used by shelf tools
+_LAZY_ALIASES = {"ni": "node_inspector_ui"}
+
+# Every submodule, dependencies before the modules importing them
+_SUBMODULES = (
+    "steps",
+    "instrumentation",
+    "constants",
+    "writers",
+    "multiparm",
+    "node_events",
+    "result_cache",
+    "hou_proxy",
+    "template_cache",
+    "utils",
+    "get_all_labels",
+    "wrapper_codegen",
+    "generate_wrapper",
+    "explode_hda_to_subnet",
+    "get_all_expressions",
+    "actions",
+    "batch",
+    "button_callback_manager",
+    "cpio_archive",
+    "hip_reader",
+    "hda_index",
+    "wrapper_package",
+    "scan",
+    "scan_pool",
+    "capture",
+    "style",
+    "widgets_construct",
+    "python_highlighter",
+    "result_model",
+    "inspection_scheduler",
+    "edit_widget",
+    "populate_buttons",
+    "node_inspector_ui",
+)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _LAZY_ALIASES:
+        value = importlib.import_module(f".{_LAZY_ALIASES[name]}", __name__)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(
+        set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_ALIASES) | set(_SUBMODULES)
+    )
+
+
+def reload_package():
+    """Reload every submodule already imported, dependencies first.
+
+    Node event callbacks of the old ``node_watcher`` are removed first, and
+    names cached in the package namespace are dropped, so the next access
+    picks up the reloaded code.
+    """
+    watcher_module = sys.modules.get(f"{__name__}.node_events")
+    if watcher_module is not None:
+        watcher_module.node_watcher.unwatch_all()
+    for name in (*_LAZY_ATTRIBUTES, *_LAZY_ALIASES):
+        globals().pop(name, None)
+    for name in _SUBMODULES:
+        module = sys.modules.get(f"{__name__}.{name}")
+        if module is not None:
+            importlib.reload(module)
+
+
+if os.environ.get("NODE_INSPECTOR_DEV_RELOAD", "") not in ("", "0"):
+    reload_package()
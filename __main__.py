@@ -0,0 +1,365 @@
+"""Command line entry point, e.g.::
+
+    hython -m node_inspector scan scene.hip --out report.ndjson
+    python -m node_inspector pool shots/*.hip --out report.ndjson --jobs 8
+    python -m node_inspector read-hip shots/*.hip --collect expressions
+    python -m node_inspector wrappers otls/*.hda --out-dir studio_wrappers
+    hython -m node_inspector capture scene.hip /obj/character --out-dir captures
+    hython -m node_inspector inspect scene.hip /obj/character --action expressions
+    hython -m node_inspector explode scene.hip /obj --type 'studio::*' --out fixed.hip
+"""
+import argparse
+import json
+import sys
+
+
+def add_scan_options(parser):
+    parser.add_argument(
+        "--root",
+        action="append",
+        dest="roots",
+        help="Network to scan, can be repeated. Defaults to /",
+    )
+    parser.add_argument(
+        "--type",
+        action="append",
+        dest="types",
+        help="Node type glob, e.g. 'Sop/*' or 'box'. Can be repeated",
+    )
+    parser.add_argument("--max-depth", type=int, help="Deepest level below each root")
+    parser.add_argument(
+        "--collect",
+        help="Comma separated action names. Defaults to the actions scanned by default",
+    )
+
+
+def scan_options_to_args(args):
+    """Turn parsed scan options back into command line arguments for workers."""
+    argv = []
+    for root in args.roots or ():
+        argv += ["--root", root]
+    for node_type in args.types or ():
+        argv += ["--type", node_type]
+    if args.max_depth is not None:
+        argv += ["--max-depth", str(args.max_depth)]
+    if args.collect:
+        argv += ["--collect", args.collect]
+    return argv
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="node_inspector")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="Scan hip files into an NDJSON report")
+    scan.add_argument("hip_files", nargs="+", help="Hip files to scan")
+    scan.add_argument("--out", help="Report file. Defaults to stdout")
+    scan.add_argument(
+        "--trace",
+        help="Write a Chrome trace of the scan to this file and print a summary",
+    )
+    add_scan_options(scan)
+
+    worker = commands.add_parser(
+        "worker", help="Scan hip paths read from stdin (used by 'pool')"
+    )
+    add_scan_options(worker)
+
+    pool = commands.add_parser(
+        "pool", help="Scan many hip files with a pool of hython workers"
+    )
+    pool.add_argument("hip_files", nargs="+", help="Hip files to scan")
+    pool.add_argument("--out", help="Report file. Defaults to stdout")
+    pool.add_argument("--hython", default="hython", help="hython executable")
+    pool.add_argument("--jobs", type=int, help="Number of workers. Defaults to CPU count")
+    pool.add_argument("--timeout", type=float, help="Seconds allowed per file")
+    pool.add_argument("--retries", type=int, default=1, help="Extra attempts per file")
+    pool.add_argument(
+        "--files-per-worker", type=int, help="Restart workers after this many files"
+    )
+    pool.add_argument(
+        "--stub-worker",
+        action="store_true",
+        help="Use the stand-in worker that needs no Houdini",
+    )
+    add_scan_options(pool)
+
+    read_hip = commands.add_parser(
+        "read-hip", help="Read hip files without Houdini into an NDJSON report"
+    )
+    read_hip.add_argument("hip_files", nargs="+", help="Hip files to read")
+    read_hip.add_argument("--out", help="Report file. Defaults to stdout")
+    read_hip.add_argument(
+        "--type",
+        action="append",
+        dest="types",
+        help="Node type glob, e.g. 'geo' or 'box'. Can be repeated",
+    )
+    read_hip.add_argument(
+        "--collect",
+        default="values,expressions,user_data",
+        help="Comma separated: values, expressions, keyframes, user_data",
+    )
+
+    wrappers = commands.add_parser(
+        "wrappers", help="Generate a wrapper package for HDA libraries"
+    )
+    wrappers.add_argument("libraries", nargs="+", help=".hda/.otl files")
+    wrappers.add_argument(
+        "--out-dir", required=True, help="Directory of the generated package"
+    )
+
+    inspect = commands.add_parser(
+        "inspect", help="Run inspection actions on nodes and print their results"
+    )
+    inspect.add_argument("hip_file", help="Hip file to load")
+    inspect.add_argument("node_paths", nargs="+", help="Nodes to inspect")
+    inspect.add_argument(
+        "--action",
+        action="append",
+        dest="actions",
+        required=True,
+        help="Action name, e.g. 'labels' or 'expressions'. Can be repeated",
+    )
+
+    explode = commands.add_parser(
+        "explode", help="Explode nodes into subnets and save the result"
+    )
+    explode.add_argument("hip_file", help="Hip file to load")
+    explode.add_argument(
+        "node_paths", nargs="+", help="Nodes to explode, or networks with --type"
+    )
+    explode.add_argument(
+        "--type",
+        action="append",
+        dest="types",
+        help="Explode the nodes of this type glob inside the given networks. "
+        "Can be repeated",
+    )
+    explode.add_argument(
+        "--nested-depth",
+        type=int,
+        default=0,
+        help="Levels of locked HDAs inside the nodes to explode as well",
+    )
+    explode.add_argument("--out", help="Hip file to save, required unless --dry-run")
+    explode.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print what would be written and the estimated cost, change nothing",
+    )
+
+    capture = commands.add_parser(
+        "capture", help="Capture nodes into files replayable by the benchmarks"
+    )
+    capture.add_argument("hip_file", help="Hip file to load")
+    capture.add_argument("node_paths", nargs="+", help="Nodes to capture")
+    capture.add_argument(
+        "--out-dir", default=".", help="Directory of the capture files"
+    )
+    return parser
+
+
+def scan_kwargs(args):
+    from .actions import registry
+
+    collectors = None
+    if args.collect:
+        names = [name.strip() for name in args.collect.split(",") if name.strip()]
+        try:
+            collectors = registry.collectors(names)
+        except (KeyError, ValueError) as error:
+            raise SystemExit(error.args[0])
+
+    return dict(
+        roots=args.roots or ["/"],
+        node_type_filter=args.types,
+        max_depth=args.max_depth,
+        collectors=collectors,
+    )
+
+
+def run_scan(args):
+    from .scan import scan_hip
+    from .instrumentation import instrumentation
+
+    kwargs = scan_kwargs(args)
+    if args.trace:
+        instrumentation.enable()
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        for hip_path in args.hip_files:
+            with instrumentation.span("scan_hip", "action", hip=hip_path):
+                scan_hip(hip_path, out, **kwargs)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if args.trace:
+            instrumentation.export_chrome_trace(args.trace)
+            print(instrumentation.summary(), file=sys.stderr)
+
+
+def run_worker(args):
+    from .scan import scan_hip
+
+    kwargs = scan_kwargs(args)
+    for line in sys.stdin:
+        hip_path = line.strip()
+        if not hip_path:
+            continue
+        error = None
+        try:
+            scan_hip(hip_path, sys.stdout, **kwargs)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        sys.stdout.write(json.dumps({"__done__": hip_path, "error": error}) + "\n")
+        sys.stdout.flush()
+
+
+def run_pool(args):
+    from .scan_pool import STUB_WORKER, print_progress, scan_pool, worker_command
+
+    if args.stub_worker:
+        command = [sys.executable, STUB_WORKER]
+    else:
+        command = worker_command(args.hython, scan_options_to_args(args))
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        summary = scan_pool(
+            args.hip_files,
+            out,
+            command=command,
+            jobs=args.jobs,
+            timeout=args.timeout,
+            retries=args.retries,
+            files_per_worker=args.files_per_worker,
+            progress=print_progress,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    sys.stderr.write(summary.format() + "\n")
+    if summary.failed:
+        raise SystemExit(1)
+
+
+def run_read_hip(args):
+    from .hip_reader import HipReader
+
+    collect = tuple(name.strip() for name in args.collect.split(","))
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        for hip_path in args.hip_files:
+            with HipReader(hip_path) as reader:
+                for record in reader.iter_records(collect, args.types):
+                    out.write(json.dumps(record) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def run_wrappers(args):
+    from .wrapper_package import generate_wrapper_package
+
+    report = generate_wrapper_package(args.libraries, args.out_dir)
+    sys.stderr.write(
+        f"{len(report['generated'])} generated, {len(report['unchanged'])} unchanged, "
+        f"{len(report['removed'])} removed\n"
+    )
+    for shadowed in report["shadowed"]:
+        sys.stderr.write(f"Skipped {shadowed}, defined by an earlier library\n")
+
+
+def run_inspect(args):
+    import hou
+    from .actions import registry
+    from .hou_proxy import HouTransaction
+    from .utils import ParmInfo
+
+    try:
+        actions = [registry.get(name) for name in args.actions]
+    except KeyError as error:
+        raise SystemExit(error.args[0])
+    hou.hipFile.load(
+        args.hip_file, suppress_save_prompt=True, ignore_load_warnings=True
+    )
+    for node_path in args.node_paths:
+        node = hou.node(node_path)
+        if node is None:
+            raise SystemExit(f"No node at {node_path} in {args.hip_file}")
+        for action in actions:
+            if action.read_only:
+                with HouTransaction() as transaction:
+                    proxy = transaction.wrap(node)
+                    result = action.run(proxy, ParmInfo(proxy))
+            else:
+                result = action.run(node, ParmInfo(node))
+            sys.stdout.write(f"# {node_path} {action.name}\n")
+            sys.stdout.write(action.to_text(result) + "\n\n")
+
+
+def run_explode(args):
+    import hou
+    from .batch import iter_nodes
+    from .explode_hda_to_subnet import (
+        explode_nodes,
+        format_explode_report,
+        format_plan_report,
+        plan_nodes,
+    )
+
+    if not args.dry_run and not args.out:
+        raise SystemExit("--out is required unless --dry-run is given")
+    hou.hipFile.load(
+        args.hip_file, suppress_save_prompt=True, ignore_load_warnings=True
+    )
+    nodes = []
+    for node_path in args.node_paths:
+        node = hou.node(node_path)
+        if node is None:
+            raise SystemExit(f"No node at {node_path} in {args.hip_file}")
+        if args.types:
+            nodes.extend(iter_nodes(node, args.types))
+        else:
+            nodes.append(node)
+    if args.dry_run:
+        plans = plan_nodes(nodes, args.nested_depth)
+        sys.stdout.write(format_plan_report(plans) + "\n")
+        return
+    results = explode_nodes(nodes, nested_depth=args.nested_depth)
+    sys.stderr.write(format_explode_report(results) + "\n")
+    hou.hipFile.save(args.out)
+    if any(result.error for result in results):
+        raise SystemExit(1)
+
+
+def run_capture(args):
+    from .capture import capture_hip
+
+    for path in capture_hip(args.hip_file, args.node_paths, args.out_dir):
+        sys.stderr.write(f"Captured {path}\n")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "scan":
+        run_scan(args)
+    elif args.command == "worker":
+        run_worker(args)
+    elif args.command == "pool":
+        run_pool(args)
+    elif args.command == "read-hip":
+        run_read_hip(args)
+    elif args.command == "wrappers":
+        run_wrappers(args)
+    elif args.command == "inspect":
+        run_inspect(args)
+    elif args.command == "explode":
+        run_explode(args)
+    elif args.command == "capture":
+        run_capture(args)
+
+
+if __name__ == "__main__":
+    main()
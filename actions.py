@@ -0,0 +1,350 @@
+"""Inspection actions and the registry the UI, batch scans and CLI dispatch through.
+
+An action collects a result from a node and returns it; it never touches a
+widget. How the result is shown, cached or scanned is decided by the
+registry's users from the action's metadata::
+
+    from node_inspector.actions import Action, registry
+
+    def collect_rig_controls(node, parm_info):
+        return "\n".join(parm.name() for parm in node.parms() if ...)
+
+    registry.register(
+        Action("rig_controls", collect_rig_controls, label="Rig Controls")
+    )
+
+Studio packages can ship actions without touching this package by declaring
+an entry point in the ``node_inspector.actions`` group, named after the
+action and pointing to an ``Action``::
+
+    [project.entry-points."node_inspector.actions"]
+    rig_controls = "studio_inspectors.rig:RIG_CONTROLS"
+
+Entry points are listed the first time the registry is asked for its
+actions, and only imported when the action is first used, e.g. when its
+button is pressed.
+"""
+from importlib import metadata
+from logging import getLogger
+from typing import Callable, NamedTuple, Optional
+
+from .steps import run_steps, single_step
+from .utils import pretty_print_dict
+
+logger = getLogger(__name__)
+
+ENTRY_POINT_GROUP = "node_inspector.actions"
+
+# How the UI shows a result: ``text`` as plain text, ``data`` in the tree
+# view and ``parms`` ({parm name: value}) in the tree view grouped by folder
+DISPLAYS = ("text", "data", "parms")
+
+# Limits for user data dumps, which can hold very large JSON blobs
+USER_DATA_LIMITS = {"max_depth": 8, "max_items": 500, "max_bytes": 2 * 1024 * 1024}
+
+
+class Action(NamedTuple):
+    """An inspection action and how it may be run.
+
+    Attributes:
+        name (str): Unique name, used for caching and as the scan result key.
+        collect (Callable): ``collect(node, parm_info)`` returning the result.
+            With ``time_sliced`` it is a step generator function instead, see
+            ``utils.run_steps``.
+        label (str, optional): Button text. Actions without one are not shown in the UI.
+        display (str): One of ``DISPLAYS``.
+        render_text (Callable, optional): Turns the result into text for the CLI
+            and the widget's text mode. Defaults to ``str`` for text results and
+            ``pretty_print_dict`` otherwise.
+        read_only (bool): Whether the action leaves the scene untouched. Read-only
+            actions run against memoizing hou proxies, see ``hou_proxy``.
+        cacheable (bool): Whether results can be reused while the node is unchanged.
+        batchable (bool): Whether batch scans may run the action on many nodes.
+        scan_by_default (bool): Whether batch scans run it when no collectors are given.
+        time_sliced (bool): Whether ``collect`` is a step generator function.
+    """
+
+    name: str
+    collect: Callable
+    label: Optional[str] = None
+    display: str = "text"
+    render_text: Optional[Callable] = None
+    read_only: bool = True
+    cacheable: bool = True
+    batchable: bool = True
+    scan_by_default: bool = True
+    time_sliced: bool = False
+
+    def steps(self, node, parm_info):
+        """Step generator collecting the result, see ``utils.run_steps``."""
+        if self.time_sliced:
+            return self.collect(node, parm_info)
+        return single_step(self.collect, node, parm_info)
+
+    def run(self, node, parm_info):
+        """Collect the result in one go.
+
+        Args:
+            node (hou.Node): Node to inspect.
+            parm_info (ParmInfo): Parm info of the node.
+
+        Returns:
+            The action's result.
+        """
+        return run_steps(self.steps(node, parm_info))
+
+    def to_text(self, result) -> str:
+        """Render a result of this action as text."""
+        if self.render_text is not None:
+            return self.render_text(result)
+        if self.display == "text":
+            return str(result)
+        return pretty_print_dict(result, indent=1)
+
+
+class ActionRegistry:
+    """Actions by name, in registration order.
+
+    Entry point actions are only imported by ``get()`` and the functions
+    that need their metadata, so listing names and labels stays cheap.
+
+    Args:
+        entry_point_group (str, optional): Entry point group listed by
+            ``discover()`` the first time names are needed, not before.
+    """
+
+    def __init__(self, entry_point_group=None):
+        self._actions = {}
+        self._entry_points = {}
+        self._pending_group = entry_point_group
+
+    def register(self, action, replace=False):
+        """Add an action.
+
+        Args:
+            action (Action): Action to add.
+            replace (bool, optional): Whether to replace an action of the same name.
+
+        Raises:
+            ValueError: If the name is taken and ``replace`` is False, or the
+                display is unknown.
+        """
+        if action.display not in DISPLAYS:
+            raise ValueError(
+                f"Action {action.name} has an unknown display {action.display!r}"
+            )
+        if not replace and action.name in self._actions:
+            raise ValueError(f"An action named {action.name} is already registered")
+        self._entry_points.pop(action.name, None)
+        self._actions[action.name] = action
+
+    def discover(self, group=ENTRY_POINT_GROUP):
+        """List the actions declared as entry points, without importing them.
+
+        Registered actions win over entry points of the same name.
+
+        Args:
+            group (str, optional): Entry point group.
+        """
+        entry_points = metadata.entry_points()
+        if hasattr(entry_points, "select"):
+            entry_points = entry_points.select(group=group)
+        else:
+            # Python 3.9 returns a dict of groups
+            entry_points = entry_points.get(group, ())
+        for entry_point in entry_points:
+            if entry_point.name not in self._actions:
+                self._entry_points[entry_point.name] = entry_point
+
+    def _discover_pending(self):
+        if self._pending_group is not None:
+            group, self._pending_group = self._pending_group, None
+            self.discover(group)
+
+    def _load(self, name):
+        entry_point = self._entry_points.pop(name)
+        action = entry_point.load()
+        if not isinstance(action, Action) or action.name != name:
+            raise TypeError(
+                f"Entry point {entry_point.value} must be an Action named {name}"
+            )
+        self.register(action)
+        return action
+
+    def names(self) -> list:
+        """Names of every action, loaded or not."""
+        self._discover_pending()
+        return [*self._actions, *self._entry_points]
+
+    def get(self, name) -> Action:
+        """Get an action, importing it if it comes from an entry point.
+
+        Args:
+            name (str): Action name.
+
+        Returns:
+            Action: The action.
+
+        Raises:
+            KeyError: If there is no such action.
+        """
+        action = self._actions.get(name)
+        if action is not None:
+            return action
+        self._discover_pending()
+        if name in self._entry_points:
+            return self._load(name)
+        raise KeyError(f"Unknown action {name}. Available: {', '.join(self.names())}")
+
+    def __contains__(self, name):
+        if name in self._actions:
+            return True
+        self._discover_pending()
+        return name in self._entry_points
+
+    def actions(self) -> list:
+        """Every action, importing the entry points not loaded yet."""
+        actions = []
+        for name in self.names():
+            try:
+                actions.append(self.get(name))
+            except Exception:
+                logger.exception("Could not load action %s", name)
+        return actions
+
+    def button_labels(self) -> dict:
+        """Button text to action name, for every action shown in the UI.
+
+        Entry point actions are labelled after their name until they are loaded.
+        """
+        labels = {}
+        for name in self.names():
+            action = self._actions.get(name)
+            if action is None:
+                labels[" ".join(name.split("_")).title()] = name
+            elif action.label:
+                labels[action.label] = name
+        return labels
+
+    def collectors(self, names=None) -> dict:
+        """Batch collectors, ``collect(node, parm_info)`` keyed by action name.
+
+        Args:
+            names (list, optional): Actions to include. Defaults to the batchable
+                actions scanned by default.
+
+        Returns:
+            dict: Collectors for ``batch.iter_node_results``.
+
+        Raises:
+            KeyError: If a name is unknown.
+            ValueError: If a named action is not batchable.
+        """
+        if names is None:
+            actions = [
+                action
+                for action in self.actions()
+                if action.batchable and action.scan_by_default
+            ]
+        else:
+            actions = [self.get(name) for name in names]
+            unbatchable = [action.name for action in actions if not action.batchable]
+            if unbatchable:
+                raise ValueError(f"Actions can't be batched: {', '.join(unbatchable)}")
+        return {action.name: action.run for action in actions}
+
+
+def parm_values_action(method_name):
+    """``collect`` of an action returning ``{parm name: value}`` from a ParmInfo method.
+
+    The node is read through ``ParmInfo.snapshot_steps``, so the action can
+    be time sliced.
+
+    Args:
+        method_name (str): ``ParmInfo`` method, e.g. ``get_parm_expressions``.
+    """
+
+    def collect(node, parm_info):
+        yield from parm_info.snapshot_steps()
+        return getattr(parm_info, method_name)()
+
+    collect.__name__ = method_name
+    return collect
+
+
+def collect_user_data(node, parm_info):
+    return node.userDataDict()
+
+
+def collect_labels(node, parm_info):
+    from .get_all_labels import traverse_parms_from_node
+
+    return traverse_parms_from_node(node)
+
+
+def collect_wrapper(node, parm_info):
+    from .generate_wrapper import generate_properties
+
+    return generate_properties(node)
+
+
+def explode(node, parm_info):
+    from .explode_hda_to_subnet import explode_me
+
+    explode_me(node)
+    return {"exploded": node.path()}
+
+
+def _parm_values(name, label, method_name, scan_by_default=True):
+    return Action(
+        name,
+        parm_values_action(method_name),
+        label=label,
+        display="parms",
+        scan_by_default=scan_by_default,
+        time_sliced=True,
+    )
+
+
+# Shared by the whole package, in button order
+registry = ActionRegistry(ENTRY_POINT_GROUP)
+for _action in (
+    Action(
+        "user_data",
+        collect_user_data,
+        label="Get User Data",
+        display="data",
+        render_text=lambda data: pretty_print_dict(data, **USER_DATA_LIMITS),
+    ),
+    Action("labels", collect_labels, label="Get Labels"),
+    _parm_values(
+        "defaults", "Get All Defaults", "get_parm_default_values", scan_by_default=False
+    ),
+    _parm_values("expressions", "Get All Expressions", "get_parm_expressions"),
+    _parm_values("callbacks", "Get All Callbacks", "get_parm_callbacks"),
+    _parm_values("conditionals", "Get All Conditionals", "get_parm_conditionals"),
+    Action(
+        "wrapper", collect_wrapper, label="Generate Wrapper", scan_by_default=False
+    ),
+    Action(
+        "explode",
+        explode,
+        label="Explode To Subnetwork",
+        render_text=lambda result: (
+            f"Exploded node:\n\t{result['exploded']}\nto Subnetwork"
+        ),
+        read_only=False,
+        cacheable=False,
+        batchable=False,
+    ),
+    Action(
+        "parm_names",
+        parm_values_action("get_parm_names"),
+        display="data",
+        render_text="\n".join,
+        scan_by_default=False,
+        time_sliced=True,
+    ),
+):
+    registry.register(_action)
+del _action
@@ -0,0 +1,132 @@
+from fnmatch import fnmatchcase
+from typing import Callable, Iterator, NamedTuple
+
+from .actions import registry
+from .hou_proxy import HouTransaction
+from .instrumentation import instrumentation
+from .utils import ParmInfo, node_validator
+
+
+class NodeResult(NamedTuple):
+    """Collected results of one node.
+
+    Attributes:
+        path (str): Node path.
+        type_name (str): Node type name with category, e.g. ``Sop/box``.
+        results (dict): Collector results keyed by collector name.
+        errors (dict): Error messages of failed collectors keyed by collector name.
+    """
+
+    path: str
+    type_name: str
+    results: dict
+    errors: dict
+
+
+def make_type_filter(node_type_filter) -> Callable:
+    """Turn a node type filter into a predicate.
+
+    Args:
+        node_type_filter (str, list, Callable or None): Glob pattern(s) matched
+            against the type name and the type name with category
+            (``box``, ``Sop/box``, ``Sop/*``), or a predicate taking a node.
+
+    Returns:
+        Callable: Predicate taking a hou.Node.
+    """
+    if node_type_filter is None:
+        return lambda node: True
+    if callable(node_type_filter):
+        return node_type_filter
+    patterns = (
+        [node_type_filter] if isinstance(node_type_filter, str) else list(node_type_filter)
+    )
+
+    def type_filter(node):
+        node_type = node.type()
+        names = (node_type.name(), node_type.nameWithCategory())
+        return any(
+            fnmatchcase(name, pattern) for pattern in patterns for name in names
+        )
+
+    return type_filter
+
+
+def iter_nodes(root, node_type_filter=None, max_depth=None, include_root=False):
+    """Walk a network depth first without building the list of nodes.
+
+    Args:
+        root (hou.Node or str): Node to start from.
+        node_type_filter (str, list, Callable, optional): See ``make_type_filter``.
+            Nodes that don't match are skipped but their children are still walked.
+        max_depth (int, optional): Deepest level to visit, 1 being the children of root.
+        include_root (bool, optional): Whether to yield root itself.
+
+    Yields:
+        hou.Node: Matching nodes.
+    """
+    root = node_validator(root, raise_error=True)
+    type_filter = make_type_filter(node_type_filter)
+
+    if include_root and type_filter(root):
+        yield root
+
+    # Stack of child iterators, one per level being walked
+    stack = [iter(root.children())]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+        if type_filter(node):
+            yield node
+        if max_depth is None or len(stack) < max_depth:
+            stack.append(iter(node.children()))
+
+
+def iter_node_results(
+    root,
+    node_type_filter=None,
+    max_depth=None,
+    collectors=None,
+    include_root=False,
+) -> Iterator[NodeResult]:
+    """Inspect a whole network lazily, one node at a time.
+
+    Consumers can start working on the first result before the walk is done,
+    and only one node's results are held at a time. Nodes of the same type
+    share their template analysis through ``template_cache``.
+
+    Args:
+        root (hou.Node or str): Node to start from.
+        node_type_filter (str, list, Callable, optional): See ``make_type_filter``.
+        max_depth (int, optional): Deepest level to visit, 1 being the children of root.
+        collectors (dict, optional): Collectors taking ``(node, parm_info)`` and
+            returning plain data, keyed by name. Defaults to the actions
+            ``actions.registry`` scans by default.
+        include_root (bool, optional): Whether to inspect root itself.
+
+    Yields:
+        NodeResult: Results of each matching node.
+    """
+    if collectors is None:
+        collectors = registry.collectors()
+
+    for node in iter_nodes(root, node_type_filter, max_depth, include_root):
+        # Collectors of one node share memoized hou calls
+        with HouTransaction() as transaction:
+            node = transaction.wrap(node)
+            parm_info = ParmInfo(node)
+            results = {}
+            errors = {}
+            for name, collect in collectors.items():
+                try:
+                    with instrumentation.span(name, "collect"):
+                        results[name] = collect(node, parm_info)
+                except Exception as error:
+                    # One failing collector must not end the scan of the network
+                    errors[name] = f"{type(error).__name__}: {error}"
+            result = NodeResult(
+                node.path(), node.type().nameWithCategory(), results, errors
+            )
+        yield result
@@ -0,0 +1,819 @@
+"""Pure Python stand-in for the parts of ``hou`` this package uses.
+
+Only meant for benchmarks: nodes, parm templates and parms behave like
+their Houdini counterparts closely enough for the inspection code paths,
+but nothing cooks and most of the API is missing.
+
+Install it before importing the package::
+
+    sys.modules["hou"] = fake_hou
+"""
+import contextlib
+import enum
+import itertools
+
+
+class Error(Exception):
+    pass
+
+
+class OperationFailed(Error):
+    pass
+
+
+class ObjectWasDeleted(Error):
+    pass
+
+
+class parmTemplateType(enum.Enum):
+    Int = 1
+    Float = 2
+    String = 3
+    Toggle = 4
+    Menu = 5
+    Button = 6
+    FolderSet = 7
+    Folder = 8
+    Separator = 9
+    Label = 10
+    Ramp = 11
+    Data = 12
+
+
+class parmNamingScheme(enum.Enum):
+    Base1 = 1
+    XYZW = 2
+    RGBA = 3
+    UVW = 4
+
+
+class folderType(enum.Enum):
+    Collapsible = 1
+    Simple = 2
+    Tabs = 3
+    RadioButtons = 4
+    MultiparmBlock = 5
+    ScrollingMultiparmBlock = 6
+    TabbedMultiparmBlock = 7
+    ImportBlock = 8
+
+
+MULTIPARM_FOLDER_TYPES = (
+    folderType.MultiparmBlock,
+    folderType.ScrollingMultiparmBlock,
+    folderType.TabbedMultiparmBlock,
+)
+
+
+class parmCondType(enum.Enum):
+    DisableWhen = 1
+    HideWhen = 2
+    NoCookWhen = 3
+
+
+class scriptLanguage(enum.Enum):
+    Python = 1
+    Hscript = 2
+
+
+class exprLanguage(enum.Enum):
+    Python = 1
+    Hscript = 2
+
+
+class rampBasis(enum.Enum):
+    Linear = 1
+    Constant = 2
+
+
+class nodeEventType(enum.Enum):
+    BeingDeleted = 1
+    NameChanged = 2
+    ParmTupleChanged = 3
+    SpareParmTemplatesChanged = 4
+    ChildCreated = 5
+    ChildDeleted = 6
+    CustomDataChanged = 7
+
+
+class updateMode(enum.Enum):
+    AutoUpdate = 1
+    OnMouseUp = 2
+    Manual = 3
+
+
+class Vector2(tuple):
+    def __new__(cls, x=0.0, y=0.0):
+        return super().__new__(cls, (x, y))
+
+    def __add__(self, other):
+        return Vector2(self[0] + other[0], self[1] + other[1])
+
+
+# Parm templates
+
+
+class ParmTemplate:
+    _type = None
+
+    def __init__(
+        self,
+        name,
+        label="",
+        num_components=1,
+        default_value=(),
+        is_hidden=False,
+        script_callback="",
+        script_callback_language=scriptLanguage.Hscript,
+        conditionals=None,
+        tags=None,
+    ):
+        self._name = name
+        self._label = label
+        self._num_components = num_components
+        self._default = tuple(default_value) or (0,) * num_components
+        self._hidden = is_hidden
+        self._callback = script_callback
+        self._callback_language = script_callback_language
+        self._conditionals = dict(conditionals or {})
+        self._tags = dict(tags or {})
+
+    def name(self):
+        return self._name
+
+    def label(self):
+        return self._label
+
+    def type(self):
+        return self._type
+
+    def numComponents(self):
+        return self._num_components
+
+    def namingScheme(self):
+        if self._type == parmTemplateType.Float and 1 < self._num_components <= 4:
+            return parmNamingScheme.XYZW
+        return parmNamingScheme.Base1
+
+    def isHidden(self):
+        return self._hidden
+
+    def scriptCallback(self):
+        return self._callback
+
+    def scriptCallbackLanguage(self):
+        return self._callback_language
+
+    def conditionals(self):
+        return dict(self._conditionals)
+
+    def setConditional(self, cond_type, conditional):
+        self._conditionals[cond_type] = conditional
+
+    def tags(self):
+        return dict(self._tags)
+
+    def setTags(self, tags):
+        self._tags = dict(tags)
+
+    def defaultValue(self):
+        return self._default
+
+    def clone(self):
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+
+class FloatParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Float
+
+
+class IntParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Int
+
+
+class StringParmTemplate(ParmTemplate):
+    _type = parmTemplateType.String
+
+    def __init__(self, name, label="", num_components=1, default_value=(), **kwargs):
+        super().__init__(
+            name, label, num_components, tuple(default_value) or ("",), **kwargs
+        )
+
+
+class ToggleParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Toggle
+
+    def defaultValue(self):
+        return bool(self._default[0])
+
+
+class MenuParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Menu
+
+    def defaultValue(self):
+        return self._default[0]
+
+
+class RampParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Ramp
+
+    def defaultValue(self):
+        return self._default[0]
+
+
+class DataParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Data
+
+
+class ButtonParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Button
+
+    def __getattribute__(self, name):
+        if name == "defaultValue":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+class LabelParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Label
+
+    def __getattribute__(self, name):
+        if name == "defaultValue":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+class SeparatorParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Separator
+
+    def __getattribute__(self, name):
+        if name == "defaultValue":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+class FolderParmTemplate(ParmTemplate):
+    _type = parmTemplateType.Folder
+
+    def __init__(
+        self, name, label="", parm_templates=(), folder_type=folderType.Tabs, **kwargs
+    ):
+        super().__init__(name, label, **kwargs)
+        self._templates = list(parm_templates)
+        self._folder_type = folder_type
+
+    def __getattribute__(self, name):
+        if name == "defaultValue":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+    def parmTemplates(self):
+        return tuple(self._templates)
+
+    def folderType(self):
+        return self._folder_type
+
+    def addParmTemplate(self, parm_template):
+        self._templates.append(parm_template)
+
+
+class ParmTemplateGroup:
+    def __init__(self, parm_templates=()):
+        self._templates = list(parm_templates)
+
+    def parmTemplates(self):
+        return tuple(self._templates)
+
+    def entries(self):
+        return tuple(self._templates)
+
+    def append(self, parm_template):
+        self._templates.append(parm_template)
+
+    def find(self, name):
+        stack = list(self._templates)
+        while stack:
+            parm_template = stack.pop()
+            if parm_template.name() == name:
+                return parm_template
+            if parm_template.type() == parmTemplateType.Folder:
+                stack.extend(parm_template.parmTemplates())
+        return None
+
+
+# Parms
+
+
+class Keyframe:
+    def __init__(self, frame=1.0, value=0.0, expression=None):
+        self._frame = frame
+        self._value = value
+        self._expression = expression
+
+    def frame(self):
+        return self._frame
+
+    def value(self):
+        return self._value
+
+    def isValueSet(self):
+        return self._value is not None
+
+    def expression(self):
+        return self._expression
+
+    def isExpressionSet(self):
+        return self._expression is not None
+
+
+class Parm:
+    def __init__(self, node, name, template, value=0):
+        self._node = node
+        self._name = name
+        self._template = template
+        self._value = value
+        self._expression = None
+        self._expression_language = exprLanguage.Hscript
+        self._keyframes = ()
+        self._indices = ()
+
+    def name(self):
+        return self._name
+
+    def node(self):
+        return self._node
+
+    def parmTemplate(self):
+        return self._template
+
+    def eval(self):
+        return self._value
+
+    def evalAsString(self):
+        return str(self._value)
+
+    def unexpandedString(self):
+        if self._template.type() != parmTemplateType.String:
+            raise OperationFailed("Parameter is not a string")
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        # Multiparm counters create or remove instances
+        if (
+            self._template.type() == parmTemplateType.Folder
+            and self._template.folderType() in MULTIPARM_FOLDER_TYPES
+        ):
+            instances = self._node._multiparm_instances
+            if instances.get(self._template.name()) != int(value):
+                instances[self._template.name()] = int(value)
+                self._node._build_parms()
+
+    def expression(self):
+        if self._expression is None:
+            raise OperationFailed("Parameter has no expression")
+        return self._expression
+
+    def expressionLanguage(self):
+        return self._expression_language
+
+    def setExpression(self, expression, language=None):
+        self._expression = expression
+        self._expression_language = language or exprLanguage.Hscript
+
+    def keyframes(self):
+        # Like Houdini, an expression lives on a keyframe
+        if not self._keyframes and self._expression is not None:
+            return (Keyframe(1.0, None, self._expression),)
+        return self._keyframes
+
+    def setKeyframe(self, keyframe):
+        self._keyframes = self._keyframes + (keyframe,)
+
+    def setKeyframes(self, keyframes):
+        self._keyframes = self._keyframes + tuple(keyframes)
+
+    def multiParmInstanceIndices(self):
+        return self._indices
+
+    def isVisible(self):
+        return not self._template.isHidden()
+
+
+class ParmTuple:
+    def __init__(self, node, name, parms):
+        self._node = node
+        self._name = name
+        self._parms = tuple(parms)
+
+    def name(self):
+        return self._name
+
+    def node(self):
+        return self._node
+
+    def parmTemplate(self):
+        return self._parms[0].parmTemplate()
+
+    def __iter__(self):
+        return iter(self._parms)
+
+    def __len__(self):
+        return len(self._parms)
+
+    def eval(self):
+        return tuple(parm.eval() for parm in self._parms)
+
+    def evalAsFloats(self):
+        return tuple(float(parm.eval()) for parm in self._parms)
+
+    def evalAsInts(self):
+        return tuple(int(parm.eval()) for parm in self._parms)
+
+    def evalAsStrings(self):
+        return tuple(str(parm.eval()) for parm in self._parms)
+
+    def set(self, values):
+        for parm, value in zip(self._parms, values):
+            parm.set(value)
+
+
+def _component_names(parm_template):
+    """Parm names of a template's components, following Houdini's suffixes."""
+    name = parm_template.name()
+    size = parm_template.numComponents()
+    if size == 1:
+        return [name]
+    if parm_template.namingScheme() == parmNamingScheme.XYZW:
+        return [name + suffix for suffix in "xyzw"[:size]]
+    return [f"{name}{index}" for index in range(1, size + 1)]
+
+
+def _instance_name(name, indices):
+    for index in indices:
+        name = name.replace("#", str(index), 1)
+    return name
+
+
+# Nodes
+
+
+class HDADefinition:
+    def __init__(self, library_path="/tmp/fake.hda", version="1.0", modification_time=0):
+        self._library_path = library_path
+        self._version = version
+        self._modification_time = modification_time
+
+    def libraryFilePath(self):
+        return self._library_path
+
+    def version(self):
+        return self._version
+
+    def modificationTime(self):
+        return self._modification_time
+
+
+class NodeType:
+    def __init__(self, name, category="Sop", definition=None):
+        self._name = name
+        self._category = category
+        self._definition = definition
+
+    def name(self):
+        return self._name
+
+    def nameWithCategory(self):
+        return f"{self._category}/{self._name}"
+
+    def definition(self):
+        return self._definition
+
+
+class OutputConnection:
+    def __init__(self, input_node, output_node, input_index):
+        self._input_node = input_node
+        self._output_node = output_node
+        self._input_index = input_index
+
+    def outputItem(self):
+        return self._output_node
+
+    def inputIndex(self):
+        return self._input_index
+
+    def outputIndex(self):
+        return 0
+
+
+_session_ids = itertools.count(1)
+_nodes = {}
+
+
+class Node:
+    """A node with a parm interface built from a ParmTemplateGroup.
+
+    Multiparm blocks get as many instances as ``multiparm_instances`` gives
+    for their folder name, 0 by default.
+    """
+
+    def __init__(
+        self,
+        parent,
+        name,
+        node_type=None,
+        parm_template_group=None,
+        user_data=None,
+        multiparm_instances=None,
+    ):
+        self._parent = parent
+        self._name = name
+        self._type = node_type or NodeType("null")
+        self._session_id = next(_session_ids)
+        self._user_data = dict(user_data or {})
+        self._children = []
+        self._inputs = []
+        self._outputs = []
+        self._event_callbacks = []
+        self._position = Vector2()
+        self._bypass = False
+        self._display = False
+        self._parms = {}
+        self._parm_tuples = {}
+        self._multiparm_instances = dict(multiparm_instances or {})
+        self._group = parm_template_group or ParmTemplateGroup()
+        self._build_parms()
+        if parent is not None:
+            parent._children.append(self)
+        _nodes[self.path()] = self
+
+    def _build_parms(self):
+        old_parms, self._parms, self._parm_tuples = self._parms, {}, {}
+        stack = [(iter(self._group.parmTemplates()), ())]
+        while stack:
+            parm_template = next(stack[-1][0], None)
+            if parm_template is None:
+                stack.pop()
+                continue
+            indices = stack[-1][1]
+            parm_type = parm_template.type()
+            if parm_type == parmTemplateType.Separator:
+                continue
+            if parm_type == parmTemplateType.Folder:
+                folder_type = parm_template.folderType()
+                if folder_type not in MULTIPARM_FOLDER_TYPES:
+                    stack.append((iter(parm_template.parmTemplates()), indices))
+                    continue
+                # The folder parm holds the instance count
+                counter_name = _instance_name(parm_template.name(), indices)
+                count = self._multiparm_instances.get(parm_template.name(), 0)
+                self._add_parm_tuple(counter_name, parm_template, [count], indices)
+                for index in range(count, 0, -1):
+                    stack.append(
+                        (iter(parm_template.parmTemplates()), indices + (index,))
+                    )
+                continue
+            name = _instance_name(parm_template.name(), indices)
+            # Buttons and labels have no defaultValue(), only the stored default
+            self._add_parm_tuple(name, parm_template, parm_template._default, indices)
+        # Keep the values of parms that survive an interface change
+        for name, parm in old_parms.items():
+            if name in self._parms:
+                self._parms[name]._value = parm._value
+                self._parms[name]._expression = parm._expression
+                self._parms[name]._expression_language = parm._expression_language
+                self._parms[name]._keyframes = parm._keyframes
+
+    def _add_parm_tuple(self, name, parm_template, values, indices=()):
+        component_template = parm_template.clone()
+        component_template._name = name
+        names = _component_names(component_template)
+        values = tuple(values) if isinstance(values, (tuple, list)) else (values,)
+        parms = [
+            Parm(self, parm_name, parm_template, values[min(i, len(values) - 1)])
+            for i, parm_name in enumerate(names)
+        ]
+        for parm in parms:
+            parm._indices = indices
+            self._parms[parm.name()] = parm
+        self._parm_tuples[name] = ParmTuple(self, name, parms)
+
+    def name(self):
+        return self._name
+
+    def path(self):
+        if self._parent is None:
+            return "/"
+        parent_path = self._parent.path()
+        return f"{parent_path.rstrip('/')}/{self._name}"
+
+    def type(self):
+        return self._type
+
+    def sessionId(self):
+        return self._session_id
+
+    def parent(self):
+        return self._parent
+
+    def children(self):
+        return tuple(self._children)
+
+    def _unique_child_name(self, name):
+        taken = {child.name() for child in self._children}
+        unique = name
+        for number in itertools.count(1):
+            if unique not in taken:
+                return unique
+            unique = f"{name}{number}"
+
+    def createNode(self, node_type_name, node_name=None):
+        name = self._unique_child_name(node_name or node_type_name)
+        return Node(self, name, NodeType(node_type_name))
+
+    def destroy(self):
+        for child in list(self._children):
+            child.destroy()
+        if self._parent is not None:
+            self._parent._children.remove(self)
+        _nodes.pop(self.path(), None)
+
+    def parmTemplateGroup(self):
+        return self._group
+
+    def setParmTemplateGroup(self, parm_template_group):
+        self._group = parm_template_group
+        self._build_parms()
+
+    def spareParms(self):
+        return ()
+
+    def parm(self, name):
+        return self._parms.get(name)
+
+    def node(self, relative_path):
+        return _nodes.get(f"{self.path()}/{relative_path}")
+
+    def isLockedHDA(self):
+        return self._type.definition() is not None
+
+    def parms(self):
+        return tuple(self._parms.values())
+
+    def parmTuple(self, name):
+        return self._parm_tuples.get(name)
+
+    def parmTuples(self):
+        return tuple(self._parm_tuples.values())
+
+    def setParms(self, values):
+        for name, value in values.items():
+            parm_tuple = self._parm_tuples.get(name)
+            if parm_tuple is not None and isinstance(value, (tuple, list)):
+                parm_tuple.set(value)
+            elif name in self._parms:
+                self._parms[name].set(value)
+            else:
+                raise OperationFailed(f"Invalid parameter name: {name}")
+
+    def setParmExpressions(self, parm_dict, language=None, replace_expressions=True):
+        for name, expression in parm_dict.items():
+            parm = self._parms.get(name)
+            if parm is None:
+                raise OperationFailed(f"Invalid parameter name: {name}")
+            parm.setExpression(expression, language)
+
+    def userDataDict(self):
+        return dict(self._user_data)
+
+    def setUserData(self, name, value):
+        self._user_data[name] = value
+
+    def position(self):
+        return self._position
+
+    def setPosition(self, position):
+        self._position = Vector2(*position)
+
+    def inputs(self):
+        return tuple(self._inputs)
+
+    def setInput(self, input_index, node, output_index=0):
+        while len(self._inputs) <= input_index:
+            self._inputs.append(None)
+        self._inputs[input_index] = node
+        if node is not None:
+            node._outputs.append(OutputConnection(node, self, input_index))
+
+    def setNextInput(self, node):
+        self.setInput(len(self._inputs), node)
+
+    def outputConnections(self):
+        return tuple(self._outputs)
+
+    def bypass(self, on):
+        self._bypass = on
+
+    def isBypassed(self):
+        return self._bypass
+
+    def setDisplayFlag(self, on):
+        self._display = on
+
+    def addEventCallback(self, event_types, callback):
+        self._event_callbacks.append((tuple(event_types), callback))
+
+    def removeEventCallback(self, event_types, callback):
+        self._event_callbacks = [
+            entry for entry in self._event_callbacks if entry[1] is not callback
+        ]
+
+    def eventCallbacks(self):
+        return tuple(self._event_callbacks)
+
+
+def _copy_node(node, parent):
+    copy = Node(
+        parent,
+        parent._unique_child_name(node.name()),
+        node.type(),
+        node.parmTemplateGroup(),
+        node.userDataDict(),
+        node._multiparm_instances,
+    )
+    for name, parm in node._parms.items():
+        copied = copy._parms[name]
+        copied._value = parm._value
+        copied._expression = parm._expression
+        copied._expression_language = parm._expression_language
+        copied._keyframes = parm._keyframes
+    for child in node.children():
+        _copy_node(child, copy)
+    return copy
+
+
+def copyNodesTo(nodes, parent):
+    return tuple(_copy_node(node, parent) for node in nodes)
+
+
+_root = None
+
+
+def reset():
+    """Drop every node and start again from an empty scene with /obj."""
+    global _root
+    _nodes.clear()
+    _root = Node(None, "", NodeType("root", "Director"))
+    Node(_root, "obj", NodeType("obj", "Manager"))
+
+
+def node(path):
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return _nodes.get(path)
+
+
+_update_mode = updateMode.AutoUpdate
+
+
+def updateModeSetting():
+    return _update_mode
+
+
+def setUpdateMode(mode):
+    global _update_mode
+    _update_mode = mode
+
+
+def isUIAvailable():
+    return False
+
+
+def applicationVersionString():
+    return "20.0.0"
+
+
+class _HipFile:
+    def load(self, path, suppress_save_prompt=False, ignore_load_warnings=False):
+        raise OperationFailed("The benchmark hou can't load hip files")
+
+
+hipFile = _HipFile()
+
+
+class _Undos:
+    @contextlib.contextmanager
+    def group(self, label):
+        yield
+
+    @contextlib.contextmanager
+    def disabler(self):
+        yield
+
+
+undos = _Undos()
+
+
+reset()
@@ -0,0 +1,143 @@
+"""Rebuild captured nodes in the benchmark ``hou``.
+
+A capture (see ``capture.py`` in the package) holds a production node's
+interface and parm state. Replaying it creates a ``fake_hou`` node with the
+same templates, multiparm instances, values, expressions, keyframes and user
+data, so the inspection code can be profiled against real shapes::
+
+    python benchmarks/run_benchmarks.py --capture character.nicap
+"""
+import re
+
+TEMPLATE_CLASSES = {
+    "Float": "FloatParmTemplate",
+    "Int": "IntParmTemplate",
+    "String": "StringParmTemplate",
+    "Toggle": "ToggleParmTemplate",
+    "Menu": "MenuParmTemplate",
+    "Button": "ButtonParmTemplate",
+    "Folder": "FolderParmTemplate",
+    "Separator": "SeparatorParmTemplate",
+    "Label": "LabelParmTemplate",
+    "Ramp": "RampParmTemplate",
+    "Data": "DataParmTemplate",
+    # Folder sets only survive in old assets and hold no parms of their own
+    "FolderSet": "LabelParmTemplate",
+}
+
+
+def _enum(hou, enum_type, name):
+    return getattr(hou, enum_type)[name]
+
+
+def build_template(hou, entry):
+    """Turn one captured template back into a parm template.
+
+    Args:
+        hou (module): The benchmark ``hou`` module.
+        entry (dict): Captured template, as written by ``capture_template``.
+
+    Returns:
+        hou.ParmTemplate: The template, folders with their contents.
+    """
+    kwargs = {
+        "is_hidden": entry.get("hidden", False),
+        "conditionals": {
+            _enum(hou, "parmCondType", cond_type): condition
+            for cond_type, condition in entry.get("conditionals", {}).items()
+        },
+        "tags": entry.get("tags"),
+    }
+    if "callback" in entry:
+        callback, language = entry["callback"]
+        kwargs["script_callback"] = callback
+        kwargs["script_callback_language"] = _enum(hou, "scriptLanguage", language)
+
+    template_class = getattr(hou, TEMPLATE_CLASSES[entry["type"]])
+    if entry["type"] == "Folder":
+        return template_class(
+            entry["name"],
+            entry["label"],
+            [build_template(hou, child) for child in entry.get("children", ())],
+            _enum(hou, "folderType", entry["folder_type"]),
+            **kwargs,
+        )
+    default = entry.get("default", ())
+    if not isinstance(default, list):
+        default = [default]
+    return template_class(
+        entry["name"], entry["label"], entry["size"], default, **kwargs
+    )
+
+
+def _multiparm_instances(hou, templates, values):
+    """Instance count per multiparm folder name, from the captured counter parms.
+
+    ``fake_hou`` gives every instance of a nested block the same count, so
+    nested blocks get the largest count seen in the capture.
+    """
+    instances = {}
+    stack = list(templates)
+    while stack:
+        entry = stack.pop()
+        if entry["type"] != "Folder":
+            continue
+        stack.extend(entry.get("children", ()))
+        folder_type = _enum(hou, "folderType", entry["folder_type"])
+        if folder_type not in hou.MULTIPARM_FOLDER_TYPES:
+            continue
+        counter = re.compile(re.escape(entry["name"]).replace("\\#", r"\d+"))
+        counts = [
+            int(value)
+            for name, value in values.items()
+            if counter.fullmatch(name) and isinstance(value, (int, float))
+        ]
+        instances[entry["name"]] = max(counts, default=0)
+    return instances
+
+
+def replay_node(hou, capture, name=None, parent="/obj"):
+    """Create a node in the benchmark ``hou`` scene from a capture.
+
+    Args:
+        hou (module): The benchmark ``hou`` module.
+        capture (dict): Capture loaded with ``load_capture``.
+        name (str, optional): Node name. Defaults to the captured node's name.
+        parent (str, optional): Path of the parent network.
+
+    Returns:
+        hou.Node: The new node.
+    """
+    captured_node = capture["node"]
+    category, _, type_name = captured_node["type"].rpartition("/")
+    definition = None
+    if captured_node.get("library"):
+        definition = hou.HDADefinition(
+            captured_node["library"], captured_node.get("library_version") or ""
+        )
+    templates = capture["templates"]
+    values = capture.get("values", {})
+    node = hou.Node(
+        hou.node(parent),
+        name or captured_node["path"].rsplit("/", 1)[-1],
+        hou.NodeType(type_name, category or "Sop", definition),
+        hou.ParmTemplateGroup(build_template(hou, entry) for entry in templates),
+        capture.get("user_data"),
+        _multiparm_instances(hou, templates, values),
+    )
+
+    for parm_name, value in values.items():
+        parm = node.parm(parm_name)
+        if parm is not None:
+            parm.set(value)
+    for parm_name, (expression, language) in capture.get("expressions", {}).items():
+        parm = node.parm(parm_name)
+        if parm is not None:
+            parm.setExpression(expression, _enum(hou, "exprLanguage", language))
+    for parm_name, keyframes in capture.get("keyframes", {}).items():
+        parm = node.parm(parm_name)
+        if parm is None:
+            continue
+        for frame, value, expression in keyframes:
+            parm.setKeyframe(hou.Keyframe(frame, value, expression))
+    return node
@@ -0,0 +1,274 @@
+"""Benchmark the inspection code paths on synthetic nodes, without Houdini.
+
+Runs against ``fake_hou`` and prints one line per benchmark and scale::
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales small,medium --repeat 10
+    python benchmarks/run_benchmarks.py --save baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --threshold 0.2
+    python benchmarks/run_benchmarks.py --capture character.nicap
+
+Captures of production nodes (``hython -m node_inspector capture``) are
+replayed next to the synthetic scales, or alone when no ``--scales`` are given.
+
+With ``--baseline`` the exit code is 1 if any benchmark's median got slower
+than the baseline by more than the threshold.
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import fake_hou
+from replay import replay_node
+from synthetic import SCALES, build_node
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+# Nodes exploded per run of the batch explode benchmark
+EXPLODE_BATCH_SIZE = 10
+
+
+def load_package():
+    """Import the package from this checkout against the fake ``hou``."""
+    sys.modules["hou"] = fake_hou
+    spec = importlib.util.spec_from_file_location(
+        "node_inspector",
+        PACKAGE_DIR / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_DIR)],
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["node_inspector"] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def make_benchmarks(package):
+    """Benchmarks as ``{name: (setup(node) -> state, run(state))}``."""
+    from node_inspector import explode_hda_to_subnet, utils
+    from node_inspector.template_cache import template_cache
+
+    def parm_info_cold(node):
+        template_cache.invalidate()
+        return node
+
+    def parm_info(node):
+        parm_info = utils.ParmInfo(node)
+        parm_info.get_parm_names()
+        parm_info.get_parm_expressions()
+        parm_info.get_parm_default_values()
+        parm_info.get_parm_conditionals()
+        parm_info.get_parm_callbacks()
+        parm_info.get_multiparm_naming_scheme()
+
+    def user_data(node):
+        # Parsed JSON is memoized, start from nothing
+        utils._json_cache.clear()
+        return node.userDataDict()
+
+    def explode_setup(node):
+        # Explode a fresh copy so every run does the same work
+        copy = fake_hou.copyNodesTo([node], node.parent())[0]
+        return copy
+
+    def explode(copy):
+        package.explode_me(copy)
+
+    def explode_batch_setup(node):
+        return fake_hou.copyNodesTo([node] * EXPLODE_BATCH_SIZE, node.parent())
+
+    def explode_batch(copies):
+        explode_hda_to_subnet.explode_nodes(copies)
+
+    return {
+        "ParmInfo (cold)": (parm_info_cold, parm_info),
+        "ParmInfo (warm)": (lambda node: node, parm_info),
+        "pretty_print_dict": (user_data, package.pretty_print_dict),
+        "traverse_parms_from_node": (
+            lambda node: node,
+            package.traverse_parms_from_node,
+        ),
+        "generate_properties": (lambda node: node, package.generate_properties),
+        "explode_me": (explode_setup, explode),
+        f"explode_nodes (x{EXPLODE_BATCH_SIZE})": (explode_batch_setup, explode_batch),
+    }
+
+
+def measure(setup, run, node, repeat):
+    """Time ``run(setup(node))``, setup excluded.
+
+    Returns:
+        list: Seconds per run.
+    """
+    timings = []
+    for _ in range(repeat):
+        state = setup(node)
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_import(repeat):
+    """Time importing the package and ``utils`` from scratch.
+
+    Returns:
+        list: Seconds per run.
+    """
+    timings = []
+    for _ in range(repeat):
+        for name in list(sys.modules):
+            if name == "node_inspector" or name.startswith("node_inspector."):
+                del sys.modules[name]
+        start = time.perf_counter()
+        load_package()
+        importlib.import_module("node_inspector.utils")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _record(results, key, timings):
+    results[key] = {
+        "median_ms": statistics.median(timings) * 1e3,
+        "min_ms": min(timings) * 1e3,
+        "max_ms": max(timings) * 1e3,
+        "runs": len(timings),
+    }
+    print(
+        f"{key:<40} median {results[key]['median_ms']:>10.2f} ms"
+        f"   min {results[key]['min_ms']:>10.2f} ms",
+        flush=True,
+    )
+
+
+def run_benchmarks(scales, repeat, name_filter=None, captures=()) -> dict:
+    """Run every benchmark at every scale and on every capture.
+
+    Args:
+        scales (list): Names out of ``SCALES``.
+        repeat (int): Runs per benchmark.
+        name_filter (str, optional): Only run benchmarks whose name contains this.
+        captures (list, optional): Capture files, keyed by their stem in the results.
+
+    Returns:
+        dict: ``{"meta": {...}, "results": {"name[scale]": {...}}}``.
+    """
+    results = {}
+    import_name = "import node_inspector.utils"
+    if not name_filter or name_filter.lower() in import_name:
+        _record(results, import_name, measure_import(repeat))
+
+    package = load_package()
+    from node_inspector.capture import load_capture
+
+    benchmarks = make_benchmarks(package)
+    # (label, build() -> node), a fresh node is built in an empty scene per label
+    builders = [
+        (scale, partial(build_node, fake_hou, SCALES[scale], f"bench_{scale}"))
+        for scale in scales
+    ]
+    for path in captures:
+        label = Path(path).name.split(".")[0]
+        builders.append((label, partial(replay_node, fake_hou, load_capture(path))))
+
+    for scale, build in builders:
+        fake_hou.reset()
+        node = build()
+        for name, (setup, run) in benchmarks.items():
+            if name_filter and name_filter.lower() not in name.lower():
+                continue
+            timings = measure(setup, run, node, repeat)
+            _record(results, f"{name}[{scale}]", timings)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold) -> list:
+    """Find benchmarks slower than the baseline.
+
+    Args:
+        report (dict): Output of ``run_benchmarks``.
+        baseline (dict): Earlier output of ``run_benchmarks``.
+        threshold (float): Allowed slowdown, 0.2 being 20%.
+
+    Returns:
+        list: ``(key, baseline ms, current ms)`` of every regression.
+    """
+    regressions = []
+    for key, result in report["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        if result["median_ms"] > previous["median_ms"] * (1 + threshold):
+            regressions.append((key, previous["median_ms"], result["median_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        help=f"Comma separated scales out of {', '.join(SCALES)}. "
+        "Defaults to all of them, or none when captures are given",
+    )
+    parser.add_argument(
+        "--capture",
+        action="append",
+        dest="captures",
+        default=[],
+        help="Capture file to replay, can be repeated",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Slowdown over the baseline flagged as a regression. Defaults to 0.2",
+    )
+    args = parser.parse_args(argv)
+
+    if args.scales is None:
+        args.scales = "" if args.captures else ",".join(SCALES)
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(unknown)}")
+
+    report = run_benchmarks(scales, args.repeat, args.filter, args.captures)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+        regressions = compare(report, baseline, args.threshold)
+        for key, previous, current in regressions:
+            print(
+                f"REGRESSION {key}: {previous:.2f} ms -> {current:.2f} ms "
+                f"(+{(current / previous - 1) * 100:.0f}%)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Synthetic node interfaces of configurable size for the benchmark ``hou``."""
+import json
+import random
+from typing import NamedTuple
+
+
+class NodeShape(NamedTuple):
+    """Size and features of a synthetic node.
+
+    Attributes:
+        parm_count (int): Number of regular parm templates.
+        folder_depth (int): Nesting depth of folders holding them.
+        folders_per_level (int): Sub folders per folder.
+        multiparm_blocks (int): Number of multiparm blocks.
+        multiparm_instances (int): Instances of each multiparm block.
+        expression_ratio (float): Share of parms holding an expression.
+        conditional_ratio (float): Share of templates with a hide/disable condition.
+        user_data_bytes (int): Approximate size of the JSON user data blob.
+    """
+
+    parm_count: int = 100
+    folder_depth: int = 2
+    folders_per_level: int = 3
+    multiparm_blocks: int = 1
+    multiparm_instances: int = 10
+    expression_ratio: float = 0.1
+    conditional_ratio: float = 0.1
+    user_data_bytes: int = 10_000
+
+
+SCALES = {
+    "small": NodeShape(),
+    "medium": NodeShape(
+        parm_count=1_000,
+        folder_depth=4,
+        multiparm_blocks=4,
+        multiparm_instances=50,
+        user_data_bytes=200_000,
+    ),
+    "large": NodeShape(
+        parm_count=5_000,
+        folder_depth=6,
+        multiparm_blocks=8,
+        multiparm_instances=200,
+        user_data_bytes=2_000_000,
+    ),
+}
+
+
+def _make_template(hou, index, rng, shape):
+    kind = index % 4
+    name = f"parm{index}"
+    label = f"Parm {index}"
+    kwargs = {}
+    if rng.random() < shape.conditional_ratio:
+        cond_type = rng.choice((hou.parmCondType.HideWhen, hou.parmCondType.DisableWhen))
+        kwargs["conditionals"] = {cond_type: f"{{ parm{max(index - 1, 0)} == 0 }}"}
+    if index % 25 == 0:
+        kwargs["script_callback"] = f"hou.phm().on_parm{index}(kwargs)"
+        kwargs["script_callback_language"] = hou.scriptLanguage.Python
+    if kind == 0:
+        return hou.FloatParmTemplate(name, label, 1, (rng.random(),), **kwargs)
+    if kind == 1:
+        return hou.FloatParmTemplate(name, label, 3, (0.0, 1.0, 0.0), **kwargs)
+    if kind == 2:
+        return hou.IntParmTemplate(name, label, 1, (rng.randint(0, 10),), **kwargs)
+    return hou.StringParmTemplate(name, label, 1, (f"$HIP/geo/{name}.bgeo",), **kwargs)
+
+
+def _build_folders(hou, depth, per_level, prefix="folder"):
+    """Nested folders, returned with the flat list of every folder."""
+    roots = []
+    folders = []
+    level = [(roots, prefix)]
+    for _ in range(depth):
+        next_level = []
+        for parent, parent_prefix in level:
+            for index in range(per_level):
+                name = f"{parent_prefix}_{index}"
+                folder = hou.FolderParmTemplate(name, name.replace("_", " ").title())
+                parent.append(folder)
+                folders.append(folder)
+                next_level.append((folder._templates, name))
+        level = next_level
+    return roots, folders
+
+
+def _multiparm_block(hou, index, nested=False):
+    templates = [
+        hou.FloatParmTemplate(f"pt{index}_pos#", "Position", 3),
+        hou.IntParmTemplate(f"pt{index}_id#", "Id", 1),
+        hou.StringParmTemplate(f"pt{index}_name#", "Name", 1),
+    ]
+    if nested:
+        templates.append(
+            hou.FolderParmTemplate(
+                f"pt{index}_weights#",
+                "Weights",
+                [hou.FloatParmTemplate(f"pt{index}_w#_#", "Weight", 1)],
+                folder_type=hou.folderType.MultiparmBlock,
+            )
+        )
+    return hou.FolderParmTemplate(
+        f"points{index}", f"Points {index}", templates, hou.folderType.MultiparmBlock
+    )
+
+
+def _user_data(rng, size):
+    entries = {}
+    manifest_size = 0
+    index = 0
+    while manifest_size < size:
+        entry = {
+            "path": f"/obj/geo{index}/out",
+            "frames": [rng.randint(1, 240) for _ in range(8)],
+            "attributes": {"P": "vector3", "Cd": "vector3", "id": "int"},
+        }
+        entries[f"item{index}"] = entry
+        manifest_size += len(json.dumps(entry)) + 12
+        index += 1
+    return {
+        "nodeshape": "rect",
+        "nodeinfo_boundsInfo": "{}",
+        "manifest": json.dumps(entries),
+    }
+
+
+def build_parm_template_group(hou, shape, seed=0):
+    """Build the interface of a synthetic node.
+
+    Args:
+        hou (module): The benchmark ``hou`` module.
+        shape (NodeShape): Size and features of the interface.
+        seed (int, optional): Random seed, the same seed gives the same interface.
+
+    Returns:
+        hou.ParmTemplateGroup: The interface.
+    """
+    rng = random.Random(seed)
+    roots, folders = _build_folders(hou, shape.folder_depth, shape.folders_per_level)
+    containers = [folder._templates for folder in folders] or [None]
+    group = hou.ParmTemplateGroup(roots)
+    for index in range(shape.parm_count):
+        template = _make_template(hou, index, rng, shape)
+        container = containers[index % len(containers)]
+        if container is None:
+            group.append(template)
+        else:
+            container.append(template)
+    for index in range(shape.multiparm_blocks):
+        group.append(_multiparm_block(hou, index, nested=index % 2 == 1))
+    return group
+
+
+def build_node(hou, shape, name="synthetic", parent="/obj", seed=0):
+    """Create a synthetic node in the benchmark ``hou`` scene.
+
+    Args:
+        hou (module): The benchmark ``hou`` module.
+        shape (NodeShape): Size and features of the node.
+        name (str, optional): Node name.
+        parent (str, optional): Path of the parent network.
+        seed (int, optional): Random seed.
+
+    Returns:
+        hou.Node: The new node.
+    """
+    rng = random.Random(seed)
+    group = build_parm_template_group(hou, shape, seed)
+    instances = {}
+    for index in range(shape.multiparm_blocks):
+        instances[f"points{index}"] = shape.multiparm_instances
+        instances[f"pt{index}_weights#"] = 2
+    definition = hou.HDADefinition(f"/tmp/benchmarks/{name}.hda")
+    node = hou.Node(
+        hou.node(parent),
+        name,
+        hou.NodeType(f"bench::{name}::1.0", definition=definition),
+        group,
+        _user_data(rng, shape.user_data_bytes),
+        instances,
+    )
+    for parm in node.parms():
+        if rng.random() < shape.expression_ratio:
+            parm.setExpression(f'ch("../ctrl/{parm.name()}") * $F')
+    return node
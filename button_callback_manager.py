@@ -1,70 +1,184 @@
-from .utils import pretty_print_dict, ParmInfo
-from .get_all_labels import traverse_parms_from_node
-from .generate_wrapper import generate_properties
-from .explode_hda_to_subnet import explode_me
-
-
-def text_edit_handler(node, text_edit, text=""):
-    text_edit.clear()
-    text_edit.append(text)
-
-
-def get_user_data(node, text_edit):
-    node_data = node.userDataDict()
-    text = pretty_print_dict(node_data)
-    text_edit_handler(node, text_edit, text)
-
-
-def get_labels(node, text_edit):
-    text = traverse_parms_from_node(node)
-
-    text_edit_handler(node, text_edit, text)
-
-
-def get_all_defaults(node, text_edit):
-    text = pretty_print_dict(ParmInfo(node).get_parm_default_values(), indent=1)
-    text_edit_handler(node, text_edit, text)
-
-
-def get_all_expressions(node, text_edit):
-    text = pretty_print_dict(
-        ParmInfo(node).get_parm_expressions(include_hidden=True), indent=1
+from contextlib import nullcontext
+from functools import partial
+
+from .actions import registry
+from .utils import pretty_print_dict, ParmInfo, single_step, synchronous
+from .hou_proxy import HouTransaction, unwrap
+from .instrumentation import instrumentation
+from .node_events import node_watcher
+from .result_cache import ResultCache
+from .template_cache import definition_modification_time
+
+
+# (HDA definition modification time, ParmInfo) of watched nodes, keyed by
+# node session id. They drop their own stale data when the node watcher
+# reports a change, definition edits replace them.
+_parm_infos = {}
+node_watcher.add_discard_listener(lambda session_id: _parm_infos.pop(session_id, None))
+
+# Rendered action results of watched nodes
+result_cache = ResultCache()
+node_watcher.add_discard_listener(result_cache.discard_node)
+
+# Lines of text appended to the widget per step
+STREAM_CHUNK_LINES = 500
+
+
+def get_parm_info(node):
+    """Get a ParmInfo for the node, reused between actions while it is watched.
+
+    Reused ParmInfo objects outlive any hou transaction, so they hold the
+    real node even if ``node`` is a proxy.
+
+    Args:
+        node (hou.Node): Node to inspect.
+
+    Returns:
+        ParmInfo: Parm info of the node.
+    """
+    if not node_watcher.is_watched(node):
+        return ParmInfo(node)
+    session_id = node.sessionId()
+    modification_time = definition_modification_time(node)
+    modification_time_seen, parm_info = _parm_infos.get(session_id, (None, None))
+    if parm_info is None or modification_time != modification_time_seen:
+        parm_info = ParmInfo(unwrap(node))
+        _parm_infos[session_id] = (modification_time, parm_info)
+    return parm_info
+
+
+def text_edit_steps(node, text_edit, text="", key=None):
+    """Show text in the widget, appending it in chunks of lines.
+
+    Step generator, see ``utils.run_steps``.
+    """
+    text_edit.displayed_key = None
+    if instrumentation.enabled:
+        instrumentation.count("bytes_rendered", len(text.encode("utf-8")))
+    lines = text.split("\n")
+    for start in range(0, len(lines), STREAM_CHUNK_LINES):
+        end = start + STREAM_CHUNK_LINES
+        chunk = "\n".join(lines[start:end])
+        if start:
+            text_edit.append(chunk)
+        else:
+            text_edit.show_text(chunk)
+        yield min(end, len(lines)), len(lines)
+    # Remember what is shown so an unchanged result isn't repainted
+    text_edit.displayed_key = key
+
+
+text_edit_handler = synchronous(text_edit_steps)
+
+
+def data_view_steps(node, text_edit, data=None, key=None, render_text=None):
+    """Show a structured result in the widget's tree view.
+
+    Step generator, see ``utils.run_steps``.
+
+    Args:
+        node (hou.Node): Inspected node.
+        text_edit (EditWidget): Widget to show the result in.
+        data (dict): Structured result.
+        key (tuple, optional): Cache key of the result.
+        render_text (Callable, optional): Turns ``data`` into text, used when
+            the widget is switched to text mode.
+    """
+    yield from single_step(
+        text_edit.show_data, data, render_text or pretty_print_dict
     )
-    text_edit_handler(node, text_edit, text)
-
-
-def get_all_conditionals(node, text_edit):
-    text = pretty_print_dict(
-        ParmInfo(node).get_parm_conditionals(include_hidden=True), indent=1
-    )
-    text_edit_handler(node, text_edit, text)
-
-
-def generate_wrapper(node, text_edit):
-    text = generate_properties(node)
-    text_edit_handler(node, text_edit, text)
-
-
-def explode_to_subnetwork(node, text_edit):
-    explode_me(node)
-    text_edit_handler(
-        node, text_edit, text=f"Exploded node:\n\t{node.path()}\nto Subnetwork"
+    text_edit.displayed_key = key
+
+
+def cached_result_steps(
+    node, text_edit, action_name, render_steps, show=text_edit_steps, cacheable=True
+):
+    """Show the result of ``render_steps()`` in the widget, reusing cached results.
+
+    Results of watched nodes are cached per (node session id, action, node
+    generation, HDA definition modification time). If the widget already
+    shows the same result it is left untouched, which makes switching back
+    to a tab instant.
+
+    Step generator, see ``utils.run_steps``.
+
+    Args:
+        node (hou.Node): Inspected node.
+        text_edit (EditWidget): Widget to show the result in.
+        action_name (str): Name the result is cached under.
+        render_steps (Callable): Step generator function producing the result.
+        show (Callable, optional): Step generator function showing the result,
+            called as ``show(node, text_edit, result, key)``. Defaults to
+            showing text.
+        cacheable (bool, optional): Whether the result may be cached.
+    """
+    generation = node_watcher.generation(node) if cacheable else None
+    if generation is None:
+        with instrumentation.span(action_name, "collect"):
+            result = yield from render_steps()
+        with instrumentation.span(action_name, "render"):
+            yield from show(node, text_edit, result)
+        return
+
+    key = (
+        node.sessionId(),
+        action_name,
+        generation,
+        definition_modification_time(node),
     )
+    if getattr(text_edit, "displayed_key", None) == key:
+        return
+
+    result = result_cache.get(key)
+    if result is None:
+        with instrumentation.span(action_name, "collect"):
+            result = yield from render_steps()
+        result_cache.put(key, result)
+    with instrumentation.span(action_name, "render"):
+        yield from show(node, text_edit, result, key)
+
+
+def action_steps(action_name, node, text_edit):
+    """Run a registered action on a node and show its result in the widget.
+
+    Read-only actions run against memoizing hou proxies (see ``hou_proxy``),
+    whose results are forgotten at every step since the user may edit the
+    node in between. Cacheable actions reuse results of unchanged watched
+    nodes.
+
+    Step generator, see ``utils.run_steps``.
+
+    Args:
+        action_name (str): Name of the action in ``actions.registry``.
+        node (hou.Node): Node to inspect.
+        text_edit (EditWidget): Widget to show the result in.
+    """
+    action = registry.get(action_name)
+    transaction = HouTransaction() if action.read_only else nullcontext()
+    with instrumentation.span(action.name, "action", node=node.path), transaction:
+        if action.read_only:
+            node = transaction.wrap(node)
+
+        def render_steps():
+            parm_info = get_parm_info(node)
+            result = yield from action.steps(node, parm_info)
+            if action.display == "parms":
+                result = parm_info.group_by_folder(result)
+            return result
+
+        if action.display == "text":
+            show = partial(result_text_steps, render_text=action.to_text)
+        else:
+            show = partial(data_view_steps, render_text=action.to_text)
+        steps = cached_result_steps(
+            node, text_edit, action.name, render_steps, show, action.cacheable
+        )
+        if action.read_only:
+            steps = transaction.steps(steps)
+        yield from steps
+
+
+def result_text_steps(node, text_edit, result=None, key=None, render_text=str):
+    """Show a result as text, see ``text_edit_steps``."""
+    yield from text_edit_steps(node, text_edit, render_text(result), key)
 
-
-def get_all_callbacks(node, text_edit):
-    text = pretty_print_dict(ParmInfo(node).get_parm_callbacks(), indent=1)
-    text_edit_handler(node, text_edit, text)
-
-
-# Create a mapping between button names and functions
-BUTTON_MAPPING = {
-    "Get User Data": get_user_data,
-    "Get Labels": get_labels,
-    "Get All Defaults": get_all_defaults,
-    "Get All Expressions": get_all_expressions,
-    "Get All Callbacks": get_all_callbacks,
-    "Get All Conditionals": get_all_conditionals,
-    "Generate Wrapper": generate_wrapper,
-    "Explode To Subnetwork": explode_to_subnetwork,
-}
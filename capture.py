@@ -0,0 +1,214 @@
+"""Capture a node's interface and parm state into a small versioned file.
+
+Captures are taken in Houdini and replayed anywhere through the benchmark
+``hou`` (see ``benchmarks/replay.py``), so the inspection code can be
+profiled against production assets::
+
+    hython -m node_inspector capture scene.hip /obj/character --out-dir captures
+
+Files are gzip compressed JSON::
+
+    {
+        "format": "node_inspector.capture",
+        "version": 1,
+        "node": {"path", "type", "library", "library_version"},
+        "houdini": "20.0.547",
+        "templates": [{"name", "label", "type", "size", ...}, ...],
+        "values": {parm name: value},
+        "expressions": {parm name: [expression, language]},
+        "keyframes": {parm name: [[frame, value, expression or null], ...]},
+        "user_data": {key: value},
+    }
+
+Enum values are stored by name, e.g. ``"Float"`` for
+``hou.parmTemplateType.Float``.
+"""
+import gzip
+import json
+import os
+
+import hou
+
+from .scan import to_jsonable
+
+CAPTURE_FORMAT = "node_inspector.capture"
+CAPTURE_VERSION = 1
+
+
+class CaptureError(ValueError):
+    """Raised for files that are not captures, or of an unsupported version."""
+
+
+def enum_name(value) -> str:
+    """Name of a hou enum value, ``hou.parmTemplateType.Float`` -> ``"Float"``."""
+    return str(value).rsplit(".", 1)[-1]
+
+
+def capture_template(parm_template) -> dict:
+    """Describe one parm template, folders with their contents.
+
+    Args:
+        parm_template (hou.ParmTemplate): Template to describe.
+
+    Returns:
+        dict: JSON compatible description.
+    """
+    entry = {
+        "name": parm_template.name(),
+        "label": parm_template.label(),
+        "type": enum_name(parm_template.type()),
+        "size": parm_template.numComponents(),
+    }
+    if parm_template.isHidden():
+        entry["hidden"] = True
+    try:
+        entry["default"] = to_jsonable(parm_template.defaultValue())
+    except AttributeError:
+        pass
+    if parm_template.scriptCallback():
+        entry["callback"] = [
+            parm_template.scriptCallback(),
+            enum_name(parm_template.scriptCallbackLanguage()),
+        ]
+    conditionals = {
+        enum_name(cond_type): condition
+        for cond_type, condition in parm_template.conditionals().items()
+        if condition.strip()
+    }
+    if conditionals:
+        entry["conditionals"] = conditionals
+    tags = parm_template.tags()
+    if tags:
+        entry["tags"] = tags
+    if parm_template.type() == hou.parmTemplateType.Folder:
+        entry["folder_type"] = enum_name(parm_template.folderType())
+        entry["children"] = [
+            capture_template(child) for child in parm_template.parmTemplates()
+        ]
+    return entry
+
+
+def capture_node(node) -> dict:
+    """Capture a node's interface, parm values, expressions, keyframes and user data.
+
+    Args:
+        node (hou.Node): Node to capture.
+
+    Returns:
+        dict: The capture, see the module docstring.
+    """
+    node_type = node.type()
+    definition = node_type.definition()
+    values = {}
+    expressions = {}
+    keyframes = {}
+    for parm in node.parms():
+        name = parm.name()
+        values[name] = to_jsonable(parm.eval())
+        try:
+            expressions[name] = [
+                parm.expression(),
+                enum_name(parm.expressionLanguage()),
+            ]
+        except hou.OperationFailed:
+            pass
+        parm_keyframes = [
+            [
+                keyframe.frame(),
+                keyframe.value() if keyframe.isValueSet() else None,
+                keyframe.expression() if keyframe.isExpressionSet() else None,
+            ]
+            for keyframe in parm.keyframes()
+        ]
+        if parm_keyframes:
+            keyframes[name] = parm_keyframes
+
+    return {
+        "format": CAPTURE_FORMAT,
+        "version": CAPTURE_VERSION,
+        "node": {
+            "path": node.path(),
+            "type": node_type.nameWithCategory(),
+            "library": definition.libraryFilePath() if definition else None,
+            "library_version": definition.version() if definition else None,
+        },
+        "houdini": hou.applicationVersionString(),
+        "templates": [
+            capture_template(parm_template)
+            for parm_template in node.parmTemplateGroup().entries()
+        ],
+        "values": values,
+        "expressions": expressions,
+        "keyframes": keyframes,
+        "user_data": node.userDataDict(),
+    }
+
+
+def save_capture(capture, path):
+    """Write a capture to a gzip compressed JSON file.
+
+    Args:
+        capture (dict): Output of ``capture_node``.
+        path (str): File to write.
+    """
+    with gzip.open(path, "wt", encoding="utf-8") as stream:
+        json.dump(capture, stream, separators=(",", ":"))
+
+
+def capture_file_name(node_path) -> str:
+    """File name for a node's capture, ``/obj/character`` -> ``obj_character.nicap``."""
+    return node_path.strip("/").replace("/", "_") + ".nicap"
+
+
+def capture_hip(hip_path, node_paths, out_dir=".") -> list:
+    """Load a hip file and capture nodes from it, one file per node.
+
+    Args:
+        hip_path (str): Hip file to load.
+        node_paths (list): Paths of the nodes to capture.
+        out_dir (str, optional): Directory of the capture files.
+
+    Returns:
+        list: Paths of the written files.
+
+    Raises:
+        ValueError: If a node doesn't exist.
+    """
+    hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for node_path in node_paths:
+        node = hou.node(node_path)
+        if node is None:
+            raise ValueError(f"No node at {node_path} in {hip_path}")
+        path = os.path.join(out_dir, capture_file_name(node.path()))
+        save_capture(capture_node(node), path)
+        written.append(path)
+    return written
+
+
+def load_capture(path) -> dict:
+    """Read a capture written by ``save_capture``.
+
+    Args:
+        path (str): Capture file.
+
+    Returns:
+        dict: The capture.
+
+    Raises:
+        CaptureError: If the file is not a capture or its version is unsupported.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as stream:
+            capture = json.load(stream)
+    except (OSError, ValueError) as error:
+        raise CaptureError(f"{path} is not a node capture: {error}") from error
+    if not isinstance(capture, dict) or capture.get("format") != CAPTURE_FORMAT:
+        raise CaptureError(f"{path} is not a node capture")
+    if capture.get("version", 0) > CAPTURE_VERSION:
+        raise CaptureError(
+            f"{path} is a version {capture['version']} capture, "
+            f"only versions up to {CAPTURE_VERSION} are supported"
+        )
+    return capture
@@ -0,0 +1,141 @@
+import mmap
+from typing import NamedTuple
+
+
+# Portable ASCII ("odc") cpio format used by .hip, .otl and .hda files
+MAGIC = b"070707"
+HEADER_SIZE = 76
+TRAILER = "TRAILER!!!"
+
+
+class CpioEntry(NamedTuple):
+    """Location of one archive member inside the archive buffer.
+
+    Attributes:
+        name (str): Member name.
+        offset (int): Offset of the member data.
+        size (int): Size of the member data in bytes.
+        mtime (int): Modification time stored in the header.
+    """
+
+    name: str
+    offset: int
+    size: int
+    mtime: int
+
+
+def _octal(header, start, length) -> int:
+    return int(header[start : start + length], 8)
+
+
+def index_entries(buffer, offset=0, end=None) -> dict:
+    """Index the members of a cpio archive without copying their data.
+
+    Args:
+        buffer (bytes, mmap.mmap or memoryview): Archive bytes.
+        offset (int, optional): Where the archive starts in the buffer.
+        end (int, optional): Where the archive ends in the buffer.
+
+    Returns:
+        dict: ``CpioEntry`` objects keyed by member name, in archive order.
+
+    Raises:
+        ValueError: If a header is malformed.
+    """
+    end = len(buffer) if end is None else end
+    entries = {}
+    while offset + HEADER_SIZE <= end:
+        header = bytes(buffer[offset : offset + HEADER_SIZE])
+        if header[:6] != MAGIC:
+            raise ValueError(f"Bad cpio header at offset {offset}")
+        mtime = _octal(header, 48, 11)
+        name_size = _octal(header, 59, 6)
+        data_size = _octal(header, 65, 11)
+
+        name_start = offset + HEADER_SIZE
+        name = bytes(buffer[name_start : name_start + name_size - 1]).decode(
+            "utf-8", "replace"
+        )
+        data_start = name_start + name_size
+        if name == TRAILER:
+            break
+        if data_start + data_size > end:
+            raise ValueError(f"Truncated cpio member {name!r}")
+        entries[name] = CpioEntry(name, data_start, data_size, mtime)
+        offset = data_start + data_size
+    return entries
+
+
+class CpioArchive:
+    """Read-only, memory mapped view of a cpio archive.
+
+    Only the headers are read when the archive is opened. Member data is
+    returned as memoryview slices of the mapping, and nested archives (HDA
+    definitions inside a library) are views into the same mapping.
+    """
+
+    def __init__(self, path=None, buffer=None, offset=0, end=None):
+        """
+        Args:
+            path (str, optional): Archive file to map.
+            buffer (bytes, mmap.mmap or memoryview, optional): Archive bytes, used if no path is given.
+            offset (int, optional): Where the archive starts in the buffer.
+            end (int, optional): Where the archive ends in the buffer.
+        """
+        self.path = path
+        self._file = None
+        self._mmap = None
+        if path is not None:
+            self._file = open(path, "rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                self._mmap = b""
+            buffer = self._mmap
+        self.buffer = memoryview(buffer)
+        self.entries = index_entries(self.buffer, offset, end)
+
+    def names(self):
+        return list(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def read(self, name) -> memoryview:
+        """Get the data of a member without copying it.
+
+        Raises:
+            KeyError: If there is no such member.
+        """
+        entry = self.entries[name]
+        return self.buffer[entry.offset : entry.offset + entry.size]
+
+    def read_text(self, name, encoding="utf-8") -> str:
+        return str(self.read(name), encoding, "replace")
+
+    def open_nested(self, name) -> "CpioArchive":
+        """Open a member that is itself a cpio archive, sharing this mapping."""
+        entry = self.entries[name]
+        return CpioArchive(
+            buffer=self.buffer, offset=entry.offset, end=entry.offset + entry.size
+        )
+
+    def close(self):
+        """Release the mapping. Member views still alive keep it open until dropped."""
+        self.entries = {}
+        try:
+            self.buffer.release()
+            if isinstance(self._mmap, mmap.mmap):
+                self._mmap.close()
+        except BufferError:
+            pass
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
@@ -1,17 +1,38 @@
-from PySide2.QtWidgets import QTextEdit, QWidget, QVBoxLayout, QPushButton
+from PySide2.QtWidgets import (
+    QTextEdit,
+    QTreeView,
+    QWidget,
+    QVBoxLayout,
+    QPushButton,
+    QProgressBar,
+)
+from PySide2.QtCore import QPoint
 from PySide2.QtGui import QTextOption
 from .python_highlighter import PythonHighlighter
+from .result_model import ResultTreeModel
+from .instrumentation import instrumentation
 from .widgets_construct import NeatWidgetConstructor, NeatLayoutTypes
 from .constants import BG_COLOR
 
 
 class EditWidget(QWidget):
-    def __init__(self):
+    def __init__(self, format_worker=None):
         super().__init__()
         self.layout = QVBoxLayout()
         self.edit_text_widget = None
         self.syntax_highlighter = None
 
+        # Structured result shown in the tree view, and how to turn it into text
+        self.result_data = None
+        self.render_text = None
+        self.text_mode = False
+
+        # Renders structured results as text off the main thread, if given
+        self.format_worker = format_worker
+        self._format_token = None
+        if format_worker is not None:
+            format_worker.formatted.connect(self.on_formatted)
+
         self.main_widget = NeatWidgetConstructor(
             layout_type=NeatLayoutTypes.VERTICAL, enable_bg=True
         )
@@ -19,23 +40,131 @@ class EditWidget(QWidget):
         self.edit_text_widget = QTextEdit()
         self.setup_text_edit()
         self.main_widget.add_widget(self.edit_text_widget, stretch=1)
+
+        self.result_model = ResultTreeModel()
+        self.tree_view = QTreeView()
+        self.setup_tree_view()
+        self.main_widget.add_widget(self.tree_view, stretch=1)
+        self.tree_view.hide()
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumHeight(6)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        self.main_widget.add_widget(self.progress_bar, stretch=0)
         self.layout.addWidget(self.main_widget)
         self.add_text_size_controls()
         self.setLayout(self.layout)
 
         self.syntax_highlighter = PythonHighlighter(self.edit_text_widget.document())
+        # Formats are only applied to blocks around the viewport
+        self.edit_text_widget.verticalScrollBar().valueChanged.connect(
+            self.update_visible_blocks
+        )
 
     def setup_text_edit(self):
         self.edit_text_widget.setReadOnly(True)
         self.edit_text_widget.setLineWrapMode(QTextEdit.NoWrap)
         self.edit_text_widget.setTabStopWidth(20)
-        self.edit_text_widget.setFontFamily("Courier")
-        self.edit_text_widget.setFontPointSize(15)
+        # The widget font is the document's default font, so resizing it
+        # applies to all text without touching the document
+        font = self.edit_text_widget.font()
+        font.setFamily("Courier")
+        font.setPointSize(15)
+        self.edit_text_widget.setFont(font)
         self.edit_text_widget.setLineWrapMode(QTextEdit.FixedPixelWidth)
         self.edit_text_widget.setLineWrapColumnOrWidth(600)
         self.edit_text_widget.setWordWrapMode(QTextOption.NoWrap)
         self.edit_text_widget.setStyleSheet("background-color: rgb(5,5,5);")
 
+    def setup_tree_view(self):
+        self.tree_view.setModel(self.result_model)
+        # Rows share one height, so the view never measures off-screen rows
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setAlternatingRowColors(True)
+        self.tree_view.setStyleSheet(
+            "background-color: rgb(5,5,5); alternate-background-color: rgb(14,14,18);"
+            + "color: rgb(200,200,200);"
+        )
+        font = self.tree_view.font()
+        font.setFamily("Courier")
+        font.setPointSize(15)
+        self.tree_view.setFont(font)
+        self.tree_view.header().resizeSection(0, 300)
+
+    def show_text(self, text):
+        """Show a plain text result."""
+        self.result_data = None
+        self.render_text = None
+        self._format_token = None
+        self.tree_view.hide()
+        self.edit_text_widget.show()
+        with instrumentation.span("show_text", "render"):
+            self.edit_text_widget.clear()
+            self.edit_text_widget.append(text)
+
+    def show_data(self, data, render_text):
+        """Show a structured result in the tree view.
+
+        In text mode the result is rendered as text instead.
+
+        Args:
+            data (dict): Structured result.
+            render_text (Callable): Turns ``data`` into text.
+        """
+        self.result_data = data
+        self.render_text = render_text
+        self._format_token = None
+        if self.text_mode:
+            self.tree_view.hide()
+            self.edit_text_widget.show()
+            self.edit_text_widget.clear()
+            if self.format_worker is None:
+                text = render_text(data)
+                with instrumentation.span("show_text", "render"):
+                    self.edit_text_widget.append(text)
+            else:
+                self._format_token = object()
+                self.format_worker.submit(self._format_token, render_text, data)
+                self.show_progress(0, 0)
+        else:
+            self.edit_text_widget.hide()
+            self.edit_text_widget.clear()
+            with instrumentation.span("show_data", "render"):
+                self.result_model.set_result(data)
+            self.tree_view.show()
+
+    def on_formatted(self, token, text):
+        """Show text rendered by the format worker, unless it is outdated."""
+        if token is not self._format_token:
+            return
+        self._format_token = None
+        self.hide_progress()
+        with instrumentation.span("show_text", "render"):
+            self.edit_text_widget.append(text)
+
+    def show_progress(self, done, total):
+        """Show inspection progress, a busy indicator if ``total`` is 0."""
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.progress_bar.show()
+
+    def hide_progress(self):
+        self.progress_bar.hide()
+
+    def toggle_text_mode(self):
+        """Switch structured results between the tree view and text."""
+        self.text_mode = not self.text_mode
+        self.mode_button.setText(" Tree " if self.text_mode else " Text ")
+        if self.result_data is not None:
+            self.show_data(self.result_data, self.render_text)
+
+    def export_text(self) -> str:
+        """The shown result as text, whichever view is active."""
+        if self.result_data is not None:
+            return self.render_text(self.result_data)
+        return self.edit_text_widget.toPlainText()
+
     def add_text_size_controls(self):
         self.buttons_holder = NeatWidgetConstructor(
             layout_type=NeatLayoutTypes.HORIZONTAL,
@@ -49,6 +178,8 @@ class EditWidget(QWidget):
         self.buttons_holder.add_widget(
             self.create_button(" - ", self.decrease_font_size)
         )
+        self.mode_button = self.create_button(" Text ", self.toggle_text_mode)
+        self.buttons_holder.add_widget(self.mode_button)
         self.main_widget.add_widget(self.buttons_holder, stretch=0)
 
     def create_button(self, text, callback):
@@ -66,24 +197,37 @@ class EditWidget(QWidget):
         button.clicked.connect(callback)
         return button
 
+    def update_visible_blocks(self):
+        """Tell the highlighter which blocks are on screen."""
+        viewport = self.edit_text_widget.viewport()
+        first = self.edit_text_widget.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = self.edit_text_widget.cursorForPosition(
+            QPoint(0, viewport.height())
+        ).blockNumber()
+        self.syntax_highlighter.set_visible_range(first, last)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_visible_blocks()
+
     def refresh_highlighting(self):
-        cursor_position = self.edit_text_widget.textCursor().position()
-        content = self.edit_text_widget.toPlainText()
-        self.edit_text_widget.setPlainText("")  # Clear text
-        self.edit_text_widget.setPlainText(content)  # Reset text
-        cursor = self.edit_text_widget.textCursor()
-        cursor.setPosition(cursor_position)
-        self.edit_text_widget.setTextCursor(cursor)
+        """Re-apply highlighting to the blocks on screen."""
+        self.update_visible_blocks()
+        self.syntax_highlighter.rehighlight_visible()
+
+    def set_font_size(self, font_size):
+        for widget in (self.edit_text_widget, self.tree_view):
+            font = widget.font()
+            font.setPointSize(font_size)
+            widget.setFont(font)
+        # The viewport now holds a different number of lines
+        self.update_visible_blocks()
 
     def increase_font_size(self):
-        font_size = self.edit_text_widget.fontPointSize()
-        self.edit_text_widget.setFontPointSize(font_size + 1)
-        self.refresh_highlighting()
+        self.set_font_size(self.edit_text_widget.font().pointSize() + 1)
 
     def decrease_font_size(self):
-        font_size = self.edit_text_widget.fontPointSize()
-        self.edit_text_widget.setFontPointSize(font_size - 1)
-        self.refresh_highlighting()
+        self.set_font_size(max(self.edit_text_widget.font().pointSize() - 1, 1))
 
     def __getattr__(self, name):
         """Delegate attribute access to the inner QTextEdit."""
@@ -1,47 +1,510 @@
 import hou
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
 
+from .hip_reader import is_channel_function
+from .instrumentation import instrumentation
+from .template_cache import multiparm_types
 
-def explode_me(node):
-    nodePos = node.position()
-    newName = node.name()
-    nodePath = node.path()
-    nodePath = nodePath.split(node.name())[0]
 
-    # Collect parameter values first
-    parmDict = {}
+class ExplodeResult(NamedTuple):
+    """Outcome of exploding one node.
+
+    Attributes:
+        path (str): Path of the exploded node.
+        new_path (str, optional): Path of the new subnet, None if it failed.
+        seconds (float): Time spent on the node.
+        error (str, optional): Error message if the node could not be exploded.
+        skipped_parms (tuple): Parms whose value or expression could not be copied.
+    """
+
+    path: str
+    new_path: Optional[str]
+    seconds: float
+    error: Optional[str] = None
+    skipped_parms: tuple = ()
+
+
+@contextmanager
+def explode_session(undo_label):
+    """Suspend cooking and record everything as a single undo step.
+
+    Args:
+        undo_label (str): Name of the undo entry.
+    """
+    update_mode = hou.updateModeSetting()
+    hou.setUpdateMode(hou.updateMode.Manual)
+    try:
+        with hou.undos.group(undo_label):
+            yield
+    finally:
+        hou.setUpdateMode(update_mode)
+
+
+class ExplodePlan(NamedTuple):
+    """Everything an explode will write, computed before touching the scene.
+
+    Attributes:
+        path (str): Path of the node to explode.
+        multiparm_counts (tuple): ``{counter parm: instance count}`` per nesting
+            level, outermost first, so instance parms exist before they are set.
+        values (dict): ``{parm name: value}`` of parms that are not animated.
+        expressions (dict): ``{hou.exprLanguage: {parm name: expression}}`` of
+            parms driven by a single expression.
+        keyframes (dict): ``{parm name: keyframes}`` of animated parms, set in
+            one call per parm.
+        child_count (int): Direct children copied into the subnet.
+        connections (int): Input and output connections to rewire.
+        nested (tuple): Plans of the locked HDAs inside the node that are
+            exploded too.
+        nested_hda_depth (int): Deepest nesting of locked HDAs inside the
+            node, whether they are exploded or not. 0 if there are none.
+    """
+
+    path: str
+    multiparm_counts: tuple
+    values: dict
+    expressions: dict
+    keyframes: dict
+    child_count: int
+    connections: int
+    nested: tuple
+    nested_hda_depth: int
+
+    def parm_writes(self) -> int:
+        """Number of parms written, nested plans included."""
+        return (
+            sum(len(counts) for counts in self.multiparm_counts)
+            + len(self.values)
+            + sum(len(expressions) for expressions in self.expressions.values())
+            + len(self.keyframes)
+            + sum(plan.parm_writes() for plan in self.nested)
+        )
+
+    def operation_count(self) -> int:
+        """Estimated number of hou calls changing the scene, nested plans included.
+
+        Bulk calls count once, so this is what the explode costs in undo
+        entries and scene updates rather than in parms.
+        """
+        return (
+            # createNode, setPosition, setParmTemplateGroup, copyNodesTo
+            4
+            + len(self.multiparm_counts)
+            + (1 if self.values else 0)
+            + len(self.expressions)
+            + len(self.keyframes)
+            + self.connections
+            # bypass and display flags
+            + 2
+            + sum(plan.operation_count() for plan in self.nested)
+        )
+
+    def summary(self) -> dict:
+        """JSON compatible summary, e.g. for a dry run report."""
+        return {
+            "path": self.path,
+            "multiparm_counters": sum(len(counts) for counts in self.multiparm_counts),
+            "multiparm_levels": len(self.multiparm_counts),
+            "values": len(self.values),
+            "expressions": sum(len(exprs) for exprs in self.expressions.values()),
+            "animated_parms": len(self.keyframes),
+            "keyframes": sum(len(keys) for keys in self.keyframes.values()),
+            "children": self.child_count,
+            "nested_hda_depth": self.nested_hda_depth,
+            "nested": [plan.summary() for plan in self.nested],
+            "parm_writes": self.parm_writes(),
+            "operations": self.operation_count(),
+        }
+
+
+def is_locked_hda(node) -> bool:
+    """Whether a node is an HDA instance whose contents are locked."""
+    return node.type().definition() is not None and node.isLockedHDA()
+
+
+def is_user_expression(keyframe) -> bool:
+    """Whether a keyframe holds an expression rather than a channel function."""
+    return keyframe.isExpressionSet() and not is_channel_function(
+        keyframe.expression()
+    )
+
+
+def collect_parm_data(node):
+    """Read every parm of a node, hidden ones included, sorted by how it is set.
+
+    Values are read unexpanded, so ``$HIP``, ``$F`` or backticks in string
+    parms are copied as they are. A parm with a single key is copied as an
+    expression if that key holds one typed by a user, animated parms
+    otherwise keep their keyframes. Multiparm counters are read both ways:
+    their current count creates the instances, then their expression or
+    keyframes are copied like any other parm's.
+
+    Args:
+        node (hou.Node): Node to read.
+
+    Returns:
+        tuple: ``(multiparm_counts, values, expressions, keyframes)``, see
+            ``ExplodePlan``.
+    """
+    counts_by_level = defaultdict(dict)
+    values = {}
+    expressions = defaultdict(dict)
+    keyframes = {}
     for parm in node.parms():
-        if parm.isVisible():
-            try:
-                expr = parm.expression()
-            except:
-                expr = None
-            parmDict[parm.name()] = {"value": parm.eval(), "expression": expr}
+        name = parm.name()
+        parm_template = parm.parmTemplate()
+        parm_type = parm_template.type()
+        parm_keyframes = parm.keyframes()
+        if (
+            parm_type == hou.parmTemplateType.Folder
+            and parm_template.folderType() in multiparm_types
+        ):
+            level = len(parm.multiParmInstanceIndices())
+            counts_by_level[level][name] = parm.eval()
+            if not parm_keyframes:
+                continue
+        elif not parm_keyframes:
+            if parm_type == hou.parmTemplateType.String:
+                values[name] = parm.unexpandedString()
+            else:
+                values[name] = parm.eval()
+            continue
+        if len(parm_keyframes) == 1 and is_user_expression(parm_keyframes[0]):
+            language = parm.expressionLanguage()
+            expressions[language][name] = parm_keyframes[0].expression()
+        else:
+            keyframes[name] = parm_keyframes
+    multiparm_counts = tuple(
+        counts_by_level[level] for level in sorted(counts_by_level)
+    )
+    return multiparm_counts, values, dict(expressions), keyframes
+
+
+def _nested_locked_hdas(node, max_depth):
+    """Locked HDAs inside a node, to explode up to ``max_depth`` levels of HDAs.
+
+    Returns:
+        tuple: ``(nodes to plan, deepest locked HDA nesting)``. Nodes to plan
+            are the outermost locked HDAs, HDAs inside them are planned by
+            their own plan.
+    """
+    to_plan = []
+    deepest = 0
+    # Stack of (node, locked HDAs above it inside the exploded node)
+    stack = [(child, 0) for child in node.children()]
+    while stack:
+        child, depth = stack.pop()
+        if is_locked_hda(child):
+            depth += 1
+            deepest = max(deepest, depth)
+            if depth == 1 and max_depth > 0:
+                to_plan.append(child)
+        stack.extend((grandchild, depth) for grandchild in child.children())
+    return to_plan, deepest
+
+
+def plan_explode(node, nested_depth=0) -> ExplodePlan:
+    """Compute what exploding a node will write, without changing the scene.
+
+    Args:
+        node (hou.Node): Node to explode.
+        nested_depth (int, optional): Levels of locked HDAs inside the node to
+            explode as well. 0 only explodes the node itself.
+
+    Returns:
+        ExplodePlan: The plan, see ``execute_plan``.
+    """
+    with instrumentation.span("plan_explode", "collect", node=node.path):
+        multiparm_counts, values, expressions, keyframes = collect_parm_data(node)
+        nested_nodes, nested_hda_depth = _nested_locked_hdas(node, nested_depth)
+        children = node.children()
+        return ExplodePlan(
+            node.path(),
+            multiparm_counts,
+            values,
+            expressions,
+            keyframes,
+            len(children),
+            len([i for i in node.inputs() if i is not None])
+            + len(node.outputConnections()),
+            tuple(plan_explode(nested, nested_depth - 1) for nested in nested_nodes),
+            nested_hda_depth,
+        )
+
+
+def _set_each(set_parm, items) -> list:
+    """Fallback of the bulk setters, returns the names that failed."""
+    skipped = []
+    for name, value in items:
+        try:
+            set_parm(name, value)
+        except hou.Error:
+            skipped.append(name)
+    return skipped
+
+
+def _split_missing(node, items) -> tuple:
+    """Split ``{parm name: data}`` into the node's parms and the names it lacks."""
+    present = {}
+    missing = []
+    for name, data in items.items():
+        if node.parm(name) is None:
+            missing.append(name)
+        else:
+            present[name] = data
+    return present, missing
+
+
+def _set_values(node, values) -> list:
+    """``setParms`` falling back to one parm at a time, returns skipped names."""
+    present, missing = _split_missing(node, values)
+    try:
+        node.setParms(present)
+    except hou.Error:
+        missing += _set_each(
+            lambda name, value: node.parm(name).set(value), present.items()
+        )
+    return missing
+
 
+def transfer_parm_data(node, plan) -> list:
+    """Write the parm data of a plan to a node in bulk.
+
+    Multiparm counters are set first, outermost level first, so instance
+    parms exist before their values arrive. Parms the node doesn't have are
+    skipped. If a bulk call fails, e.g. on a locked parm, its parms are set
+    one by one and the failing ones skipped.
+
+    Args:
+        node (hou.Node): Node to write to.
+        plan (ExplodePlan): Plan of the node the data comes from.
+
+    Returns:
+        list: Names of the skipped parms.
+    """
+    skipped = []
+    for counts in plan.multiparm_counts:
+        skipped += _set_values(node, counts)
+    skipped += _set_values(node, plan.values)
+
+    for language, language_expressions in plan.expressions.items():
+        language_expressions, missing = _split_missing(node, language_expressions)
+        skipped += missing
+        try:
+            node.setParmExpressions(language_expressions, language)
+        except hou.Error:
+            skipped += _set_each(
+                lambda name, expression: node.parm(name).setExpression(
+                    expression, language
+                ),
+                language_expressions.items(),
+            )
+
+    keyframes, missing = _split_missing(node, plan.keyframes)
+    skipped += missing
+    skipped += _set_each(
+        lambda name, parm_keyframes: node.parm(name).setKeyframes(parm_keyframes),
+        keyframes.items(),
+    )
+    return skipped
+
+
+def execute_plan(node, plan):
+    """Replace a node by a subnet with the same interface, parms, children and wiring.
+
+    Locked HDAs planned in ``plan.nested`` are exploded inside the new subnet.
+    The scene outside the new subnet is only changed once everything else
+    succeeded. If anything fails, the subnet is destroyed and the node's
+    connections and bypass flag are restored before the error is raised.
+
+    Args:
+        node (hou.Node): Node to explode, the one the plan was made for or a copy.
+        plan (ExplodePlan): Output of ``plan_explode``.
+
+    Returns:
+        tuple: ``(new node, skipped parm names)``.
+    """
     # Create the new node
-    newNode = hou.node(nodePath).createNode("subnet", newName + "_Cracked")
-    newNode.setPosition(nodePos + hou.Vector2(1, 0))
+    new_node = node.parent().createNode("subnet", node.name() + "_Cracked")
+    outputs = [
+        (output.outputItem(), output.inputIndex(), output.outputIndex())
+        for output in node.outputConnections()
+    ]
+    bypassed = node.isBypassed()
+    try:
+        new_node.setPosition(node.position() + hou.Vector2(1, 0))
+
+        # Set the template group
+        new_node.setParmTemplateGroup(node.parmTemplateGroup())
+
+        # Copy child nodes
+        hou.copyNodesTo(node.children(), new_node)
+
+        # Set parameter values
+        skipped = transfer_parm_data(new_node, plan)
+
+        # Nested HDAs were copied along with the children, explode the copies
+        for nested in plan.nested:
+            relative_path = nested.path[len(plan.path) + 1 :]
+            _, nested_skipped = execute_plan(new_node.node(relative_path), nested)
+            skipped += [f"{relative_path}/{name}" for name in nested_skipped]
 
-    # Set the template group
-    template_group = node.parmTemplateGroup()
-    newNode.setParmTemplateGroup(template_group)
+        # Set connections
+        for input in node.inputs():
+            new_node.setNextInput(input)
+        for output_item, input_index, output_index in outputs:
+            output_item.setInput(input_index, new_node, output_index)
 
-    # Copy child nodes
-    hou.copyNodesTo(node.children(), newNode)
+        node.bypass(True)
+        new_node.setDisplayFlag(True)
+    except BaseException:
+        _restore(node, new_node, outputs, bypassed)
+        raise
+    return new_node, skipped
 
-    # Set parameter values
-    for name, pd in parmDict.items():
+
+def _restore(node, new_node, outputs, bypassed):
+    """Undo a failed ``execute_plan``: drop the subnet and rewire the node."""
+    for output_item, input_index, output_index in outputs:
         try:
-            newNode.parm(name).set(pd["value"])
-            if pd["expression"] is not None:
-                newNode.parm(name).setExpression(pd["expression"])
-        except:
-            continue
+            output_item.setInput(input_index, node, output_index)
+        except hou.Error:
+            pass
+    node.bypass(bypassed)
+    try:
+        new_node.destroy()
+    except hou.ObjectWasDeleted:
+        pass
+
+
+def explode_me(node, nested_depth=0):
+    """Explode one node into a subnet, see ``explode_nodes``.
 
-    # Set connections
-    for input in node.inputs():
-        newNode.setNextInput(input)
-    for i, output in enumerate(node.outputConnections()):
-        output.outputItem().setInput(output.inputIndex(), newNode, output.outputIndex())
+    Args:
+        node (hou.Node): Node to explode.
+        nested_depth (int, optional): Levels of locked HDAs inside the node to
+            explode as well.
 
-    node.bypass(True)
-    newNode.setDisplayFlag(True)
+    Returns:
+        hou.Node: The new subnet.
+    """
+    plan = plan_explode(node, nested_depth)
+    with explode_session(f"Explode {node.name()} to subnet"):
+        new_node, _ = execute_plan(node, plan)
+    return new_node
+
+
+def plan_nodes(nodes, nested_depth=0) -> list:
+    """Plan exploding many nodes, e.g. for a dry run.
+
+    Args:
+        nodes (list): Nodes to explode.
+        nested_depth (int, optional): See ``plan_explode``.
+
+    Returns:
+        list: An ``ExplodePlan`` per node.
+    """
+    return [plan_explode(node, nested_depth) for node in nodes]
+
+
+def format_plan_report(plans) -> str:
+    """One line per planned node, then the totals.
+
+    Args:
+        plans (list): Output of ``plan_nodes``.
+
+    Returns:
+        str: Plain text report.
+    """
+    lines = []
+    for plan in plans:
+        summary = plan.summary()
+        lines.append(
+            f"{plan.path}: {summary['parm_writes']} parm writes "
+            f"({summary['values']} values, {summary['expressions']} expressions, "
+            f"{summary['animated_parms']} animated with {summary['keyframes']} "
+            f"keyframes, {summary['multiparm_counters']} multiparm counters), "
+            f"{summary['children']} children, nested HDA depth "
+            f"{summary['nested_hda_depth']}, {len(plan.nested)} nested explodes, "
+            f"~{summary['operations']} operations"
+        )
+    lines.append(
+        f"{len(plans)} nodes, {sum(plan.parm_writes() for plan in plans)} parm "
+        f"writes, ~{sum(plan.operation_count() for plan in plans)} operations"
+    )
+    return "\n".join(lines)
+
+
+def explode_nodes(nodes, undo_label="Explode to subnets", nested_depth=0) -> list:
+    """Explode many nodes into subnets in one go.
+
+    Every node is planned (see ``plan_explode``) and the plan executed in
+    one pass. Cooking is suspended (manual update mode) while the nodes are
+    exploded, parm data is copied in bulk and the whole batch is a single
+    undo step. A node that fails doesn't stop the others and leaves the
+    scene as it was, see ``execute_plan``.
+
+    Args:
+        nodes (list): Nodes to explode.
+        undo_label (str, optional): Name of the undo entry.
+        nested_depth (int, optional): See ``plan_explode``.
+
+    Returns:
+        list: An ``ExplodeResult`` per node, in the same order.
+    """
+    results = []
+    with explode_session(undo_label):
+        for node in nodes:
+            path = node.path()
+            start = time.perf_counter()
+            try:
+                with instrumentation.span("explode", "action", node=path):
+                    new_node, skipped = execute_plan(
+                        node, plan_explode(node, nested_depth)
+                    )
+            except Exception as error:
+                # execute_plan already rolled the scene back, report and go on
+                if not isinstance(error, hou.Error):
+                    error = f"{type(error).__name__}: {error}"
+                results.append(
+                    ExplodeResult(path, None, time.perf_counter() - start, str(error))
+                )
+                continue
+            results.append(
+                ExplodeResult(
+                    path,
+                    new_node.path(),
+                    time.perf_counter() - start,
+                    skipped_parms=tuple(skipped),
+                )
+            )
+    return results
+
+
+def format_explode_report(results) -> str:
+    """One line per node with its timing, then the totals.
+
+    Args:
+        results (list): Output of ``explode_nodes``.
+
+    Returns:
+        str: Plain text report.
+    """
+    lines = []
+    for result in results:
+        if result.error:
+            lines.append(
+                f"FAILED {result.path} ({result.seconds * 1e3:.1f} ms): {result.error}"
+            )
+            continue
+        line = f"{result.path} -> {result.new_path} ({result.seconds * 1e3:.1f} ms)"
+        if result.skipped_parms:
+            line += f", skipped parms: {', '.join(result.skipped_parms)}"
+        lines.append(line)
+    failed = sum(1 for result in results if result.error)
+    total = sum(result.seconds for result in results)
+    lines.append(f"{len(results) - failed} exploded, {failed} failed in {total:.2f} s")
+    return "\n".join(lines)
@@ -1,33 +1,53 @@
 import hou
+from typing import Optional
 
+from .instrumentation import instrumentation
+from .utils import ParmInfo, multiparm_types
+from .wrapper_codegen import WrapperParm, class_name_for, render_slots_wrapper
+from .writers import open_writer
 
-def generate_properties(node):
-    class_name = "".join(word.title() for word in node.name().split("_"))
-    code = f"class {class_name}Wrapper:\n    def __init__(self, node):\n        self.node = node\n"
 
-    parm_template_group = node.parmTemplateGroup()
-    folder_parms = {}
+@instrumentation.traced("format")
+def generate_properties(node, slots=False, writer=None):
+    """Generate a wrapper class exposing the node's parms as properties.
 
-    for parm_template in parm_template_group.entries():
-        if isinstance(parm_template, hou.FolderParmTemplate):
-            folder_name = parm_template.name()
-            folder_parms[folder_name] = parm_template.parmTemplates()
-        else:
-            folder_parms["root"] = folder_parms.get("root", [])
-            folder_parms["root"].append(parm_template)
+    Parms in nested folders are included, multiparm instances are not.
 
-    for folder, parms in folder_parms.items():
-        if folder != "root":
-            code += f"    # from folder {folder}\n"
+    Args:
+        node (hou.Node): Node to generate the wrapper for.
+        slots (bool, optional): Generate the ``__slots__`` wrapper with cached
+            parm handles and bulk get/set instead. See ``generate_slots_wrapper``.
+        writer (TextWriter, optional): Where to write the source. If not given,
+            the source is returned as a string.
 
-        for parm_template in parms:
-            if isinstance(
-                parm_template, (hou.SeparatorParmTemplate, hou.FolderParmTemplate)
-            ):
-                continue
+    Returns:
+        str: Python source of the class.
+        None: If a writer was given.
+    """
+    if slots:
+        return generate_slots_wrapper(node, writer)
 
-            parm_name = parm_template.name()
-            code += f"""
+    writer, owned = open_writer(writer)
+    class_name = "".join(word.title() for word in node.name().split("_"))
+    writer.write(
+        f"class {class_name}Wrapper:\n    def __init__(self, node):\n        self.node = node\n"
+    )
+
+    folder_path = ()
+    for record in ParmInfo(node).template_analysis.records:
+        # Multiparm instance templates have no parm of their own name
+        if "#" in record.name:
+            continue
+        if record.folder_path != folder_path:
+            folder_path = record.folder_path
+            if folder_path:
+                writer.write(f"    # from folder {'/'.join(folder_path)}\n")
+            else:
+                writer.write("    # top level\n")
+
+        parm_name = record.name
+        writer.write(
+            f"""
     @property
     def {parm_name}(self):
         return self.node.parm('{parm_name}').eval()
@@ -36,24 +56,28 @@ def generate_properties(node):
     def {parm_name}(self, value):
         self.node.parm('{parm_name}').set(value)
 """
-    return code
+        )
+    return writer.getvalue() if owned else None
 
 
-def generate_properties_for_folder(folder_parm_template, indent):
+def generate_properties_for_folder(folder_parm_template, indent, writer=None):
     """
     Generate Python property and setter methods for folder parameter templates.
 
     Args:
         folder_parm_template (hou.FolderParmTemplate): The folder parameter template.
         indent (int): Current indentation level.
+        writer (TextWriter, optional): Where to write the source. If not given,
+            the source is returned as a string.
 
     Returns:
         str: The string containing the Python property and setter methods.
+        None: If a writer was given.
     """
-    output_code = ""
+    writer, owned = open_writer(writer)
     for parm_template in folder_parm_template.parmTemplates():
         if isinstance(parm_template, hou.FolderParmTemplate):
-            output_code += generate_properties_for_folder(parm_template, indent + 1)
+            generate_properties_for_folder(parm_template, indent + 1, writer)
         else:
             parm_name = parm_template.name()
             property_code = f"""
@@ -68,6 +92,81 @@ def generate_properties_for_folder(folder_parm_template, indent):
         self.node.parm("{parm_name}").set(value)
 """
 
-            output_code += property_code + setter_code
+            writer.write(property_code)
+            writer.write(setter_code)
+
+    return writer.getvalue() if owned else None
+
+
+_TEMPLATE_KINDS = {
+    hou.parmTemplateType.Float: "float",
+    hou.parmTemplateType.Int: "int",
+    hou.parmTemplateType.Toggle: "int",
+    hou.parmTemplateType.String: "string",
+}
+
 
-    return output_code
+def wrapper_parms_from_node(node) -> list:
+    """Describe the parms of a node for wrapper generation.
+
+    Multiparm block counters are listed before their first instance
+    template. Buttons are skipped.
+
+    Args:
+        node (hou.Node): Node to describe.
+
+    Returns:
+        list: ``WrapperParm`` entries in interface order.
+    """
+    analysis = ParmInfo(node).template_analysis
+    multiparm_paths = {
+        folder_path: folder
+        for folder_path, folder in analysis.folders.items()
+        if folder.folderType() in multiparm_types
+    }
+
+    wrapper_parms = []
+    emitted_blocks = set()
+    for record in analysis.records:
+        template = record.template
+        if template.type() == hou.parmTemplateType.Button:
+            continue
+        for depth in range(1, len(record.folder_path) + 1):
+            folder_path = record.folder_path[:depth]
+            if folder_path in multiparm_paths and folder_path not in emitted_blocks:
+                emitted_blocks.add(folder_path)
+                wrapper_parms.append(
+                    WrapperParm(
+                        multiparm_paths[folder_path].name(), "int", 1, folder_path[:-1]
+                    )
+                )
+        wrapper_parms.append(
+            WrapperParm(
+                record.name,
+                _TEMPLATE_KINDS.get(template.type(), "other"),
+                template.numComponents(),
+                record.folder_path,
+            )
+        )
+    return wrapper_parms
+
+
+@instrumentation.traced("format")
+def generate_slots_wrapper(node, writer=None) -> Optional[str]:
+    """Generate a ``__slots__`` wrapper module source for a node.
+
+    Args:
+        node (hou.Node): Node to generate the wrapper for.
+        writer (TextWriter, optional): Where to write the source. If not given,
+            the source is returned as a string.
+
+    Returns:
+        str: Python source, ``import hou`` included.
+        None: If a writer was given.
+    """
+    writer, owned = open_writer(writer)
+    writer.write("import hou\n\n\n")
+    render_slots_wrapper(
+        class_name_for(node.name()), wrapper_parms_from_node(node), writer
+    )
+    return writer.getvalue() if owned else None
@@ -1,4 +1,5 @@
 from .utils import ParmInfo, pretty_print_dict
+from .hou_proxy import HouTransaction
 import hou
 
 
@@ -30,5 +31,6 @@ def get_parms_with_expressions(parm_info_instance) -> dict:
 
 
 def get_parm_expressions_string(node):
-    parm_info = ParmInfo(node)
-    return pretty_print_dict(get_parms_with_expressions(parm_info), indent=1)
+    with HouTransaction() as transaction:
+        parm_info = ParmInfo(transaction.wrap(node))
+        return pretty_print_dict(get_parms_with_expressions(parm_info), indent=1)
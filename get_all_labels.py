@@ -1,40 +1,61 @@
 import hou
 
+from .instrumentation import instrumentation
+from .writers import open_writer
 
-def traverse_parms_from_node(node, indent=0):
+
+@instrumentation.traced("format")
+def traverse_parms_from_node(node, indent=0, writer=None):
     """
     Traverse parameter templates from a given Houdini node.
 
     Args:
         node (hou.Node): Houdini node.
         indent (int): Current indentation level.
+        writer (TextWriter, optional): Where to write the output. If not given,
+            the output is returned as a string.
 
     Returns:
         str: Indented string representation of the parameter templates.
+        None: If a writer was given.
     """
     parm_template_group = node.parmTemplateGroup()
     parms = parm_template_group.entries()
-    return traverse_parms(parms, indent)
+    return traverse_parms(parms, indent, writer)
 
 
-def traverse_parms(parms, indent=0):
+def traverse_parms(parms, indent=0, writer=None):
     """
     Traverse Houdini parameter templates and generate an indented string representation.
 
+    Folders are walked with an explicit stack and every line goes straight
+    to the writer, so the cost is linear in the number of templates.
+
     Args:
         parms (list): List of Houdini parameter templates to traverse.
         indent (int): Current indentation level.
+        writer (TextWriter, optional): Where to write the output. If not given,
+            the output is returned as a string.
 
     Returns:
         str: Indented string representation of the parameter templates.
+        None: If a writer was given.
     """
-    output_str = ""
-    for parm in parms:
-        if isinstance(parm, hou.FolderParmTemplate):
-            if parm.label().strip():
-                output_str += "    " * indent + f"## {parm.label()}\n"
-            output_str += traverse_parms(parm.parmTemplates(), indent + 1)
-        else:
-            if parm.label().strip():
-                output_str += "    " * indent + f"### {parm.label()}\n"
-    return output_str
+    writer, owned = open_writer(writer)
+
+    stack = [(iter(parms), indent)]
+    while stack:
+        parm = next(stack[-1][0], None)
+        if parm is None:
+            stack.pop()
+            continue
+        level = stack[-1][1]
+        label = parm.label()
+        if parm.type() == hou.parmTemplateType.Folder:
+            if label.strip():
+                writer.write("    " * level + f"## {label}\n")
+            stack.append((iter(parm.parmTemplates()), level + 1))
+        elif label.strip():
+            writer.write("    " * level + f"### {label}\n")
+
+    return writer.getvalue() if owned else None
@@ -0,0 +1,522 @@
+import hashlib
+import json
+import os
+from typing import NamedTuple, Optional
+
+from .cpio_archive import CpioArchive
+from .hip_reader import CLOSE, NEWLINE, OPEN, tokenize
+
+
+# Bump when the parsed record layout changes, so old cache files are ignored
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "node_inspector",
+    "hda_index",
+)
+
+# DialogScript blocks holding statements rather than values
+FOLDER_KEYWORDS = {
+    "group": "tabs",
+    "groupsimple": "simple",
+    "groupcollapsible": "collapsible",
+    "groupradio": "radio",
+    "multiparm": "multiparm",
+    "multiscroll": "multiparm_scrolling",
+    "multiswitcher": "multiparm_tabbed",
+}
+BLOCK_KEYWORDS = {"parm", "import", *FOLDER_KEYWORDS}
+CONDITIONAL_KEYWORDS = ("disablewhen", "hidewhen", "nocookwhen")
+
+
+class DialogParm(NamedTuple):
+    """A parm template described by a DialogScript.
+
+    Attributes:
+        name (str): Parameter name, ``#`` included for multiparm templates.
+        label (str): Parameter label.
+        type (str): DialogScript type, e.g. ``float``, ``toggle``, ``string``.
+        size (int): Number of components.
+        default (tuple): Default values as written in the script.
+        folder_path (tuple): Names of the enclosing folders, outermost first.
+        callback (tuple or None): ``(script, language)`` if a callback is set.
+        conditionals (dict): ``disablewhen``/``hidewhen``/``nocookwhen`` expressions.
+        multiparm_block (str or None): Innermost enclosing multiparm block.
+        hidden (bool): Whether the parm is invisible.
+    """
+
+    name: str
+    label: str
+    type: str
+    size: int
+    default: tuple
+    folder_path: tuple
+    callback: Optional[tuple]
+    conditionals: dict
+    multiparm_block: Optional[str]
+    hidden: bool
+
+
+class DialogFolder(NamedTuple):
+    """A folder or multiparm block described by a DialogScript.
+
+    Attributes:
+        name (str): Folder name.
+        label (str): Folder label.
+        kind (str): One of the ``FOLDER_KEYWORDS`` values.
+        folder_path (tuple): Names of the enclosing folders, outermost first.
+    """
+
+    name: str
+    label: str
+    kind: str
+    folder_path: tuple
+
+    @property
+    def is_multiparm(self) -> bool:
+        return self.kind.startswith("multiparm")
+
+
+class DialogInterface(NamedTuple):
+    """Parameter interface parsed from a DialogScript."""
+
+    parms: tuple
+    folders: tuple
+
+
+def _parse_values(tokens, i):
+    """Parse a bracketed value group into a nested list, newlines ignored."""
+    values = []
+    while i < len(tokens):
+        token = tokens[i]
+        if token is NEWLINE:
+            i += 1
+        elif isinstance(token, tuple) and token[0] is OPEN:
+            nested, i = _parse_values(tokens, i + 1)
+            values.append(nested)
+        elif isinstance(token, tuple) and token[0] is CLOSE:
+            return values, i + 1
+        else:
+            values.append(token)
+            i += 1
+    return values, i
+
+
+def _parse_statements(tokens, i):
+    """Parse statements until the closing brace of the current block.
+
+    Returns:
+        tuple: ``(statements, next index)``, statements being ``(key, values)``
+        pairs where values of block keywords are statement lists themselves.
+    """
+    statements = []
+    count = len(tokens)
+    while i < count:
+        token = tokens[i]
+        if token is NEWLINE:
+            i += 1
+            continue
+        if isinstance(token, tuple):
+            if token[0] is CLOSE:
+                return statements, i + 1
+            # Stray group, keep it as an anonymous statement
+            values, i = _parse_values(tokens, i + 1)
+            statements.append(("", values))
+            continue
+
+        key = str(token)
+        i += 1
+        if (
+            key in BLOCK_KEYWORDS
+            and i < count
+            and isinstance(tokens[i], tuple)
+            and tokens[i][0] is OPEN
+        ):
+            block, i = _parse_statements(tokens, i + 1)
+            statements.append((key, block))
+            continue
+
+        values = []
+        while i < count and tokens[i] is not NEWLINE:
+            token = tokens[i]
+            if isinstance(token, tuple):
+                if token[0] is CLOSE:
+                    break
+                nested, i = _parse_values(tokens, i + 1)
+                values.append(nested)
+            else:
+                values.append(token)
+                i += 1
+        statements.append((key, values))
+    return statements, i
+
+
+def parse_dialog_script(text):
+    """Parse DialogScript text into a statement tree.
+
+    Args:
+        text (str): DialogScript section text.
+
+    Returns:
+        list: ``(key, values)`` statements of the top level block.
+    """
+    tokens = list(tokenize(text, newlines=True, comments=True))
+    # Skip to the opening brace of the script
+    for start, token in enumerate(tokens):
+        if isinstance(token, tuple) and token[0] is OPEN:
+            return _parse_statements(tokens, start + 1)[0]
+    return []
+
+
+def _first(values, default=""):
+    return str(values[0]) if values and not isinstance(values[0], list) else default
+
+
+def _flatten(values):
+    for value in values:
+        if isinstance(value, list):
+            yield from _flatten(value)
+        else:
+            yield str(value)
+
+
+def build_interface(statements) -> DialogInterface:
+    """Turn DialogScript statements into parm and folder records.
+
+    Args:
+        statements (list): Output of ``parse_dialog_script``.
+
+    Returns:
+        DialogInterface: Parms and folders in script order.
+    """
+    parms = []
+    folders = []
+    # Stack of (statements iterator, folder path, multiparm block, hidden)
+    stack = [(iter(statements), (), None, False)]
+    while stack:
+        block, folder_path, multiparm_block, folder_hidden = stack[-1]
+        statement = next(block, None)
+        if statement is None:
+            stack.pop()
+            continue
+
+        key, values = statement
+        if key in FOLDER_KEYWORDS:
+            fields = {k: v for k, v in values if k not in BLOCK_KEYWORDS}
+            name = _first(fields.get("name", ()))
+            kind = FOLDER_KEYWORDS[key]
+            folders.append(
+                DialogFolder(name, _first(fields.get("label", ())), kind, folder_path)
+            )
+            stack.append(
+                (
+                    iter(values),
+                    folder_path + (name,),
+                    name if kind.startswith("multiparm") else multiparm_block,
+                    folder_hidden or "invisible" in fields,
+                )
+            )
+        elif key == "parm":
+            fields = {}
+            tags = {}
+            for field_key, field_values in values:
+                if field_key == "parmtag":
+                    tag = list(_flatten(field_values))
+                    if len(tag) >= 2:
+                        tags[tag[0]] = tag[1]
+                else:
+                    fields[field_key] = field_values
+
+            callback = None
+            script = tags.get("script_callback") or _first(fields.get("callback", ()))
+            if script:
+                callback = (script, tags.get("script_callback_language", "hscript"))
+
+            size = _first(fields.get("size", ()), "1")
+            parms.append(
+                DialogParm(
+                    name=_first(fields.get("name", ())),
+                    label=_first(fields.get("label", ())),
+                    type=_first(fields.get("type", ())),
+                    size=int(size) if size.isdigit() else 1,
+                    default=tuple(_flatten(fields.get("default", ()))),
+                    folder_path=folder_path,
+                    callback=callback,
+                    conditionals={
+                        keyword: _first(fields[keyword])
+                        for keyword in CONDITIONAL_KEYWORDS
+                        if _first(fields.get(keyword, ())).strip()
+                    },
+                    multiparm_block=multiparm_block,
+                    hidden=folder_hidden or "invisible" in fields,
+                )
+            )
+    return DialogInterface(tuple(parms), tuple(folders))
+
+
+def parse_index_section(text) -> dict:
+    """Parse ``INDEX__SECTION`` into ``{operator name: {key: value}}``."""
+    operators = {}
+    current = None
+    for line in text.splitlines():
+        key, separator, value = line.partition(":")
+        if not separator:
+            continue
+        key, value = key.strip(), value.strip()
+        if key == "Operator":
+            current = {}
+        if current is None:
+            continue
+        current[key] = value
+        if key == "Table" and "Operator" in current:
+            operators[f"{value}/{current['Operator']}"] = current
+    return operators
+
+
+def parse_sections_list(text) -> dict:
+    """Parse ``Sections.list`` into ``{section name: operator or file name}``."""
+    sections = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            sections[parts[0]] = parts[1]
+    return sections
+
+
+class HdaDefinition(NamedTuple):
+    """One definition of an HDA library.
+
+    Attributes:
+        name (str): Operator name with category, e.g. ``Sop/foo``.
+        section (str): Archive member holding the definition.
+        label (str): Operator label.
+        version (str): Definition version, empty if not set.
+        modified (str): Modification date from the library index.
+        sections (tuple): Member names inside the definition.
+    """
+
+    name: str
+    section: str
+    label: str
+    version: str
+    modified: str
+    sections: tuple
+
+
+class HdaLibrary:
+    """Memory mapped view of an .hda/.otl library.
+
+    Opening a library reads its index only. DialogScripts are parsed the
+    first time ``interface()`` is called for a definition and kept in the
+    ``HdaIndex`` on-disk cache when the library came from one.
+    """
+
+    def __init__(self, path, cache=None):
+        """
+        Args:
+            path (str): Library file.
+            cache (dict, optional): Cached interfaces keyed by operator name, updated in place.
+        """
+        self.path = path
+        self.archive = CpioArchive(path)
+        self.cache = cache if cache is not None else {}
+        self.cache_dirty = False
+        # Cache validity stamp, set by HdaIndex
+        self.stamp = None
+        self._nested = {}
+
+        index = {}
+        if "INDEX__SECTION" in self.archive:
+            index = parse_index_section(self.archive.read_text("INDEX__SECTION"))
+        sections = {}
+        if "Sections.list" in self.archive:
+            sections = parse_sections_list(self.archive.read_text("Sections.list"))
+
+        self.definitions = {}
+        for section, operator in sections.items():
+            if section not in self.archive or operator not in index:
+                continue
+            info = index[operator]
+            self.definitions[operator] = HdaDefinition(
+                operator,
+                section,
+                info.get("Label", ""),
+                info.get("Version", ""),
+                info.get("Modified", ""),
+                (),
+            )
+
+    def _definition_archive(self, name) -> CpioArchive:
+        archive = self._nested.get(name)
+        if archive is None:
+            archive = self._nested[name] = self.archive.open_nested(
+                self.definitions[name].section
+            )
+        return archive
+
+    def definition(self, name) -> HdaDefinition:
+        """Get a definition with the list of its sections filled in."""
+        definition = self.definitions[name]
+        if not definition.sections:
+            definition = self.definitions[name] = definition._replace(
+                sections=tuple(self._definition_archive(name).names())
+            )
+        return definition
+
+    def read_section(self, name, section) -> Optional[str]:
+        """Get the text of a definition section, None if it doesn't exist."""
+        archive = self._definition_archive(name)
+        if section not in archive:
+            return None
+        return archive.read_text(section)
+
+    def extra_file_options(self, name) -> dict:
+        text = self.read_section(name, "ExtraFileOptions")
+        if not text:
+            return {}
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {}
+
+    def interface(self, name) -> DialogInterface:
+        """Parse the DialogScript of a definition.
+
+        Args:
+            name (str): Operator name with category, e.g. ``Sop/foo``.
+
+        Returns:
+            DialogInterface: Parms and folders of the definition.
+        """
+        cached = self.cache.get(name)
+        if cached is not None:
+            return _interface_from_json(cached)
+
+        text = self.read_section(name, "DialogScript") or ""
+        interface = build_interface(parse_dialog_script(text))
+        self.cache[name] = _interface_to_json(interface)
+        self.cache_dirty = True
+        return interface
+
+    def close(self):
+        self._nested.clear()
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _interface_to_json(interface) -> dict:
+    return {
+        "parms": [list(parm) for parm in interface.parms],
+        "folders": [list(folder) for folder in interface.folders],
+    }
+
+
+def _interface_from_json(data) -> DialogInterface:
+    parms = []
+    for fields in data["parms"]:
+        parm = DialogParm(*fields)
+        parms.append(
+            parm._replace(
+                default=tuple(parm.default),
+                folder_path=tuple(parm.folder_path),
+                callback=tuple(parm.callback) if parm.callback else None,
+            )
+        )
+    folders = tuple(
+        DialogFolder(name, label, kind, tuple(folder_path))
+        for name, label, kind, folder_path in data["folders"]
+    )
+    return DialogInterface(tuple(parms), folders)
+
+
+def file_hash(path) -> str:
+    """SHA-1 of a file, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HdaIndex:
+    """Open HDA libraries with a per-library on-disk cache of parsed interfaces.
+
+    A cache file is reused while the library's modification time and size
+    (or content hash, with ``use_hash=True``) are unchanged.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, use_hash=False):
+        self.cache_dir = cache_dir
+        self.use_hash = use_hash
+        self._libraries = {}
+
+    def _cache_path(self, path) -> str:
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, name + ".json")
+
+    def _stamp(self, path) -> dict:
+        stat = os.stat(path)
+        stamp = {"version": CACHE_VERSION, "mtime": stat.st_mtime, "size": stat.st_size}
+        if self.use_hash:
+            stamp["hash"] = file_hash(path)
+        return stamp
+
+    def open(self, path) -> HdaLibrary:
+        """Open a library, loading cached interfaces if they are still valid."""
+        library = self._libraries.get(path)
+        if library is not None:
+            return library
+
+        stamp = self._stamp(path)
+        interfaces = {}
+        try:
+            with open(self._cache_path(path)) as cache_file:
+                cached = json.load(cache_file)
+            if cached.get("stamp") == stamp:
+                interfaces = cached.get("interfaces", {})
+        except (OSError, ValueError):
+            pass
+
+        library = self._libraries[path] = HdaLibrary(path, interfaces)
+        library.stamp = stamp
+        return library
+
+    def save(self):
+        """Write the cache of every library that parsed new interfaces."""
+        for path, library in self._libraries.items():
+            if not library.cache_dirty:
+                continue
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_path = self._cache_path(path)
+            temp_path = cache_path + ".tmp"
+            with open(temp_path, "w") as cache_file:
+                json.dump(
+                    {"stamp": library.stamp, "interfaces": library.cache}, cache_file
+                )
+            os.replace(temp_path, cache_path)
+            library.cache_dirty = False
+
+    def iter_interfaces(self, paths):
+        """Yield ``(library path, definition, interface)`` for every definition of the libraries."""
+        for path in paths:
+            library = self.open(path)
+            for name in list(library.definitions):
+                yield path, library.definition(name), library.interface(name)
+
+    def close(self):
+        self.save()
+        for library in self._libraries.values():
+            library.close()
+        self._libraries.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
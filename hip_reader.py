@@ -0,0 +1,382 @@
+import json
+import re
+from fnmatch import fnmatchcase
+
+from .cpio_archive import CpioArchive
+
+
+_TOKEN = re.compile(
+    r'"((?:[^"\\]|\\.)*)"'  # quoted string
+    r"|([{}()\[\]])"  # bracket
+    r"|(\n)"  # newline
+    r'|([^\s{}()\[\]"]+)',  # bare word
+    re.S,
+)
+# Same tokens, plus whole line ``#`` comments outside quoted strings
+_TOKEN_OR_COMMENT = re.compile(
+    r"(?m:^[ \t]*#[^\n]*)|" + _TOKEN.pattern,
+    re.S,
+)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+_ESCAPE = re.compile(r"\\(.)", re.S)
+
+# Marker tokens, compared by identity so a quoted "{" is never a bracket
+OPEN, CLOSE, NEWLINE = object(), object(), object()
+_BRACKETS = {"{": OPEN, "[": OPEN, "(": OPEN, "}": CLOSE, "]": CLOSE, ")": CLOSE}
+
+# Segment functions Houdini puts on keys, as opposed to expressions typed by a user
+CHANNEL_FUNCTION = re.compile(
+    r"\s*(hou\.)?(bezier|linear|constant|cubic|spline|qlinear|quintic"
+    r"|ease|easein|easeout|easep|easeinp|easeoutp|match|matchin|matchout"
+    r"|vmatch|vmatchin|vmatchout)\(\s*\)\s*"
+)
+
+
+class Word(str):
+    """Unquoted token. Plain ``str`` tokens were quoted in the source."""
+
+
+def unescape(text) -> str:
+    return _ESCAPE.sub(lambda match: _ESCAPES.get(match.group(1), match.group(1)), text)
+
+
+def tokenize(text, newlines=False, comments=False):
+    """Split Houdini section text into tokens.
+
+    Args:
+        text (str): Section text.
+        newlines (bool, optional): Whether to yield ``NEWLINE`` markers.
+        comments (bool, optional): Whether lines starting with ``#`` are
+            comments and skipped. Quoted strings are never cut by a comment.
+
+    Yields:
+        ``Word`` for bare words, ``str`` for quoted strings, and
+        ``(marker, bracket)`` tuples for brackets, marker being ``OPEN`` or ``CLOSE``.
+    """
+    if comments:
+        matches = _TOKEN_OR_COMMENT.finditer(text)
+    else:
+        matches = _TOKEN.finditer(text)
+    for match in matches:
+        if match.lastindex is None:
+            # Comment, the only alternative without a group
+            continue
+        quoted, bracket, newline, word = match.groups()[-4:]
+        if bracket:
+            yield (_BRACKETS[bracket], bracket)
+        elif newline:
+            if newlines:
+                yield NEWLINE
+        elif word:
+            yield Word(word)
+        else:
+            yield unescape(quoted)
+
+
+def convert_value(token):
+    """Turn a bare numeric word into a number, leave everything else as is."""
+    if not isinstance(token, Word):
+        return str(token)
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return str(token)
+
+
+def _is(token, marker, bracket=None):
+    return (
+        isinstance(token, tuple)
+        and token[0] is marker
+        and (bracket is None or token[1] == bracket)
+    )
+
+
+def parse_parm_section(text):
+    """Parse a ``.parm`` section.
+
+    Lines look like ``t [ 0 locks=0 ] ( 0 [ ty 1 ] 0 )`` where a bracketed
+    pair refers to an animated channel and its current value.
+
+    Args:
+        text (str): Section text.
+
+    Returns:
+        tuple: ``(values, channels)`` where values maps parm tuple names to
+        tuples of values and channels maps channel names to their parm tuple.
+    """
+    tokens = list(tokenize(text))
+    values = {}
+    channels = {}
+    i = 0
+    count = len(tokens)
+    while i < count:
+        token = tokens[i]
+        # Entries are "name [ flags ] ( values )"
+        if isinstance(token, Word) and i + 1 < count and _is(tokens[i + 1], OPEN, "["):
+            name = str(token)
+            i += 2
+            while i < count and not _is(tokens[i], CLOSE, "]"):
+                i += 1
+            i += 1
+            if i >= count or not _is(tokens[i], OPEN, "("):
+                continue
+            i += 1
+            components = []
+            while i < count and not _is(tokens[i], CLOSE, ")"):
+                if _is(tokens[i], OPEN, "["):
+                    # [ channel value ]
+                    channel, value = tokens[i + 1], tokens[i + 2]
+                    channels[str(channel)] = name
+                    components.append(convert_value(value))
+                    i += 4
+                    continue
+                components.append(convert_value(tokens[i]))
+                i += 1
+            values[name] = tuple(components)
+        i += 1
+    return values, channels
+
+
+_CALLABLE_END = re.compile(r"[\w$]$")
+
+
+def is_channel_function(expression) -> bool:
+    """Whether a key's expression is a segment function like ``bezier()``."""
+    return CHANNEL_FUNCTION.fullmatch(expression) is not None
+
+
+def render_tokens(tokens) -> str:
+    """Turn tokens back into text, e.g. ``sin ( $F )`` into ``sin($F)``.
+
+    Tokens are separated by a space, except inside brackets, before a
+    closing bracket and between a name and the bracket that follows it.
+    Quoted strings lose their quotes.
+    """
+    parts = []
+    previous = None
+    for token in tokens:
+        if isinstance(token, tuple):
+            marker, text = token
+            attach = marker is CLOSE or (
+                isinstance(previous, Word) and _CALLABLE_END.search(previous)
+            )
+        else:
+            text = str(token)
+            attach = False
+        if previous is not None and not attach and not _is(previous, OPEN):
+            parts.append(" ")
+        parts.append(text)
+        previous = token
+    return "".join(parts)
+
+
+def _assignments(tokens):
+    """Collect ``key = value`` pairs of a flat token list."""
+    result = {}
+    positions = [
+        i for i, token in enumerate(tokens) if token == "=" and isinstance(token, Word)
+    ]
+    for n, position in enumerate(positions):
+        key = tokens[position - 1]
+        stop = positions[n + 1] - 1 if n + 1 < len(positions) else len(tokens)
+        value = tokens[position + 1 : stop]
+        result[str(key)] = render_tokens(value)
+    return result
+
+
+def parse_chn_section(text):
+    """Parse a ``.chn`` section into channel segments.
+
+    Args:
+        text (str): Section text.
+
+    Returns:
+        dict: Lists of segment dicts (``expr``, ``value``, ``length``...) keyed by channel name.
+    """
+    tokens = list(tokenize(text))
+    channels = {}
+    i = 0
+    count = len(tokens)
+    while i < count:
+        token = tokens[i]
+        if token == "channel" and isinstance(token, Word) and i + 2 < count:
+            name = str(tokens[i + 1])
+            segments = channels.setdefault(name, [])
+            depth = 0
+            i += 2
+            while i < count:
+                token = tokens[i]
+                if _is(token, OPEN, "{"):
+                    depth += 1
+                elif _is(token, CLOSE, "}"):
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif (
+                    token == "segment"
+                    and i + 1 < count
+                    and _is(tokens[i + 1], OPEN, "{")
+                ):
+                    start = i + 2
+                    i = start
+                    # Values may hold braces of their own
+                    segment_depth = 1
+                    while i < count:
+                        if _is(tokens[i], OPEN, "{"):
+                            segment_depth += 1
+                        elif _is(tokens[i], CLOSE, "}"):
+                            segment_depth -= 1
+                            if segment_depth == 0:
+                                break
+                        i += 1
+                    segments.append(_assignments(tokens[start:i]))
+                i += 1
+        i += 1
+    return channels
+
+
+def parse_userdata_section(text):
+    """Parse a ``.userdata`` section into ``{key: value}``.
+
+    The section is JSON with ``{"type": ..., "value": ...}`` entries.
+    Unparseable sections are returned as ``{"__raw__": text}``.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {"__raw__": text}
+    return {
+        key: entry.get("value") if isinstance(entry, dict) else entry
+        for key, entry in data.items()
+    }
+
+
+def parse_init_section(text) -> dict:
+    """Parse a ``.init`` section (``key = value`` lines)."""
+    result = {}
+    for line in text.splitlines():
+        key, separator, value = line.partition("=")
+        if separator:
+            result[key.strip()] = value.strip()
+    return result
+
+
+class HipReader:
+    """Read node parameters from a .hip file without Houdini.
+
+    The file is memory mapped and only its cpio headers are read up front.
+    Each node is stored as ``<path>.init``, ``<path>.parm``, ``<path>.chn``,
+    ``<path>.userdata``... members, which are parsed only when asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = CpioArchive(path)
+        self._sections = {}
+        for name in self.archive.names():
+            node_name, dot, section = name.rpartition(".")
+            if dot and node_name and not node_name.startswith("."):
+                self._sections.setdefault("/" + node_name, set()).add(section)
+
+    def node_paths(self) -> list:
+        """Paths of every node stored in the file, in archive order."""
+        return [path for path, sections in self._sections.items() if "init" in sections]
+
+    def _text(self, node_path, section):
+        if section not in self._sections.get(node_path, ()):
+            return None
+        return self.archive.read_text(node_path[1:] + "." + section)
+
+    def node_type(self, node_path) -> str:
+        text = self._text(node_path, "init")
+        return parse_init_section(text).get("type", "") if text else ""
+
+    def parm_values(self, node_path) -> dict:
+        """Stored parm tuple values keyed by parm tuple name."""
+        text = self._text(node_path, "parm")
+        return parse_parm_section(text)[0] if text else {}
+
+    def channels(self, node_path) -> dict:
+        """Channel segments keyed by channel (parm) name."""
+        text = self._text(node_path, "chn")
+        return parse_chn_section(text) if text else {}
+
+    def expressions(self, node_path):
+        """Split channels into expressions and keyframed channels.
+
+        Returns:
+            tuple: ``(expressions, keyframes)``. Single segment channels with an
+            expression typed by a user map to it, like ``hou.Parm.expression()``;
+            other channels with segments map to their segment count.
+        """
+        expressions = {}
+        keyframes = {}
+        for name, segments in self.channels(node_path).items():
+            if len(segments) == 1:
+                expression = segments[0].get("expr")
+                if expression and not is_channel_function(expression):
+                    expressions[name] = expression
+                    continue
+            if segments:
+                keyframes[name] = len(segments)
+        return expressions, keyframes
+
+    def user_data(self, node_path) -> dict:
+        text = self._text(node_path, "userdata")
+        return parse_userdata_section(text) if text else {}
+
+    def iter_records(
+        self, collect=("values", "expressions", "user_data"), node_type_filter=None
+    ):
+        """Yield one record per node, shaped like the records of ``scan``.
+
+        Args:
+            collect (tuple, optional): Any of ``values``, ``expressions``,
+                ``keyframes`` and ``user_data``.
+            node_type_filter (str or list, optional): Glob pattern(s) matched against the type name.
+
+        Yields:
+            dict: ``{"hip", "path", "type", "results", "errors"}`` per node.
+        """
+        patterns = (
+            [node_type_filter] if isinstance(node_type_filter, str) else node_type_filter
+        )
+        for node_path in self.node_paths():
+            node_type = self.node_type(node_path)
+            if patterns and not any(fnmatchcase(node_type, p) for p in patterns):
+                continue
+            results = {}
+            errors = {}
+            try:
+                if "values" in collect:
+                    results["values"] = self.parm_values(node_path)
+                if "expressions" in collect or "keyframes" in collect:
+                    expressions, keyframes = self.expressions(node_path)
+                    if "expressions" in collect:
+                        results["expressions"] = expressions
+                    if "keyframes" in collect:
+                        results["keyframes"] = keyframes
+                if "user_data" in collect:
+                    results["user_data"] = self.user_data(node_path)
+            except (ValueError, IndexError) as error:
+                errors["parse"] = str(error)
+            yield {
+                "hip": self.path,
+                "path": node_path,
+                "type": node_type,
+                "results": results,
+                "errors": errors,
+            }
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
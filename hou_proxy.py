@@ -0,0 +1,257 @@
+"""Memoize read-only ``hou`` calls for the duration of one inspection.
+
+Every call on a ``hou`` object crosses into C++ and usually allocates a new
+wrapper object. Collectors ask the same questions many times (template
+names, types, ``node.parm(name)``...), so an inspection can run against
+proxies that remember the answers::
+
+    with HouTransaction() as transaction:
+        parm_info = ParmInfo(transaction.wrap(node))
+        ...
+    print(transaction.hits, transaction.misses)
+
+The node must not be modified while the transaction is open. Once it is
+closed its proxies forward every call to the real object. Step generators
+that hand control back to the UI between steps run through
+``HouTransaction.steps``, which forgets memoized results at every step.
+"""
+import weakref
+from logging import getLogger
+
+import hou
+
+from .instrumentation import instrumentation
+
+logger = getLogger(__name__)
+
+
+# Read-only methods whose results are memoized, whatever the object type
+MEMOIZED_METHODS = frozenset(
+    (
+        # hou.Node
+        "parmTemplateGroup",
+        "parm",
+        "parmTuple",
+        "parms",
+        "spareParms",
+        "path",
+        "name",
+        "type",
+        "sessionId",
+        "userDataDict",
+        # hou.NodeType, hou.HDADefinition
+        "nameWithCategory",
+        "definition",
+        "libraryFilePath",
+        "version",
+        "modificationTime",
+        # hou.ParmTemplateGroup, hou.ParmTemplate
+        "entries",
+        "parmTemplates",
+        "label",
+        "isHidden",
+        "defaultValue",
+        "scriptCallback",
+        "scriptCallbackLanguage",
+        "conditionals",
+        "numComponents",
+        "folderType",
+        # hou.Parm, hou.ParmTuple
+        "expression",
+        "parmTemplate",
+    )
+)
+
+
+def _proxied_types() -> tuple:
+    """hou classes whose instances are wrapped in proxies."""
+    return (
+        hou.Node,
+        hou.NodeType,
+        hou.HDADefinition,
+        hou.ParmTemplateGroup,
+        hou.ParmTemplate,
+        hou.Parm,
+        hou.ParmTuple,
+    )
+
+
+class _CallFailed:
+    """A memoized exception, raised again on every call."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class HouProxy:
+    """Stand-in for a ``hou`` object that memoizes ``MEMOIZED_METHODS``.
+
+    ``isinstance`` checks see the wrapped object's class. Objects returned
+    by memoized calls are wrapped too. Other attributes are forwarded.
+    """
+
+    __slots__ = ("_obj", "_transaction", "_memo", "__weakref__")
+
+    def __init__(self, obj, transaction):
+        self._obj = obj
+        self._transaction = transaction
+        self._memo = {}
+
+    @property
+    def __class__(self):
+        return type(self._obj)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._obj, name)
+        memo = self._memo
+        if name not in MEMOIZED_METHODS or memo is None:
+            return attribute
+        transaction = self._transaction
+
+        def call(*args, **kwargs):
+            try:
+                if kwargs:
+                    key = (name, args, frozenset(kwargs.items()))
+                else:
+                    key = (name, args)
+                result = memo[key]
+            except KeyError:
+                transaction.misses += 1
+                try:
+                    result = transaction.wrap(attribute(*args, **kwargs))
+                except hou.Error as error:
+                    result = _CallFailed(error)
+                memo[key] = result
+            except TypeError:
+                # Unhashable arguments
+                return attribute(*args, **kwargs)
+            else:
+                transaction.hits += 1
+            if type(result) is _CallFailed:
+                raise result.error
+            return result
+
+        return call
+
+    def __eq__(self, other):
+        return self._obj == unwrap(other)
+
+    def __ne__(self, other):
+        return self._obj != unwrap(other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __repr__(self):
+        return repr(self._obj)
+
+    def __str__(self):
+        return str(self._obj)
+
+
+def unwrap(obj):
+    """The real ``hou`` object behind a proxy, for passing back into ``hou``."""
+    if type(obj) is HouProxy:
+        return obj._obj
+    return obj
+
+
+class HouTransaction:
+    """Scope in which read-only ``hou`` calls made through proxies are memoized.
+
+    Attributes:
+        hits (int): Calls answered from memory.
+        misses (int): Calls that reached ``hou``.
+    """
+
+    # Totals over every closed transaction
+    total_hits = 0
+    total_misses = 0
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.closed = False
+        # Weak references, so proxies dropped by a long job are not kept alive
+        self._proxies = []
+        self._types = _proxied_types()
+
+    def wrap(self, obj):
+        """Wrap a ``hou`` object, or a tuple or list of them, in proxies.
+
+        Other values are returned as they are.
+        """
+        if self.closed:
+            return obj
+        if isinstance(obj, self._types) and type(obj) is not HouProxy:
+            proxy = HouProxy(obj, self)
+            self._proxies.append(weakref.ref(proxy))
+            return proxy
+        if isinstance(obj, (tuple, list)) and obj and isinstance(obj[0], self._types):
+            return type(obj)(self.wrap(item) for item in obj)
+        return obj
+
+    def reset(self):
+        """Forget every memoized result, proxies keep memoizing from now on.
+
+        Call it whenever the scene may have changed, e.g. after handing
+        control back to the user.
+        """
+        proxies = []
+        for reference in self._proxies:
+            proxy = reference()
+            if proxy is not None and proxy._memo is not None:
+                proxy._memo.clear()
+                proxies.append(reference)
+        self._proxies = proxies
+
+    def steps(self, steps):
+        """Run a step generator, forgetting memoized results at every step.
+
+        The UI may run other events, including edits to the node, between
+        two steps, so memoized results only live within one step.
+
+        Step generator, see ``steps.run_steps``.
+
+        Args:
+            steps (Generator): Step generator using this transaction's proxies.
+
+        Returns:
+            The value returned by ``steps``.
+        """
+        try:
+            while True:
+                try:
+                    step = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                self.reset()
+                yield step
+        finally:
+            steps.close()
+
+    def close(self):
+        """Drop every memoized result. Proxies keep working without memoizing."""
+        if self.closed:
+            return
+        self.closed = True
+        for reference in self._proxies:
+            proxy = reference()
+            if proxy is not None:
+                proxy._memo = None
+        self._proxies = []
+        HouTransaction.total_hits += self.hits
+        HouTransaction.total_misses += self.misses
+        instrumentation.count("hou_calls", self.misses)
+        instrumentation.count("hou_calls_saved", self.hits)
+        logger.debug(
+            "hou transaction closed: %d calls saved, %d made", self.hits, self.misses
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
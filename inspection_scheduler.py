@@ -0,0 +1,141 @@
+"""Run inspections a few steps at a time so the Houdini UI stays responsive.
+
+``hou`` may only be used from the main thread, so actions are written as
+step generators (see ``utils.run_steps``) and ``InspectionScheduler`` runs
+them in short time slices from a zero-interval ``QTimer``. Formatting that
+doesn't touch ``hou`` is handed to ``FormatWorker`` instead.
+"""
+import queue
+import time
+from logging import getLogger
+
+import hou
+from PySide2.QtCore import QObject, QThread, QTimer, Signal
+
+logger = getLogger(__name__)
+
+
+# Seconds of work done per timer tick before returning to the event loop
+TIME_SLICE = 0.008
+
+
+class InspectionScheduler(QObject):
+    """Run one step generator at a time, interleaved with Qt events.
+
+    Starting a job cancels the running one.
+
+    Signals:
+        progress (int, int): ``(done, total)`` reported by the job.
+        finished: The job ran to completion.
+        failed (str): The job raised an exception. Errors other than
+            ``hou.Error`` are logged with their traceback.
+    """
+
+    progress = Signal(int, int)
+    finished = Signal()
+    failed = Signal(str)
+
+    def __init__(self, time_slice=TIME_SLICE, parent=None):
+        super().__init__(parent)
+        self.time_slice = time_slice
+        self._job = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_slice)
+
+    def start(self, steps):
+        """Start running a step generator, cancelling the current job.
+
+        Args:
+            steps (Generator): Step generator to run.
+        """
+        self.cancel()
+        self._job = steps
+        self._timer.start()
+
+    def cancel(self):
+        """Stop the current job, if any. Its generator is closed."""
+        self._timer.stop()
+        if self._job is not None:
+            job, self._job = self._job, None
+            job.close()
+
+    def is_running(self) -> bool:
+        """Whether a job is in progress."""
+        return self._job is not None
+
+    def _run_slice(self):
+        deadline = time.perf_counter() + self.time_slice
+        progress = None
+        try:
+            while True:
+                step = next(self._job)
+                if step is not None:
+                    progress = step
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self._job = None
+            self._timer.stop()
+            self.finished.emit()
+            return
+        except Exception as error:
+            self._job = None
+            self._timer.stop()
+            if isinstance(error, hou.Error):
+                logger.debug("Inspection failed: %s", error)
+            else:
+                logger.exception("Inspection failed")
+            self.failed.emit(str(error) or type(error).__name__)
+            return
+
+        if progress is not None:
+            self.progress.emit(*progress)
+
+
+class FormatWorker(QThread):
+    """Worker thread for pure Python formatting.
+
+    Requests are ``(token, function, args)``. Results come back on the main
+    thread through ``formatted``, together with the request's token, so
+    callers can ignore results they no longer need.
+
+    Signals:
+        formatted (object, object): ``(token, result)`` of a request.
+    """
+
+    formatted = Signal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._requests = queue.Queue()
+
+    def submit(self, token, function, *args):
+        """Queue ``function(*args)``, starting the thread if needed.
+
+        Args:
+            token (object): Returned with the result.
+            function (Callable): Must not use ``hou`` or Qt widgets.
+        """
+        self._requests.put((token, function, args))
+        if not self.isRunning():
+            self.start()
+
+    def stop(self):
+        """Finish the queued requests and stop the thread."""
+        if self.isRunning():
+            self._requests.put(None)
+            self.wait()
+
+    def run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            token, function, args = request
+            try:
+                result = function(*args)
+            except Exception as error:
+                logger.exception("Formatting failed")
+                result = f"Formatting failed: {error}"
+            self.formatted.emit(token, result)
@@ -0,0 +1,232 @@
+"""Timing spans and counters for inspection actions.
+
+Instrumentation is off by default and then costs one attribute check per
+span or counter. Turn it on with ``instrumentation.enable()`` or by setting
+``NODE_INSPECTOR_TRACE=1``, then export what was recorded::
+
+    instrumentation.enable()
+    ...
+    print(instrumentation.summary())
+    instrumentation.export_chrome_trace("inspect.json")  # chrome://tracing
+
+Spans are grouped in categories: ``action`` for a whole button action,
+``collect`` for reading the node, ``format`` for building text and
+``render`` for putting results on screen. Spans around step generators
+measure wall time, including the time handed back to the UI between steps.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+from typing import NamedTuple
+
+
+class Span(NamedTuple):
+    """A recorded timing span.
+
+    Attributes:
+        name (str): What was timed.
+        category (str): ``action``, ``collect``, ``format``, ``render``...
+        start (float): ``time.perf_counter()`` at the start, in seconds.
+        duration (float): Seconds.
+        thread_id (int): Thread the span ran on.
+        args (dict): Extra values shown in the trace viewer.
+    """
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    args: dict
+
+
+class _NoSpan:
+    """Context manager used while instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("_instrumentation", "name", "category", "args", "_start")
+
+    def __init__(self, instrumentation, name, category, args):
+        self._instrumentation = instrumentation
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        self._instrumentation.spans.append(
+            Span(
+                self.name,
+                self.category,
+                self._start,
+                end - self._start,
+                threading.get_ident(),
+                self.args,
+            )
+        )
+        return False
+
+
+class Instrumentation:
+    """Collects timing spans and counters while enabled.
+
+    Attributes:
+        enabled (bool): Whether anything is recorded.
+        spans (list): Recorded ``Span`` entries.
+        counters (dict): Counter name to total, e.g. ``hou_calls``.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self.counters = defaultdict(int)
+        self._origin = time.perf_counter()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.spans = []
+        self.counters = defaultdict(int)
+        self._origin = time.perf_counter()
+
+    def span(self, name, category="", **args):
+        """Time a block of code::
+
+            with instrumentation.span("snapshot", "collect", node=node.path):
+                ...
+
+        Args:
+            name (str): What is timed.
+            category (str, optional): Span category.
+            **args: Extra values shown in the trace viewer. Callables are
+                only called if instrumentation is enabled, so values costing
+                a ``hou`` call are passed as e.g. ``node.path``.
+
+        Returns:
+            Context manager recording the span if instrumentation is enabled.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        args = {
+            key: value() if callable(value) else value for key, value in args.items()
+        }
+        return _ActiveSpan(self, name, category, args)
+
+    def traced(self, category, name=None):
+        """Decorator timing every call of a function.
+
+        Args:
+            category (str): Span category.
+            name (str, optional): Span name. Defaults to the function name.
+        """
+
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @wraps(func)
+            def traced_func(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _ActiveSpan(self, span_name, category, {}):
+                    return func(*args, **kwargs)
+
+            return traced_func
+
+        return decorator
+
+    def count(self, name, amount=1):
+        """Add to a counter, e.g. ``count("bytes_rendered", len(text))``."""
+        if self.enabled:
+            self.counters[name] += amount
+
+    def chrome_trace(self) -> dict:
+        """The recorded data in Chrome trace event format.
+
+        Returns:
+            dict: ``{"traceEvents": [...]}``, loadable in chrome://tracing or Perfetto.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - self._origin) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {key: str(value) for key, value in span.args.items()},
+            }
+            for span in self.spans
+        ]
+        now = (time.perf_counter() - self._origin) * 1e6
+        events.extend(
+            {"name": name, "ph": "C", "ts": now, "pid": pid, "args": {name: total}}
+            for name, total in self.counters.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Write ``chrome_trace()`` to a JSON file.
+
+        Args:
+            path (str): Output file.
+        """
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump(self.chrome_trace(), stream)
+
+    def summary(self) -> str:
+        """Table of span times per (category, name), slowest first, then counters.
+
+        Returns:
+            str: Plain text table.
+        """
+        totals = defaultdict(list)
+        for span in self.spans:
+            totals[(span.category, span.name)].append(span.duration)
+
+        lines = [
+            f"{'category':<10} {'name':<36} {'calls':>7} {'total ms':>10} "
+            f"{'mean ms':>9} {'max ms':>9}"
+        ]
+        for (category, name), durations in sorted(
+            totals.items(), key=lambda item: -sum(item[1])
+        ):
+            total = sum(durations)
+            lines.append(
+                f"{category:<10} {name:<36} {len(durations):>7} {total * 1e3:>10.2f} "
+                f"{total / len(durations) * 1e3:>9.3f} {max(durations) * 1e3:>9.3f}"
+            )
+        for name, total in sorted(self.counters.items()):
+            lines.append(f"{'counter':<10} {name:<36} {total:>7}")
+        return "\n".join(lines)
+
+
+# Shared by the whole package
+instrumentation = Instrumentation(
+    enabled=os.environ.get("NODE_INSPECTOR_TRACE", "") not in ("", "0")
+)
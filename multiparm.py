@@ -0,0 +1,161 @@
+import re
+from typing import NamedTuple, Optional
+
+
+# Digit runs in instance names and "#"/digit runs in template names collapse
+# to the same skeleton, e.g. "pt_pos12" and "pt_pos#" both become "pt_pos#".
+_INSTANCE_SKELETON = re.compile(r"\d+")
+_TEMPLATE_SKELETON = re.compile(r"[\d#]+")
+
+# Component suffixes of parm tuples by ``hou.parmNamingScheme`` name. Other
+# schemes (Base1) number the components from 1.
+_COMPONENT_SUFFIXES = {
+    "XYZW": ("x", "y", "z", "w"),
+    "XYWH": ("x", "y", "w", "h"),
+    "UVW": ("u", "v", "w"),
+    "RGBA": ("r", "g", "b", "a"),
+    "MinMax": ("min", "max"),
+    "MaxMin": ("max", "min"),
+    "StartEnd": ("start", "end"),
+    "BeginEnd": ("begin", "end"),
+}
+
+
+def component_suffixes(template) -> tuple:
+    """Suffixes of the component parm names of a template, empty for single parms.
+
+    Args:
+        template (hou.ParmTemplate): Parm template.
+
+    Returns:
+        tuple: e.g. ``("x", "y", "z")`` for a vector, ``("1", "2")`` for Base1.
+    """
+    size = template.numComponents()
+    if size == 1:
+        return ()
+    try:
+        scheme = str(template.namingScheme()).rsplit(".", 1)[-1]
+    except AttributeError:
+        scheme = "Base1"
+    suffixes = _COMPONENT_SUFFIXES.get(scheme)
+    if suffixes is None or size > len(suffixes):
+        return tuple(str(index) for index in range(1, size + 1))
+    return suffixes[:size]
+
+
+class MultiparmMatch(NamedTuple):
+    """Attribution of a multiparm instance parm to its template.
+
+    Attributes:
+        block (str): Name of the innermost multiparm block.
+        index (int): Instance index within that block.
+        template (hou.ParmTemplate): Template the instance was created from.
+        parent_indices (tuple): Instance indices of enclosing blocks, outermost first.
+    """
+
+    block: str
+    index: int
+    template: "hou.ParmTemplate"
+    parent_indices: tuple = ()
+
+
+class _BlockMatcher:
+    """One compiled regular expression matching every template of a block."""
+
+    def __init__(self, block, templates):
+        self.block = block
+        self.templates = {}
+        alternatives = []
+        group = 1
+        for template in templates:
+            name = template.name()
+            # Each alternative is one outer group followed by one group per "#".
+            # Component parms add their suffix, Base1 suffixes are ambiguous
+            # with the instance index and the tuple reading wins.
+            pattern = re.escape(name).replace(r"\#", r"(\d+)")
+            suffixes = component_suffixes(template)
+            if suffixes:
+                pattern += "(?:" + "|".join(map(re.escape, suffixes)) + ")?"
+            pattern = "(" + pattern + ")"
+            alternatives.append(pattern)
+            self.templates[group] = template
+            group += name.count("#") + 1
+        self.pattern = re.compile("|".join(alternatives))
+
+    def match(self, parm_name) -> Optional[MultiparmMatch]:
+        match = self.pattern.fullmatch(parm_name)
+        if match is None:
+            return None
+        group = match.lastindex
+        template = self.templates[group]
+        indices = tuple(
+            int(match.group(i))
+            for i in range(group + 1, group + 1 + template.name().count("#"))
+        )
+        return MultiparmMatch(self.block, indices[-1], template, indices[:-1])
+
+
+class MultiparmResolver:
+    """Map multiparm instance parm names back to their block and template.
+
+    A name is looked up by its skeleton (digit runs collapsed) in a dict and
+    then checked against the pre-compiled matcher of the candidate block, so
+    resolving does not depend on the number of blocks or instances.
+    """
+
+    def __init__(self, records, folders, multiparm_types):
+        """
+        Args:
+            records (tuple): ``ParmRecord`` entries of the interface.
+            folders (dict): Folder templates keyed by folder path.
+            multiparm_types (list): Folder types that count as multiparm blocks.
+        """
+        # Parms and nested block counters are both instanced by their block
+        instanced = [(record.template, record.folder_path) for record in records]
+        instanced.extend(
+            (folder, folder_path[:-1]) for folder_path, folder in folders.items()
+        )
+
+        block_templates = {}
+        for template, folder_path in instanced:
+            if "#" not in template.name():
+                continue
+            # Attribute the template to its innermost multiparm block
+            for depth in range(len(folder_path), 0, -1):
+                folder = folders[folder_path[:depth]]
+                if folder.folderType() in multiparm_types:
+                    block_templates.setdefault(folder.name(), []).append(template)
+                    break
+
+        self.matchers = {}
+        self._candidates = {}
+        for block, templates in block_templates.items():
+            self.matchers[block] = _BlockMatcher(block, templates)
+            for template in templates:
+                name = template.name()
+                for suffix in ("", *component_suffixes(template)):
+                    skeleton = _TEMPLATE_SKELETON.sub("#", name + suffix)
+                    candidates = self._candidates.setdefault(skeleton, [])
+                    if block not in candidates:
+                        candidates.append(block)
+
+    def resolve(self, parm_name) -> Optional[MultiparmMatch]:
+        """Find the multiparm block, instance index and template of a parm.
+
+        Args:
+            parm_name (str): Instance parm or parm tuple name, e.g. ``pt_pos12x``
+                or ``pt_pos12``.
+
+        Returns:
+            MultiparmMatch: The attribution.
+            None: If the name is not a multiparm instance.
+        """
+        skeleton = _INSTANCE_SKELETON.sub("#", parm_name)
+        for block in self._candidates.get(skeleton, ()):
+            match = self.matchers[block].match(parm_name)
+            if match is not None:
+                return match
+        return None
+
+    def __contains__(self, parm_name):
+        return self.resolve(parm_name) is not None
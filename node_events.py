@@ -0,0 +1,140 @@
+import hou
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+# Event types we listen to, and the cache scopes each of them makes dirty
+WATCHED_EVENT_TYPES = (
+    hou.nodeEventType.ParmTupleChanged,
+    hou.nodeEventType.SpareParmTemplatesChanged,
+    hou.nodeEventType.NameChanged,
+    hou.nodeEventType.BeingDeleted,
+    hou.nodeEventType.ChildCreated,
+    hou.nodeEventType.CustomDataChanged,
+)
+
+EVENT_SCOPES = {
+    hou.nodeEventType.ParmTupleChanged: ("values",),
+    hou.nodeEventType.SpareParmTemplatesChanged: ("templates", "values"),
+    hou.nodeEventType.NameChanged: ("name",),
+    hou.nodeEventType.ChildCreated: ("children",),
+    hou.nodeEventType.CustomDataChanged: ("user_data",),
+}
+
+SCOPES = ("values", "templates", "name", "children", "user_data")
+
+
+class _WatchState:
+    """Generation counters and the registered callback of one watched node."""
+
+    __slots__ = ("node", "callback", "generation", "scopes")
+
+    def __init__(self, node, callback):
+        self.node = node
+        self.callback = callback
+        self.generation = 0
+        self.scopes = dict.fromkeys(SCOPES, 0)
+
+
+class NodeWatcher:
+    """Keep per-node generation counters up to date through hou node events.
+
+    Every change to a watched node bumps the node generation and the counter
+    of each affected scope. Caches store the generation they were built at
+    and compare it later, so only entries depending on a changed scope are
+    rebuilt. Unwatched nodes report no generation; callers must then assume
+    the node may have changed.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._discard_listeners = []
+
+    def watch(self, node):
+        """Start tracking a node. Watching a node twice is a no-op.
+
+        Args:
+            node (hou.Node): Node to track.
+        """
+        session_id = node.sessionId()
+        if session_id in self._states:
+            return
+
+        def callback(event_type, **kwargs):
+            self._on_event(session_id, event_type)
+
+        node.addEventCallback(WATCHED_EVENT_TYPES, callback)
+        self._states[session_id] = _WatchState(node, callback)
+
+    def unwatch(self, node):
+        """Stop tracking a node and remove its event callback.
+
+        Args:
+            node (hou.Node or int): Node or node session id.
+        """
+        session_id = node if isinstance(node, int) else node.sessionId()
+        state = self._states.pop(session_id, None)
+        if state is None:
+            return
+        try:
+            state.node.removeEventCallback(WATCHED_EVENT_TYPES, state.callback)
+        except hou.ObjectWasDeleted:
+            pass
+        self._notify_discarded(session_id)
+
+    def unwatch_all(self):
+        """Stop tracking every node."""
+        for session_id in list(self._states):
+            self.unwatch(session_id)
+
+    def is_watched(self, node) -> bool:
+        return node.sessionId() in self._states
+
+    def generation(self, node, scope=None):
+        """Get the generation counter of a node.
+
+        Args:
+            node (hou.Node or int): Node or node session id.
+            scope (str, optional): One of ``SCOPES``. Defaults to the whole node.
+
+        Returns:
+            int: Counter that changes whenever the node (or scope) changes.
+            None: If the node is not watched.
+        """
+        session_id = node if isinstance(node, int) else node.sessionId()
+        state = self._states.get(session_id)
+        if state is None:
+            return None
+        if scope is None:
+            return state.generation
+        return state.scopes[scope]
+
+    def add_discard_listener(self, listener):
+        """Call ``listener(session_id)`` whenever a node stops being watched."""
+        self._discard_listeners.append(listener)
+
+    def _on_event(self, session_id, event_type):
+        if event_type == hou.nodeEventType.BeingDeleted:
+            # Houdini drops the callbacks of deleted nodes itself
+            if self._states.pop(session_id, None) is not None:
+                self._notify_discarded(session_id)
+            return
+
+        state = self._states.get(session_id)
+        if state is None:
+            return
+        state.generation += 1
+        for scope in EVENT_SCOPES.get(event_type, ()):
+            state.scopes[scope] += 1
+
+    def _notify_discarded(self, session_id):
+        for listener in self._discard_listeners:
+            try:
+                listener(session_id)
+            except Exception:
+                logger.exception("Discard listener failed for node %s", session_id)
+
+
+# Shared by the UI, ParmInfo and the button actions
+node_watcher = NodeWatcher()
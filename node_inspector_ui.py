@@ -4,7 +4,10 @@ from .constants import BG_COLOR
 from .edit_widget import EditWidget
 from .populate_buttons import populate_buttons
 from .utils import node_validator
-from .button_callback_manager import BUTTON_MAPPING
+from .actions import registry
+from .button_callback_manager import action_steps
+from .inspection_scheduler import InspectionScheduler, FormatWorker
+from .node_events import node_watcher
 
 from .widgets_construct import NeatWidgetConstructor, NeatLayoutTypes
 from . import style
@@ -49,7 +52,10 @@ class NodePathField(QWidget):
 
 
 class MainWIndow(QMainWindow):
-    def __init__(self, parent=hou.ui.mainQtWindow()):
+    def __init__(self, parent=None):
+        # Looked up per window, a default argument would query the UI on import
+        if parent is None:
+            parent = hou.ui.mainQtWindow()
         QMainWindow.__init__(self, parent, Qt.WindowStaysOnTopHint)
         self.setWindowTitle("Node Inspector Tools")
         self.resize(1000, 200)
@@ -82,9 +88,19 @@ class MainWIndow(QMainWindow):
 
         self.node_edit_widgets = {}
 
-        # Add buttons
+        # Actions run a few steps at a time, the tab they write to is kept
+        # so progress lands in the right place
+        self.scheduler = InspectionScheduler(parent=self)
+        self.scheduler.progress.connect(self.on_inspection_progress)
+        self.scheduler.finished.connect(self.on_inspection_finished)
+        self.scheduler.failed.connect(self.on_inspection_failed)
+        self.inspected_widget = None
+        self.format_worker = FormatWorker(self)
+
+        # Add buttons, actions from entry points are imported when first used
+        self.button_actions = registry.button_labels()
         populate_buttons(
-            sample_list=[i for i in BUTTON_MAPPING.keys()],
+            sample_list=list(self.button_actions),
             buttons_list=self.buttons_list,
             layout=buttons_widget.main_layout,
             callback=self.button_callback,
@@ -115,18 +131,56 @@ class MainWIndow(QMainWindow):
     def button_callback(self, button_name):
         current_tab = self.tabs.currentWidget()
         if current_tab:
-            current_tab.clear()
             node_name = self.tabs.tabText(self.tabs.currentIndex())
             node = hou.node(node_name)
-            BUTTON_MAPPING[button_name](node, current_tab)
+            self.start_inspection(self.button_actions[button_name], node, current_tab)
+
+    def start_inspection(self, action_name, node, edit_widget):
+        """Run an action through the scheduler, cancelling the running one.
+
+        Args:
+            action_name (str): Name of the action in ``actions.registry``.
+            node (hou.Node): Node to inspect.
+            edit_widget (EditWidget): Tab to show the result in.
+        """
+        self.cancel_inspection()
+        try:
+            registry.get(action_name)
+        except Exception as error:
+            edit_widget.show_text(f"Could not load action {action_name}:\n\t{error}")
+            return
+        self.inspected_widget = edit_widget
+        self.scheduler.start(action_steps(action_name, node, edit_widget))
+
+    def cancel_inspection(self):
+        self.scheduler.cancel()
+        if self.inspected_widget is not None:
+            self.inspected_widget.hide_progress()
+            self.inspected_widget = None
+
+    def on_inspection_progress(self, done, total):
+        if self.inspected_widget is not None:
+            self.inspected_widget.show_progress(done, total)
+
+    def on_inspection_finished(self):
+        if self.inspected_widget is not None:
+            self.inspected_widget.hide_progress()
+            self.inspected_widget = None
+
+    def on_inspection_failed(self, message):
+        if self.inspected_widget is not None:
+            self.inspected_widget.hide_progress()
+            self.inspected_widget.show_text(f"Inspection failed:\n\t{message}")
+            self.inspected_widget = None
 
     def add_node(self, node_path):
         if node_path not in self.node_edit_widgets:
             node = hou.node(node_path)
             if node:
-                edit_widget = EditWidget()
+                edit_widget = EditWidget(self.format_worker)
                 self.tabs.addTab(edit_widget, node_path)
                 self.node_edit_widgets[node_path] = edit_widget
+                node_watcher.watch(node)
 
     def create_tabs(self):
         for node in self.node_path_field.nodes:
@@ -138,26 +192,26 @@ class MainWIndow(QMainWindow):
         Args:
             index (int): The index of the new tab.
         """
-        # Find the currently checked button
-        checked_button = None
-        for button in self.buttons_list:
+        # Find the action of the currently checked button
+        checked_action = None
+        for button, action_name in zip(self.buttons_list, self.button_actions.values()):
             if button.isChecked():
-                checked_button = button.text()
+                checked_action = action_name
                 break
 
+        # Results are only streamed into the visible tab
+        self.cancel_inspection()
+
         # Exit if no button is checked
-        if checked_button is None:
+        if checked_action is None:
             return
 
-        # Get the function mapped to the button and execute it
-        button_name = button.text()
-        if button_name in BUTTON_MAPPING:
-            current_tab = self.tabs.currentWidget()
-            if current_tab:
-                current_tab.clear()
-                node_name = self.tabs.tabText(self.tabs.currentIndex())
-                node = hou.node(node_name)
-                BUTTON_MAPPING[button_name](node, current_tab)
+        # Run the action again, unchanged nodes redisplay their cached result
+        current_tab = self.tabs.currentWidget()
+        if current_tab:
+            node_name = self.tabs.tabText(self.tabs.currentIndex())
+            node = hou.node(node_name)
+            self.start_inspection(checked_action, node, current_tab)
 
     def close_tab(self, index):
         """Close the tab at the given index.
@@ -165,11 +219,26 @@ class MainWIndow(QMainWindow):
         Args:
             index (int): The index of the tab to close.
         """
+        if self.tabs.widget(index) is self.inspected_widget:
+            self.cancel_inspection()
         tab_name = self.tabs.tabText(index)
-        self.node_path_field.nodes.remove(hou.node(tab_name))
+        node = hou.node(tab_name)
+        if node is not None:
+            node_watcher.unwatch(node)
+        self.node_path_field.nodes.remove(node)
         self.node_edit_widgets.pop(tab_name, None)  # Remove from the dict
         self.tabs.removeTab(index)  # Remove the tab from QTabWidget
 
+    def closeEvent(self, event):
+        """Stop inspecting and watching the nodes of every open tab."""
+        self.cancel_inspection()
+        self.format_worker.stop()
+        for node_path in self.node_edit_widgets:
+            node = hou.node(node_path)
+            if node is not None:
+                node_watcher.unwatch(node)
+        super().closeEvent(event)
+
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasText():
             event.acceptProposedAction()
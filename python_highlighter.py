@@ -1,8 +1,28 @@
-from PySide2.QtCore import QRegExp
+from PySide2.QtCore import QRegularExpression
 from PySide2.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat
 
 
+# Block states
+NORMAL = 0
+IN_SINGLE_TRIPLE = 1  # Inside a ''' string
+IN_DOUBLE_TRIPLE = 2  # Inside a """ string
+
+TRIPLE_QUOTES = {IN_SINGLE_TRIPLE: "'''", IN_DOUBLE_TRIPLE: '"""'}
+
+# Blocks around the viewport that are highlighted ahead of scrolling
+VISIBLE_MARGIN = 100
+
+
 class PythonHighlighter(QSyntaxHighlighter):
+    """Python syntax highlighter for large read-only documents.
+
+    Every block is tokenized by one precompiled regular expression. Triple
+    quoted strings spanning several blocks are tracked through the block
+    state. Blocks outside the visible range only get their state computed;
+    their formats are applied once they are scrolled into view, see
+    ``set_visible_range``.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -26,21 +46,129 @@ class PythonHighlighter(QSyntaxHighlighter):
         string_format = QTextCharFormat()
         string_format.setForeground(QColor("#ce9178"))
 
-        self.highlighting_rules = [
-            (QRegExp(r"\b%s\b" % keyword), keyword_format) for keyword in self.keywords
-        ]
+        self.formats = {
+            "keyword": keyword_format,
+            "comment": comment_format,
+            "string": string_format,
+            "triple": string_format,
+        }
+
+        # Alternatives are tried left to right, so triple quotes win over
+        # plain strings, and quotes or # inside a string don't start anything
+        self.tokenizer = QRegularExpression(
+            r"(?<triple>'''|\"\"\")"
+            r"|(?<string>'[^'\\]*(?:\\.[^'\\]*)*'|\"[^\"\\]*(?:\\.[^\"\\]*)*\")"
+            r"|(?<comment>#.*)"
+            r"|(?<keyword>\b(?:%s)\b)" % "|".join(self.keywords)
+        )
+        self.tokenizer.optimize()
+        self.token_names = list(self.formats)
+
+        self.visible_range = (0, 2 * VISIBLE_MARGIN)
+        # Numbers of the blocks whose formats were skipped
+        self.pending_blocks = set()
 
-        self.highlighting_rules.append((QRegExp(r"#.*"), comment_format))
-        self.highlighting_rules.append((QRegExp(r"'.*'"), string_format))
-        self.highlighting_rules.append((QRegExp(r'".*"'), string_format))
+    def set_visible_range(self, first, last):
+        """Highlight the skipped blocks between two block numbers.
+
+        Args:
+            first (int): First visible block number.
+            last (int): Last visible block number.
+        """
+        self.visible_range = (max(first - VISIBLE_MARGIN, 0), last + VISIBLE_MARGIN)
+        document = self.document()
+        if document is None:
+            return
+        start, end = self.visible_range
+        # Walk the visible range, which stays small however long the document is
+        for number in range(start, min(end, document.blockCount() - 1) + 1):
+            if number in self.pending_blocks:
+                self.pending_blocks.discard(number)
+                block = document.findBlockByNumber(number)
+                if block.isValid():
+                    self.rehighlightBlock(block)
+
+    def rehighlight_visible(self):
+        """Re-apply formats to the blocks of the visible range."""
+        document = self.document()
+        if document is None:
+            return
+        start, end = self.visible_range
+        block = document.findBlockByNumber(start)
+        while block.isValid() and block.blockNumber() <= end:
+            self.rehighlightBlock(block)
+            block = block.next()
 
     def highlightBlock(self, text):
-        for pattern, _format in self.highlighting_rules:
-            expression = QRegExp(pattern)
-            index = expression.indexIn(text)
-            while index >= 0:
-                length = expression.matchedLength()
-                self.setFormat(index, length, _format)
-                index = expression.indexIn(text, index + length)
-
-        self.setCurrentBlockState(0)
+        state = self.previousBlockState()
+        number = self.currentBlock().blockNumber()
+        start, end = self.visible_range
+        visible = start <= number <= end
+        if visible:
+            self.pending_blocks.discard(number)
+        else:
+            self.pending_blocks.add(number)
+            # Only the state matters for blocks nobody looks at
+            if "'" not in text and '"' not in text and state not in TRIPLE_QUOTES:
+                self.setCurrentBlockState(NORMAL)
+                return
+
+        position = 0
+        if state in TRIPLE_QUOTES:
+            position = self._close_triple(text, 0, state, visible, continued=True)
+            if position < 0:
+                return
+
+        matches = self.tokenizer.globalMatch(text, position)
+        while matches.hasNext():
+            match = matches.next()
+            token = next(
+                name for name in self.token_names if match.capturedStart(name) != -1
+            )
+            token_start = match.capturedStart(token)
+            if token == "triple":
+                state = (
+                    IN_SINGLE_TRIPLE
+                    if match.captured(token) == "'''"
+                    else IN_DOUBLE_TRIPLE
+                )
+                position = self._close_triple(text, token_start, state, visible)
+                if position < 0:
+                    return
+                # The iterator can't skip ahead, start a new one
+                matches = self.tokenizer.globalMatch(text, position)
+                continue
+            if visible:
+                self.setFormat(
+                    token_start, match.capturedLength(token), self.formats[token]
+                )
+
+        self.setCurrentBlockState(NORMAL)
+
+    def _close_triple(self, text, start, state, visible, continued=False) -> int:
+        """Format a triple quoted string starting at ``start``.
+
+        Args:
+            text (str): Block text.
+            start (int): Position of the opening quotes, 0 if the string was
+                opened in a previous block.
+            state (int): ``IN_SINGLE_TRIPLE`` or ``IN_DOUBLE_TRIPLE``.
+            visible (bool): Whether formats are applied.
+            continued (bool, optional): Whether the string was opened in a
+                previous block, so ``start`` holds no opening quotes.
+
+        Returns:
+            int: Position after the closing quotes, or -1 if the string
+            continues in the next block.
+        """
+        quotes = TRIPLE_QUOTES[state]
+        end = text.find(quotes, start if continued else start + 3)
+        if end < 0:
+            if visible:
+                self.setFormat(start, len(text) - start, self.formats["string"])
+            self.setCurrentBlockState(state)
+            return -1
+        end += 3
+        if visible:
+            self.setFormat(start, end - start, self.formats["string"])
+        return end
@@ -0,0 +1,98 @@
+import sys
+from collections import OrderedDict
+
+
+def estimate_size(value) -> int:
+    """Approximate memory use of a result, nested containers included.
+
+    Walks dicts, lists, tuples and sets iteratively; objects shared between
+    several containers are counted once.
+
+    Args:
+        value: Result to measure.
+
+    Returns:
+        int: Size in bytes.
+    """
+    size = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class ResultCache:
+    """LRU cache of rendered action results, capped by memory use.
+
+    Keys are ``(node session id, action name, node generation, HDA
+    definition modification time)`` tuples, so a result is only reused while
+    the node watcher reports no change and the definition is unedited.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Get a cached result.
+
+        Args:
+            key (tuple): See the class docstring.
+
+        Returns:
+            The cached result.
+            None: If nothing is cached under the key.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, result):
+        """Store a result, evicting the least recently used ones over the cap.
+
+        Results bigger than the whole cap are not stored. Sizes come from
+        ``estimate_size``, measured once when the result is stored.
+        """
+        size = estimate_size(result)
+        if size > self.max_bytes:
+            return
+        self.discard(key)
+        self._entries[key] = (result, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def discard_node(self, session_id):
+        """Drop every result of one node."""
+        for key in [key for key in self._entries if key[0] == session_id]:
+            self.discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,192 @@
+"""Lazily populated tree model for structured inspection results.
+
+Rows are only created when a branch is expanded, in batches handed out
+through ``canFetchMore`` / ``fetchMore``, so the view stays responsive for
+nodes with thousands of parameters or huge user data.
+"""
+from collections.abc import Mapping
+
+from PySide2.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from .utils import _INVALID_JSON, looks_like_json, parse_json_cached
+
+
+# Rows materialized per fetchMore call
+FETCH_BATCH_SIZE = 200
+
+# Scalar lists up to this length are shown inline instead of as a branch
+INLINE_LIST_SIZE = 16
+
+# Longest value text shown in a cell, the tooltip holds the rest
+MAX_DISPLAY_LENGTH = 500
+
+
+def _is_scalar(value) -> bool:
+    return not isinstance(value, (Mapping, list, tuple))
+
+
+class _ResultItem:
+    """One row of the result tree, with its children created on demand."""
+
+    __slots__ = ("key", "value", "parent", "row", "children", "_pending", "_remaining")
+
+    def __init__(self, key, value, parent=None, row=0):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self.children = []
+        # Iterator over (key, value) pairs of children not created yet
+        self._pending = None
+        self._remaining = None
+
+    def is_branch(self) -> bool:
+        """Whether the row can be expanded, decided without parsing JSON."""
+        value = self.value
+        if isinstance(value, Mapping):
+            return bool(value)
+        if isinstance(value, (list, tuple)):
+            return len(value) > INLINE_LIST_SIZE or not all(map(_is_scalar, value))
+        return looks_like_json(value)
+
+    def _start_fetching(self):
+        value = self.value
+        if looks_like_json(value):
+            value = parse_json_cached(value)
+            if value is _INVALID_JSON or not isinstance(value, Mapping):
+                value = {}
+        if isinstance(value, Mapping):
+            self._pending = iter(value.items())
+            self._remaining = len(value)
+        else:
+            self._pending = (
+                (f"[{index}]", item) for index, item in enumerate(value)
+            )
+            self._remaining = len(value)
+
+    def remaining(self) -> int:
+        """Number of children not created yet."""
+        if not self.is_branch():
+            return 0
+        if self._pending is None:
+            self._start_fetching()
+        return self._remaining
+
+    def fetch(self, count) -> int:
+        """Create up to ``count`` more children, returns how many were made."""
+        count = min(count, self.remaining())
+        row = len(self.children)
+        for _ in range(count):
+            key, value = next(self._pending)
+            self.children.append(_ResultItem(key, value, self, row))
+            row += 1
+        self._remaining -= count
+        return count
+
+    def summary(self) -> str:
+        """Text of the value column."""
+        value = self.value
+        if isinstance(value, Mapping):
+            return f"{{{len(value)} keys}}"
+        if isinstance(value, (list, tuple)) and self.is_branch():
+            return f"[{len(value)} items]"
+        if looks_like_json(value):
+            return f"<JSON, {len(value)} characters>"
+        text = str(value)
+        if len(text) > MAX_DISPLAY_LENGTH:
+            return text[:MAX_DISPLAY_LENGTH] + "..."
+        return text
+
+
+class ResultTreeModel(QAbstractItemModel):
+    """Two column (name, value) model over nested dicts, lists and JSON strings.
+
+    Strings holding a JSON object are parsed when their row is first
+    expanded, through the memoized parser of ``pretty_print_dict``.
+    """
+
+    HEADERS = ("Name", "Value")
+
+    def __init__(self, data=None, batch_size=FETCH_BATCH_SIZE, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._root = _ResultItem("", {} if data is None else data)
+
+    def set_result(self, data):
+        """Replace the shown result.
+
+        Args:
+            data (dict or list): Structured result to show.
+        """
+        self.beginResetModel()
+        self._root = _ResultItem("", data)
+        self.endResetModel()
+
+    def result(self):
+        """The structured result currently shown."""
+        return self._root.value
+
+    def _item(self, index) -> _ResultItem:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        item = self._item(parent)
+        if 0 <= row < len(item.children) and 0 <= column < len(self.HEADERS):
+            return self.createIndex(row, column, item.children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._item(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        item = self._item(parent)
+        return bool(item.children) or item.is_branch()
+
+    def canFetchMore(self, parent):
+        return self._item(parent).remaining() > 0
+
+    def fetchMore(self, parent):
+        item = self._item(parent)
+        count = min(self.batch_size, item.remaining())
+        if not count:
+            return
+        first = len(item.children)
+        self.beginInsertRows(parent, first, first + count - 1)
+        item.fetch(count)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return str(item.key) if index.column() == 0 else item.summary()
+        if role == Qt.ToolTipRole and index.column() == 1 and _is_scalar(item.value):
+            text = str(item.value)
+            return text if len(text) > MAX_DISPLAY_LENGTH else None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
@@ -0,0 +1,82 @@
+import hou
+import json
+import sys
+
+from .batch import iter_node_results
+from .utils import node_validator
+
+
+def to_jsonable(value):
+    """Convert collector output into something ``json.dumps`` accepts.
+
+    hou enum values and other hou objects are written with ``str()``
+    (e.g. ``parmCondType.HideWhen``), tuples as lists and dictionary keys
+    as strings.
+
+    Args:
+        value: Collector output.
+
+    Returns:
+        JSON compatible copy of the value.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {
+            key if isinstance(key, str) else str(key): to_jsonable(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_jsonable(item) for item in value]
+    return str(value)
+
+
+def iter_scan_records(
+    hip_path,
+    roots=("/",),
+    node_type_filter=None,
+    max_depth=None,
+    collectors=None,
+):
+    """Load a hip file and yield one JSON compatible record per node.
+
+    Args:
+        hip_path (str): Hip file to load.
+        roots (list, optional): Nodes whose networks are scanned. Defaults to the whole scene.
+        node_type_filter (str, list, Callable, optional): See ``batch.make_type_filter``.
+        max_depth (int, optional): Deepest level to visit below each root.
+        collectors (dict, optional): See ``batch.iter_node_results``.
+
+    Yields:
+        dict: ``{"hip", "path", "type", "results", "errors"}`` per node.
+    """
+    hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+    for root in roots:
+        root = node_validator(root, raise_error=True)
+        for result in iter_node_results(root, node_type_filter, max_depth, collectors):
+            yield {
+                "hip": hip_path,
+                "path": result.path,
+                "type": result.type_name,
+                "results": to_jsonable(result.results),
+                "errors": result.errors,
+            }
+
+
+def scan_hip(hip_path, out=None, **kwargs) -> int:
+    """Scan a hip file and write one JSON record per line (NDJSON).
+
+    Args:
+        hip_path (str): Hip file to load.
+        out (file, optional): Text stream to write to. Defaults to stdout.
+        **kwargs: Passed to ``iter_scan_records``.
+
+    Returns:
+        int: Number of records written.
+    """
+    out = out or sys.stdout
+    count = 0
+    for record in iter_scan_records(hip_path, **kwargs):
+        out.write(json.dumps(record) + "\n")
+        count += 1
+    return count
@@ -0,0 +1,276 @@
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from logging import getLogger
+from typing import NamedTuple, Optional
+
+logger = getLogger(__name__)
+
+
+# A worker writes this line after the records of each file
+DONE_PREFIX = '{"__done__"'
+
+# Protocol-compatible worker that needs no Houdini, for testing the driver
+STUB_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_worker.py")
+
+# Records of one file are buffered in memory up to this size, then on disk
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+def worker_command(hython="hython", scan_args=()):
+    """Command starting a hython worker that scans hip paths read from stdin.
+
+    Args:
+        hython (str, optional): hython executable.
+        scan_args (list, optional): Extra ``scan`` options, e.g. ``["--type", "Sop/*"]``.
+
+    Returns:
+        list: Command line.
+    """
+    return [hython, "-m", "node_inspector", "worker", *scan_args]
+
+
+class FileResult(NamedTuple):
+    """Outcome of scanning one hip file.
+
+    Attributes:
+        hip (str): Hip file path.
+        ok (bool): Whether the scan succeeded.
+        records (int): Number of records written.
+        seconds (float): Time spent on the last attempt.
+        attempts (int): Number of attempts made.
+        error (str or None): Reason of the last failure.
+    """
+
+    hip: str
+    ok: bool
+    records: int
+    seconds: float
+    attempts: int
+    error: Optional[str] = None
+
+
+class ScanSummary(NamedTuple):
+    """Totals of a pool scan."""
+
+    files: int
+    succeeded: int
+    failed: int
+    records: int
+    seconds: float
+    results: list
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"Scanned {self.files} files in {self.seconds:.1f}s "
+            f"({self.files_per_second:.2f} files/s, {self.records} records)",
+            f"  succeeded: {self.succeeded}",
+            f"  failed:    {self.failed}",
+        ]
+        for result in self.results:
+            if not result.ok:
+                lines.append(f"    {result.hip}: {result.error}")
+        return "\n".join(lines)
+
+
+class _WorkerTimeout(Exception):
+    pass
+
+
+class _WorkerProcess:
+    """One long-lived worker process and a thread reading its stdout."""
+
+    def __init__(self, command):
+        self.files_done = 0
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self.lines = queue.Queue()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def scan(self, hip, out, timeout):
+        """Send one hip path and copy its records into ``out``.
+
+        Returns:
+            tuple: ``(records, error)``, error being None on success.
+
+        Raises:
+            _WorkerTimeout: If the file took longer than ``timeout`` seconds.
+            EOFError: If the worker exited.
+        """
+        self.process.stdin.write(hip + "\n")
+        self.process.stdin.flush()
+
+        deadline = time.monotonic() + timeout if timeout else None
+        records = 0
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise _WorkerTimeout(f"timed out after {timeout}s")
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                raise _WorkerTimeout(f"timed out after {timeout}s")
+            if line is None:
+                raise EOFError(f"worker exited with code {self.process.wait()}")
+            if line.startswith(DONE_PREFIX):
+                done = json.loads(line)
+                self.files_done += 1
+                return records, done.get("error")
+            if line.startswith("{"):
+                out.write(line)
+                records += 1
+            else:
+                # Houdini may print warnings to stdout, keep them out of the report
+                logger.debug("worker: %s", line.rstrip())
+
+    def close(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def scan_pool(
+    hip_files,
+    out,
+    command=None,
+    jobs=None,
+    timeout=None,
+    retries=1,
+    files_per_worker=None,
+    progress=None,
+) -> ScanSummary:
+    """Scan many hip files with a bounded pool of reusable worker processes.
+
+    Every worker scans files one after another, so the cost of starting
+    hython is paid once per worker rather than once per file. Records of a
+    file are buffered until the file succeeds and then appended to ``out``
+    in one piece; a failed or timed out attempt leaves nothing behind.
+
+    Args:
+        hip_files (list): Hip files to scan.
+        out (file): Text stream the merged NDJSON records are written to.
+        command (list, optional): Worker command. Defaults to ``worker_command()``.
+        jobs (int, optional): Number of workers. Defaults to the CPU count.
+        timeout (float, optional): Seconds allowed per file. The worker is
+            killed and replaced when it is exceeded.
+        retries (int, optional): Extra attempts per failed file.
+        files_per_worker (int, optional): Restart workers after this many files.
+        progress (Callable, optional): Called with ``(done, total, FileResult)``.
+
+    Returns:
+        ScanSummary: Totals and per-file results.
+    """
+    command = command or worker_command()
+    hip_files = list(hip_files)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(hip_files) or 1))
+
+    pending = queue.Queue()
+    for hip in hip_files:
+        pending.put(hip)
+
+    results = []
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def finish(result):
+        with lock:
+            results.append(result)
+            if progress:
+                progress(len(results), len(hip_files), result)
+
+    def run_slot():
+        worker = None
+        try:
+            while True:
+                try:
+                    hip = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                for attempt in range(1, retries + 2):
+                    if worker is None:
+                        worker = _WorkerProcess(command)
+                    file_start = time.monotonic()
+                    with tempfile.SpooledTemporaryFile(SPOOL_SIZE, mode="w+") as buffer:
+                        try:
+                            records, error = worker.scan(hip, buffer, timeout)
+                        except (_WorkerTimeout, EOFError, OSError) as exc:
+                            worker.close(kill=True)
+                            worker = None
+                            records, error = 0, str(exc)
+                        seconds = time.monotonic() - file_start
+
+                        if error is None:
+                            buffer.seek(0)
+                            with lock:
+                                for line in buffer:
+                                    out.write(line)
+                            finish(FileResult(hip, True, records, seconds, attempt))
+                            break
+                    if attempt > retries:
+                        finish(FileResult(hip, False, 0, seconds, attempt, error))
+
+                if (
+                    worker is not None
+                    and files_per_worker
+                    and worker.files_done >= files_per_worker
+                ):
+                    worker.close()
+                    worker = None
+        finally:
+            if worker is not None:
+                worker.close()
+
+    threads = [threading.Thread(target=run_slot, daemon=True) for _ in range(jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    succeeded = sum(1 for result in results if result.ok)
+    return ScanSummary(
+        len(results),
+        succeeded,
+        len(results) - succeeded,
+        sum(result.records for result in results),
+        time.monotonic() - start,
+        results,
+    )
+
+
+def print_progress(done, total, result):
+    """Default progress callback, one line per file on stderr."""
+    status = "ok" if result.ok else f"FAILED ({result.error})"
+    sys.stderr.write(
+        f"[{done}/{total}] {result.hip}: {status}, "
+        f"{result.records} records, {result.seconds:.1f}s\n"
+    )
@@ -0,0 +1,40 @@
+"""Step generators: long work split into small pieces.
+
+Step generators yield ``(done, total)`` progress tuples (or None) between
+pieces and return their result. The UI interleaves the pieces with Qt
+events (see ``inspection_scheduler``), everything else runs them in one go
+with ``run_steps``.
+"""
+from functools import wraps
+
+
+def run_steps(steps):
+    """Run a step generator to completion.
+
+    Args:
+        steps (Generator): Step generator to run.
+
+    Returns:
+        The value returned by the generator.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def single_step(func, *args, **kwargs):
+    """Step generator calling ``func`` in one piece and returning its result."""
+    return func(*args, **kwargs)
+    yield  # Makes this function a generator
+
+
+def synchronous(steps_function):
+    """Make a blocking function out of a step generator function."""
+
+    @wraps(steps_function)
+    def run(*args, **kwargs):
+        return run_steps(steps_function(*args, **kwargs))
+
+    return run
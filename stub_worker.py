@@ -0,0 +1,41 @@
+"""Stand-in for ``hython -m node_inspector worker`` that needs no Houdini.
+
+Speaks the same protocol: reads hip paths from stdin and, for each one,
+writes one JSON record per line of the file followed by a done line.
+``STUB_WORKER_DELAY`` (seconds) slows every file down, and files whose
+name contains ``fail`` report an error, which helps testing timeouts and
+retries of ``scan_pool``.
+
+Run it by path, it does not import the package::
+
+    python stub_worker.py
+"""
+import json
+import os
+import sys
+import time
+
+
+def main():
+    delay = float(os.environ.get("STUB_WORKER_DELAY", "0"))
+    for line in sys.stdin:
+        hip = line.strip()
+        if not hip:
+            continue
+        time.sleep(delay)
+        error = None
+        try:
+            if "fail" in os.path.basename(hip):
+                raise RuntimeError("stub failure")
+            with open(hip, errors="replace") as hip_file:
+                for number, text in enumerate(hip_file, 1):
+                    record = {"hip": hip, "path": f"/line{number}", "text": text.rstrip()}
+                    sys.stdout.write(json.dumps(record) + "\n")
+        except (OSError, RuntimeError) as exc:
+            error = str(exc)
+        sys.stdout.write(json.dumps({"__done__": hip, "error": error}) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import hou
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+from .hou_proxy import unwrap
+from .instrumentation import instrumentation
+from .multiparm import MultiparmResolver
+from .steps import run_steps
+
+
+multiparm_types = [
+    hou.folderType.MultiparmBlock,
+    hou.folderType.ScrollingMultiparmBlock,
+    hou.folderType.TabbedMultiparmBlock,
+]
+
+_NO_DEFAULT = object()
+
+# Templates walked between two steps of ``collect_parm_records_steps``
+TEMPLATE_CHUNK_SIZE = 64
+
+
+class ParmRecord(NamedTuple):
+    """Per-template facts shared by every instance of a node type.
+
+    Attributes:
+        name (str): Parameter template name.
+        template (hou.ParmTemplate): The template itself.
+        hidden (bool): Whether the template or any enclosing folder is hidden.
+        folder_path (tuple): Names of the enclosing folders, outermost first.
+        default: Template default value, or ``_NO_DEFAULT`` if it has none.
+        callback (tuple or None): ``(script, language)`` if a callback is set.
+        conditionals (dict): Non-empty conditionals keyed by ``hou.parmCondType``.
+    """
+
+    name: str
+    template: "hou.ParmTemplate"
+    hidden: bool
+    folder_path: tuple
+    default: object
+    callback: Optional[tuple]
+    conditionals: Mapping
+
+
+class TemplateAnalysis:
+    """Result of analysing one parm template group.
+
+    Multiparm naming schemes and the instance-name resolver are only built
+    the first time they are asked for.
+
+    Attributes:
+        key (tuple or None): Cache key the analysis was stored under.
+        records (tuple): ``ParmRecord`` entries in traversal order.
+        folders (dict): Folder templates keyed by their folder path.
+    """
+
+    __slots__ = ("key", "records", "folders", "_multiparm_schemes", "_resolver")
+
+    def __init__(self, key, records, folders):
+        self.key = key
+        self.records = records
+        self.folders = folders
+        self._multiparm_schemes = None
+        self._resolver = None
+
+    @property
+    def multiparm_schemes(self) -> Mapping:
+        """dict: Template names (without ``#``) keyed by multiparm block name."""
+        if self._multiparm_schemes is None:
+            schemes = {}
+            for folder_path, folder in self.folders.items():
+                if folder.folderType() not in multiparm_types:
+                    continue
+                depth = len(folder_path)
+                schemes[folder.name()] = tuple(
+                    dict.fromkeys(
+                        record.name.replace("#", "")
+                        for record in self.records
+                        if record.folder_path[:depth] == folder_path
+                    )
+                )
+            self._multiparm_schemes = MappingProxyType(schemes)
+        return self._multiparm_schemes
+
+    @property
+    def multiparm_resolver(self) -> MultiparmResolver:
+        """MultiparmResolver: Maps instance parm names to their block and template."""
+        if self._resolver is None:
+            self._resolver = MultiparmResolver(
+                self.records, self.folders, multiparm_types
+            )
+        return self._resolver
+
+
+def collect_parm_records(group_or_folder, folders=None) -> tuple:
+    """Walk a group or folder once and describe every non-folder template.
+
+    Args:
+        group_or_folder (hou.ParmTemplateGroup or hou.FolderParmTemplate): Root to walk.
+        folders (dict, optional): If given, filled with folder templates keyed by folder path.
+
+    Returns:
+        tuple: ``ParmRecord`` entries in the same order ``ParmInfo.parm_traverse`` visits them.
+    """
+    return run_steps(collect_parm_records_steps(group_or_folder, folders))
+
+
+def collect_parm_records_steps(group_or_folder, folders=None):
+    """Step generator version of ``collect_parm_records``.
+
+    Yields None after every ``TEMPLATE_CHUNK_SIZE`` templates, the total
+    being unknown until the walk is done. See ``steps.run_steps``.
+    """
+    records = []
+    walked = 0
+    # Stack of (template iterator, folder path, hidden) so nesting costs no recursion
+    stack = [(iter(group_or_folder.parmTemplates()), (), False)]
+    while stack:
+        templates, folder_path, folder_hidden = stack[-1]
+        parm_template = next(templates, None)
+        if parm_template is None:
+            stack.pop()
+            continue
+        walked += 1
+        if walked % TEMPLATE_CHUNK_SIZE == 0:
+            yield None
+
+        parm_type = parm_template.type()
+        if parm_type == hou.parmTemplateType.Separator:
+            continue
+        hidden = folder_hidden or parm_template.isHidden()
+        if parm_type == hou.parmTemplateType.Folder:
+            sub_folder_path = folder_path + (parm_template.name(),)
+            if folders is not None:
+                folders[sub_folder_path] = parm_template
+            stack.append((iter(parm_template.parmTemplates()), sub_folder_path, hidden))
+            continue
+
+        try:
+            default = parm_template.defaultValue()
+        except AttributeError:
+            default = _NO_DEFAULT
+
+        callback_script = parm_template.scriptCallback()
+        callback = (
+            (callback_script, parm_template.scriptCallbackLanguage())
+            if callback_script
+            else None
+        )
+
+        try:
+            conditionals = parm_template.conditionals()
+        except AttributeError:
+            conditionals = {}
+        conditionals = MappingProxyType(
+            {key: value for key, value in conditionals.items() if value.strip()}
+        )
+
+        records.append(
+            ParmRecord(
+                parm_template.name(),
+                parm_template,
+                hidden,
+                folder_path,
+                default,
+                callback,
+                conditionals,
+            )
+        )
+    return tuple(records)
+
+
+def analyze_parm_templates(parm_template_group, key=None) -> TemplateAnalysis:
+    """Analyse a parm template group in a single traversal.
+
+    Args:
+        parm_template_group (hou.ParmTemplateGroup): Group to analyse.
+        key (tuple, optional): Cache key to record on the result.
+
+    Returns:
+        TemplateAnalysis: Everything about the interface that does not depend on a node instance.
+    """
+    return run_steps(analyze_parm_templates_steps(parm_template_group, key))
+
+
+def analyze_parm_templates_steps(parm_template_group, key=None):
+    """Step generator version of ``analyze_parm_templates``, see ``steps.run_steps``."""
+    folders = {}
+    records = yield from collect_parm_records_steps(parm_template_group, folders)
+    return TemplateAnalysis(key, records, MappingProxyType(folders))
+
+
+def template_cache_key(node) -> Optional[tuple]:
+    """Build the key under which a node's interface can be shared.
+
+    Nodes with spare parameters have a per-instance interface and get no key.
+
+    Args:
+        node (hou.Node): Node to build the key for.
+
+    Returns:
+        tuple: ``(type name, library path, version, modification time)`` for HDAs,
+        ``(type name, Houdini version)`` for built-in types.
+        None: If the interface can't be shared.
+    """
+    if node.spareParms():
+        return None
+
+    node_type = node.type()
+    definition = node_type.definition()
+    if definition is None:
+        return (node_type.nameWithCategory(), hou.applicationVersionString())
+    return (
+        node_type.nameWithCategory(),
+        definition.libraryFilePath(),
+        definition.version(),
+        definition.modificationTime(),
+    )
+
+
+def definition_modification_time(node) -> Optional[int]:
+    """Modification time of a node's HDA definition, None for built-in types.
+
+    Editing a definition fires no event on its instances, so results derived
+    from the interface compare this instead.
+    """
+    definition = node.type().definition()
+    return None if definition is None else definition.modificationTime()
+
+
+class TemplateCache:
+    """LRU cache of ``TemplateAnalysis`` results shared between node instances."""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, node, parm_template_group=None) -> TemplateAnalysis:
+        """Get the analysis for a node's interface, analysing it on a miss.
+
+        Args:
+            node (hou.Node): Node whose interface is requested.
+            parm_template_group (hou.ParmTemplateGroup, optional): Already fetched group of the node.
+
+        Returns:
+            TemplateAnalysis: Shared analysis of the node's parm templates.
+        """
+        return run_steps(self.get_steps(node, parm_template_group))
+
+    def get_steps(self, node, parm_template_group=None):
+        """Step generator version of ``get``, the analysis of a miss is time sliced."""
+        key = template_cache_key(node)
+        if key is not None and key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        with instrumentation.span("analyze_parm_templates", "collect"):
+            if parm_template_group is None:
+                parm_template_group = node.parmTemplateGroup()
+            # The analysis outlives any hou transaction, keep the real templates
+            analysis = yield from analyze_parm_templates_steps(
+                unwrap(parm_template_group), key
+            )
+        if key is not None:
+            self._entries[key] = analysis
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return analysis
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry if no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by every ParmInfo in the session
+template_cache = TemplateCache()
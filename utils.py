@@ -1,40 +1,160 @@
 import hou
+import hashlib
 import json
+from collections import OrderedDict
 from logging import getLogger
 from abc import ABCMeta, abstractmethod
-from typing import Union, Callable
+from types import MappingProxyType
+from typing import Union, Callable, Mapping, NamedTuple, Optional
+
+from .instrumentation import instrumentation
+from .multiparm import MultiparmMatch
+from .node_events import node_watcher
+from .steps import run_steps, single_step, synchronous
+from .template_cache import (
+    _NO_DEFAULT,
+    ParmRecord,
+    TemplateAnalysis,
+    collect_parm_records_steps,
+    multiparm_types,
+    template_cache,
+)
+from .writers import open_writer
 
 logger = getLogger(__name__)
-logger.setLevel(10)
 
 
-def pretty_print_dict(d, indent=0):
+# Parm records handled between two progress steps of a snapshot
+SNAPSHOT_CHUNK_SIZE = 64
+
+
+# Parsed JSON strings keyed by content hash, most recently used last
+_json_cache = OrderedDict()
+_JSON_CACHE_SIZE = 32
+_INVALID_JSON = object()
+
+
+def parse_json_cached(text):
+    """Parse a JSON string, memoized by content hash.
+
+    Args:
+        text (str): JSON text.
+
+    Returns:
+        The parsed value, or ``_INVALID_JSON`` if the text is not valid JSON.
+    """
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    if key in _json_cache:
+        _json_cache.move_to_end(key)
+        return _json_cache[key]
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        value = _INVALID_JSON
+    _json_cache[key] = value
+    while len(_json_cache) > _JSON_CACHE_SIZE:
+        _json_cache.popitem(last=False)
+    return value
+
+
+def looks_like_json(value) -> bool:
+    """Whether a value is a string that holds a JSON object."""
+    return isinstance(value, str) and value.startswith("{") and value.endswith("}")
+
+
+@instrumentation.traced("format")
+def pretty_print_dict(
+    d, indent=0, max_depth=None, max_items=None, max_bytes=None, writer=None
+):
     """
-    Recursively pretty-prints nested dictionaries with indentation.
+    Pretty-prints nested dictionaries with indentation.
+
+    Nested dictionaries, and strings holding a JSON object, are expanded
+    one indentation level deeper. The walk is iterative and every limit
+    leaves a marker line where output was cut. JSON strings are only parsed
+    when their branch is expanded, and parse results are memoized.
 
     Args:
         d (dict): The dictionary to pretty-print.
         indent (int): The current indentation level.
+        max_depth (int, optional): Deepest nesting level to expand, the keys of ``d`` being level 1.
+        max_items (int, optional): Most entries shown per dictionary or list.
+        max_bytes (int, optional): Most characters written in total.
+        writer (TextWriter, optional): Where to write the output. If not given,
+            the output is returned as a string.
 
     Returns:
         str: The pretty-printed string.
+        None: If a writer was given.
     """
-    lines = []
-    for key, value in d.items():
-        line = "  " * indent + str(key) + ":"
+    writer, owned = open_writer(writer)
+    written = 0
+
+    def emit(line):
+        """Write a line, returns False once the byte limit is reached."""
+        nonlocal written
+        if written:
+            line = "\n" + line
+        if max_bytes is not None and written + len(line) > max_bytes:
+            writer.write(line[: max(max_bytes - written, 0)])
+            writer.write(f"\n... (output truncated at {max_bytes} characters)")
+            written = max_bytes + 1
+            return False
+        writer.write(line)
+        written += len(line)
+        return True
+
+    # Stack of [items iterator, nesting level, entry count, entries shown]
+    stack = [[iter(d.items()), 1, len(d), 0]]
+    while stack:
+        frame = stack[-1]
+        item = next(frame[0], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        level = frame[1]
+        pad = "  " * (indent + level - 1)
+        frame[3] += 1
+        if max_items is not None and frame[3] > max_items:
+            stack.pop()
+            if not emit(f"{pad}... ({frame[2] - max_items} more items)"):
+                break
+            continue
+
+        key, value = item
+        expand = max_depth is None or level < max_depth
         if isinstance(value, dict):
-            lines.append(line)
-            lines.append(pretty_print_dict(value, indent + 1))
-        elif isinstance(value, str) and value.startswith("{") and value.endswith("}"):
-            lines.append(line)
-            try:
-                nested_dict = json.loads(value)
-                lines.append(pretty_print_dict(nested_dict, indent + 1))
-            except json.JSONDecodeError:
-                lines.append("  " * (indent + 1) + value)
+            if expand:
+                line = f"{pad}{key}:"
+                stack.append([iter(value.items()), level + 1, len(value), 0])
+            else:
+                line = f"{pad}{key}: {{...}} ({len(value)} keys)"
+        elif looks_like_json(value):
+            if not expand:
+                line = f"{pad}{key}: <JSON, {len(value)} characters>"
+            else:
+                line = f"{pad}{key}:"
+                parsed = parse_json_cached(value)
+                if isinstance(parsed, dict):
+                    stack.append([iter(parsed.items()), level + 1, len(parsed), 0])
+                else:
+                    raw = value if parsed is _INVALID_JSON else parsed
+                    line += f"\n{pad}  {raw}"
+        elif (
+            isinstance(value, (list, tuple))
+            and max_items is not None
+            and len(value) > max_items
+        ):
+            shown = ", ".join(repr(item) for item in value[:max_items])
+            line = f"{pad}{key}: [{shown}, ... ({len(value) - max_items} more)]"
         else:
-            lines.append(f"{line} {value}")
-    return "\n".join(lines)
+            line = f"{pad}{key}: {value}"
+
+        if not emit(line):
+            break
+
+    return writer.getvalue() if owned else None
 
 
 def node_validator(value, raise_error=False) -> hou.Node or None:
@@ -55,13 +175,12 @@ def node_validator(value, raise_error=False) -> hou.Node or None:
         TypeError: If node is not valid"""
 
     if isinstance(value, hou.Node):
-        logger.info(f"Node {value} is a hou.Node")
         return value
     elif isinstance(value, str):
-        logger.info(f"Node {value} is a string")
+        logger.debug("Node %s is a string", value)
         return hou.node(value)
     else:
-        logger.warning(f"Node {value} is not valid")
+        logger.warning("Node %s is not valid", value)
         if raise_error:
             raise TypeError(f"Node {value} is not valid")
         return None
@@ -77,13 +196,6 @@ def get_ramp_values(
     return basis, keys, values
 
 
-multiparm_types = [
-    hou.folderType.MultiparmBlock,
-    hou.folderType.ScrollingMultiparmBlock,
-    hou.folderType.TabbedMultiparmBlock,
-]
-
-
 class ParmFilter(metaclass=ABCMeta):
     @abstractmethod
     def filter(self, parm_template):
@@ -113,8 +225,28 @@ class FloatParmFilter(ParmFilter):
         return parm_template.type() == hou.parmTemplateType.Float
 
 
+class ParmSnapshot(NamedTuple):
+    """Immutable result of inspecting one node's parameters.
+
+    Attributes:
+        node_path (str): Path of the inspected node.
+        records (tuple): ``ParmRecord`` entries in traversal order.
+        expressions (dict): Parm expressions keyed by parm name.
+    """
+
+    node_path: str
+    records: tuple
+    expressions: Mapping
+
+
 class ParmInfo:
-    """Get information about a Houdini node's parameters."""
+    """Get information about a Houdini node's parameters.
+
+    All ``get_parm_*`` methods are views over ``snapshot()``, so asking several
+    questions about the same node costs a single template traversal. The
+    template part of that traversal is shared through ``template_cache`` by
+    every instance of the same node type / HDA definition.
+    """
 
     def __init__(self, node, parm_filter=None):
         # Validate node
@@ -123,11 +255,78 @@ class ParmInfo:
         # Set the parm filter
         self.parm_filter = parm_filter if parm_filter else AllParmFilter()
 
-        # Get node parm template group
-        self.parm_template_group = self.node.parmTemplateGroup()
+        # Filled on first use
+        self._parm_template_group = None
+        self._template_analysis = None
+        self._snapshot = None
+
+        # Watcher generations (templates, values) the cached data was built at
+        self._generations = None
+
+    def _drop_stale_data(self):
+        """Forget cached data the node watcher reports as changed.
+
+        Unwatched nodes keep their cached data for the lifetime of this object.
+        """
+        generations = (
+            node_watcher.generation(self.node, "templates"),
+            node_watcher.generation(self.node, "values"),
+        )
+        if generations == self._generations:
+            return
+        if self._generations is not None:
+            if generations[0] != self._generations[0]:
+                self._parm_template_group = None
+                self._template_analysis = None
+            self._snapshot = None
+        self._generations = generations
+
+    @property
+    def parm_template_group(self):
+        """hou.ParmTemplateGroup: The node's parm template group, fetched on first use."""
+        self._drop_stale_data()
+        if self._parm_template_group is None:
+            with instrumentation.span("parmTemplateGroup", "collect"):
+                self._parm_template_group = self.node.parmTemplateGroup()
+        return self._parm_template_group
+
+    @property
+    def template_analysis(self) -> TemplateAnalysis:
+        """TemplateAnalysis: Shared analysis of the node's interface.
+
+        Nodes with spare parms can't share their analysis through
+        ``template_cache``, theirs is kept on this instance instead.
+        """
+        return run_steps(self.template_analysis_steps())
+
+    def template_analysis_steps(self):
+        """Step generator version of ``template_analysis``, see ``run_steps``."""
+        self._drop_stale_data()
+        if self._template_analysis is not None:
+            return self._template_analysis
+        analysis = yield from template_cache.get_steps(
+            self.node, self._parm_template_group
+        )
+        if analysis.key is None:
+            self._template_analysis = analysis
+        return analysis
 
-        # Get parameter naming scheme
-        self.parm_naming_scheme = self.get_multiparm_naming_scheme()
+    @property
+    def parm_naming_scheme(self) -> dict:
+        """dict: Multiparm naming scheme, computed on first use."""
+        return self.get_multiparm_naming_scheme()
+
+    def resolve_multiparm(self, parm_name) -> Optional[MultiparmMatch]:
+        """Attribute a multiparm instance parm such as ``pt_pos12`` to its block.
+
+        Args:
+            parm_name (str): Instance parm or parm tuple name.
+
+        Returns:
+            MultiparmMatch: Block name, instance index and template.
+            None: If the name is not a multiparm instance.
+        """
+        return self.template_analysis.multiparm_resolver.resolve(parm_name)
 
     def parm_traverse(
         self, callback: Callable, group_or_folder=None, include_hidden=True
@@ -143,9 +342,7 @@ class ParmInfo:
             None
         """
         if group_or_folder is None:
-            group_or_folder = (
-                self.parm_template_group
-            )  # You'll have to pass `self` in some way or define this function as a method.
+            group_or_folder = self.parm_template_group
 
         for parm_template in group_or_folder.parmTemplates():
             if parm_template.type() == hou.parmTemplateType.Separator:
@@ -157,101 +354,150 @@ class ParmInfo:
             else:
                 callback(parm_template)
 
-    def get_parm_names_cb(self, parm_template):
-        """Callback function to get parm names"""
-        if self.parm_filter.filter(parm_template):
-            parm_names.add(parm_template.name())
+    def snapshot(self, group_or_folder=None) -> ParmSnapshot:
+        """Collect every per-parm fact in one traversal.
 
-    def get_parm_names(self, group_or_folder=None, include_hidden=True):
-        """Wrapper for the parm_traverse, focused on getting parm names."""
-        global parm_names
-        parm_names = set()
-        self.parm_traverse(self.get_parm_names_cb, group_or_folder, include_hidden)
-        return list(parm_names)
-
-    def get_parm_callbacks_cb(self, parm_template):
-        """Callback function to get parm callbacks"""
-        if self.parm_filter.filter(parm_template):
-            parm_name = parm_template.name()
-            callback_script = parm_template.scriptCallback()
-            callback_language = parm_template.scriptCallbackLanguage()
-            if callback_script:
-                parm_callbacks[parm_name] = (callback_script, callback_language)
+        The snapshot of the whole node is computed once and reused by all
+        ``get_parm_*`` calls. Template facts come from ``template_cache``;
+        only expressions are read from the node itself. For nodes tracked by
+        ``node_watcher`` the snapshot is rebuilt once the node changes.
+        Snapshots of a specific folder are not cached.
 
-    def get_parm_callbacks(self, group_or_folder=None, include_hidden=True):
-        """Wrapper for the parm_traverse, focused on getting parm callbacks."""
-        global parm_callbacks
-        parm_callbacks = {}
-        self.parm_traverse(self.get_parm_callbacks_cb, group_or_folder, include_hidden)
-        return parm_callbacks
-
-    def get_parm_expressions_cb(self, parm_template):
-        """Callback function to get parm expressions"""
-        if self.parm_filter.filter(parm_template):
-            parm_name = parm_template.name()
-            if self.node.parm(parm_name) is None:
-                return
+        Args:
+            group_or_folder (hou.ParmTemplateGroup or hou.FolderParmTemplate, optional):
+                Limit the snapshot to this group or folder.
 
+        Returns:
+            ParmSnapshot: Immutable description of the node's parameters.
+        """
+        return run_steps(self.snapshot_steps(group_or_folder))
+
+    def snapshot_steps(self, group_or_folder=None):
+        """Step generator version of ``snapshot()``.
+
+        The template analysis of a ``template_cache`` miss is time sliced
+        too. Yields ``(done, total)`` after the template analysis and after
+        every ``SNAPSHOT_CHUNK_SIZE`` parm records, see ``run_steps``.
+
+        Args:
+            group_or_folder (hou.ParmTemplateGroup or hou.FolderParmTemplate, optional):
+                Limit the snapshot to this group or folder.
+
+        Returns:
+            ParmSnapshot: Immutable description of the node's parameters.
+        """
+        self._drop_stale_data()
+        if group_or_folder is None and self._snapshot is not None:
+            return self._snapshot
+
+        if group_or_folder is None:
+            records = (yield from self.template_analysis_steps()).records
+        else:
+            records = yield from collect_parm_records_steps(group_or_folder)
+        yield 0, len(records)
+
+        expressions = {}
+        for done, record in enumerate(records, 1):
+            if done % SNAPSHOT_CHUNK_SIZE == 0:
+                yield done, len(records)
+            parm = self.node.parm(record.name)
+            if parm is None:
+                continue
             try:
-                parm_expression = self.node.parm(parm_name).expression()
+                parm_expression = parm.expression()
             except hou.OperationFailed:
-                return
+                continue
             if parm_expression:
-                parm_expressions[parm_name] = parm_expression
+                expressions[record.name] = parm_expression
 
-    def get_parm_expressions(self, group_or_folder=None, include_hidden=True):
-        """Wrapper for the parm_traverse, focused on getting parm expressions."""
-        global parm_expressions
-        parm_expressions = {}
-        self.parm_traverse(
-            self.get_parm_expressions_cb, group_or_folder, include_hidden
+        snapshot = ParmSnapshot(
+            self.node.path(), records, MappingProxyType(expressions)
         )
-        return parm_expressions
+        if group_or_folder is None:
+            self._snapshot = snapshot
+        return snapshot
 
-    def get_parm_default_values_cb(self, parm_template):
-        """Callback function to get parm default values"""
-        if self.parm_filter.filter(parm_template):
-            parm_name = parm_template.name()
-            try:
-                parm_default_value = parm_template.defaultValue()
-            except AttributeError:
-                return
+    def iter_records(self, group_or_folder=None, include_hidden=True):
+        """Yield snapshot records accepted by the parm filter.
 
-            parm_default_values[parm_name] = parm_default_value
+        Args:
+            group_or_folder (hou.ParmTemplateGroup or hou.FolderParmTemplate, optional):
+                Limit the records to this group or folder.
+            include_hidden (bool, optional): Whether to include hidden parameters.
 
-    def get_parm_default_values(self, group_or_folder=None, include_hidden=True):
-        """Wrapper for the parm_traverse, focused on getting parm default values."""
-        global parm_default_values
-        parm_default_values = {}
-        self.parm_traverse(
-            self.get_parm_default_values_cb, group_or_folder, include_hidden
+        Yields:
+            ParmRecord: Matching records in traversal order.
+        """
+        for record in self.snapshot(group_or_folder).records:
+            if not include_hidden and record.hidden:
+                continue
+            if self.parm_filter.filter(record.template):
+                yield record
+
+    def get_parm_names(self, group_or_folder=None, include_hidden=True):
+        """Get the names of all parameters."""
+        return list(
+            dict.fromkeys(
+                record.name
+                for record in self.iter_records(group_or_folder, include_hidden)
+            )
         )
-        return parm_default_values
 
-    def get_parm_conditionals_cb(self, parm_template):
-        """Callback function to get parm conditionals"""
-        if self.parm_filter.filter(parm_template):
-            parm_name = parm_template.name()
-            try:
-                parm_conditional = parm_template.conditionals()
-            except AttributeError:
-                return
+    def get_parm_callbacks(self, group_or_folder=None, include_hidden=True):
+        """Get parm callbacks as ``{name: (script, language)}``."""
+        return {
+            record.name: record.callback
+            for record in self.iter_records(group_or_folder, include_hidden)
+            if record.callback
+        }
 
-            for key, value in parm_conditional.items():
-                if value.strip() == "":
-                    del parm_conditional[key]
+    def get_parm_expressions(self, group_or_folder=None, include_hidden=True):
+        """Get parm expressions as ``{name: expression}``."""
+        expressions = self.snapshot(group_or_folder).expressions
+        return {
+            record.name: expressions[record.name]
+            for record in self.iter_records(group_or_folder, include_hidden)
+            if record.name in expressions
+        }
 
-            if parm_conditional:
-                parm_conditionals[parm_name] = parm_conditional
+    def get_parm_default_values(self, group_or_folder=None, include_hidden=True):
+        """Get parm default values as ``{name: default}``."""
+        return {
+            record.name: record.default
+            for record in self.iter_records(group_or_folder, include_hidden)
+            if record.default is not _NO_DEFAULT
+        }
 
     def get_parm_conditionals(self, group_or_folder=None, include_hidden=True):
-        """Wrapper for the parm_traverse, focused on getting parm conditionals."""
-        global parm_conditionals
-        parm_conditionals = {}
-        self.parm_traverse(
-            self.get_parm_conditionals_cb, group_or_folder, include_hidden
-        )
-        return parm_conditionals
+        """Get non-empty parm conditionals as ``{name: {hou.parmCondType: str}}``."""
+        return {
+            record.name: dict(record.conditionals)
+            for record in self.iter_records(group_or_folder, include_hidden)
+            if record.conditionals
+        }
+
+    def group_by_folder(self, values, group_or_folder=None, include_hidden=True):
+        """Nest a ``{name: value}`` result under the folders of its parms.
+
+        Args:
+            values (dict): Result of one of the ``get_parm_*`` methods.
+            group_or_folder (hou.ParmTemplateGroup or hou.FolderParmTemplate, optional):
+                The group or folder ``values`` was collected from.
+            include_hidden (bool, optional): Whether to include hidden parameters.
+
+        Returns:
+            dict: ``{folder name: {...}}`` dicts in interface order, with the
+            ``values`` entries at their folder's level.
+        """
+        grouped = {}
+        for record in self.iter_records(group_or_folder, include_hidden):
+            if record.name not in values:
+                continue
+            level = grouped
+            for folder_name in record.folder_path:
+                level = level.setdefault(folder_name, {})
+            level[record.name] = values[record.name]
+        return grouped
 
     def get_multiparm_naming_scheme(self) -> dict:
         """
@@ -260,24 +506,12 @@ class ParmInfo:
         The value is a list of strings, each representing the name of
         a parameter in the multiparm template.
 
-        Args:
-            node (hou.Node): The node that contains the multiparm template.
-
         Returns:
             dict: A dictionary where the keys are the names of the multiparm blocks
             and the values are lists of strings, each representing the name
             of a parameter in the multiparm template.
         """
-
-        naming_schemes = {}
-        for parm_template in self.parm_template_group.parmTemplates():
-            # Ignore separators
-            if parm_template.type() == hou.parmTemplateType.Separator:
-                continue
-            if parm_template.type() == hou.parmTemplateType.Folder:
-                folder_type = parm_template.folderType()
-                if folder_type in multiparm_types:
-                    sub_parm_names = self.get_parm_names(parm_template)
-                    sub_parm_names = [name.replace("#", "") for name in sub_parm_names]
-                    naming_schemes[parm_template.name()] = sub_parm_names
-        return naming_schemes
+        return {
+            block: list(names)
+            for block, names in self.template_analysis.multiparm_schemes.items()
+        }
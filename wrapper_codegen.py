@@ -0,0 +1,237 @@
+"""Source rendering of generated wrappers.
+
+Kept free of ``hou`` so wrappers can be generated from offline sources
+such as ``hda_index``.
+"""
+import keyword
+from typing import NamedTuple, Optional
+
+from .writers import open_writer
+
+
+# Bump when the rendered source changes, so generated packages are rewritten
+GENERATOR_VERSION = 2
+
+
+class WrapperParm(NamedTuple):
+    """A parm or parm tuple exposed by a generated wrapper.
+
+    Attributes:
+        name (str): Parm name, or parm tuple name if ``size`` > 1.
+        kind (str): ``float``, ``int``, ``string`` or ``other``.
+        size (int): Number of components.
+        folder_path (tuple): Names of the enclosing folders, outermost first.
+    """
+
+    name: str
+    kind: str
+    size: int
+    folder_path: tuple
+
+
+# How each kind of parm tuple is evaluated as a tuple
+_TUPLE_EVALS = {
+    "float": "evalAsFloats",
+    "int": "evalAsInts",
+    "string": "evalAsStrings",
+    "other": "eval",
+}
+
+
+def class_name_for(name) -> str:
+    """Turn a node or operator name into a wrapper class name."""
+    words = "".join(c if c.isalnum() else "_" for c in name).split("_")
+    class_name = "".join(word[:1].upper() + word[1:] for word in words)
+    if not class_name or class_name[0].isdigit():
+        class_name = "Node" + class_name
+    return class_name + "Wrapper"
+
+
+# Members of the generated wrappers that parms must not shadow
+_RESERVED_NAMES = {"node", "as_dict", "set_many", "PARMS"}
+
+
+def attribute_name(parm_name) -> str:
+    """Python attribute name for a parm, suffixed with ``_`` if it would clash."""
+    if keyword.iskeyword(parm_name) or parm_name in _RESERVED_NAMES:
+        return parm_name + "_"
+    return parm_name
+
+
+def multiparm_method_bases(wrapper_parms) -> dict:
+    """Base names of the ``<base>_at`` methods of multiparm templates.
+
+    The base is the template name without ``#``. Templates whose bases
+    clash, e.g. ``pos#`` and ``pos_#``, get ``_2``, ``_3``... in interface
+    order after the first one.
+
+    Args:
+        wrapper_parms (list): ``WrapperParm`` entries, without duplicate names.
+
+    Returns:
+        dict: ``{template name: base}`` of the multiparm templates.
+    """
+    bases = {}
+    taken = set()
+    for parm in wrapper_parms:
+        if "#" not in parm.name:
+            continue
+        base = candidate = parm.name.replace("#", "").strip("_") or "instance"
+        count = 1
+        while candidate in taken:
+            count += 1
+            candidate = f"{base}_{count}"
+        taken.add(candidate)
+        bases[parm.name] = candidate
+    return bases
+
+
+def render_slots_wrapper(class_name, wrapper_parms, writer=None) -> Optional[str]:
+    """Render the source of a ``__slots__`` wrapper class.
+
+    Parm and parm tuple handles are looked up once per wrapper instance, on
+    first access. Parm tuples are read as tuples. ``as_dict()`` reads every
+    parm and ``set_many()`` pushes values in one ``setParms`` call inside a
+    single undo group. Multiparm templates (names containing ``#``) become
+    ``<name>_at(*index)`` / ``set_<name>_at(value, *index)`` methods, see
+    ``multiparm_method_bases``.
+
+    Args:
+        class_name (str): Name of the generated class.
+        wrapper_parms (list): ``WrapperParm`` entries to expose.
+        writer (TextWriter, optional): Where to write the source. If not given,
+            the source is returned as a string.
+
+    Returns:
+        str: Python source of the class, without imports.
+        None: If a writer was given.
+    """
+    writer, owned = open_writer(writer)
+    wrapper_parms = list({parm.name: parm for parm in wrapper_parms}.values())
+    method_bases = multiparm_method_bases(wrapper_parms)
+    attributes = "".join(
+        f'\n        "{parm.name}": "{attribute_name(parm.name)}",'
+        for parm in wrapper_parms
+        if "#" not in parm.name
+    )
+    writer.write(
+        f"""class {class_name}:
+    __slots__ = ("node", "_parms", "_parm_tuples")
+
+    # Parm (tuple) name to property name
+    PARMS = {{{attributes}
+    }}
+
+    def __init__(self, node):
+        self.node = node
+        self._parms = {{}}
+        self._parm_tuples = {{}}
+
+    def _parm(self, name):
+        parm = self._parms.get(name)
+        if parm is None:
+            parm = self._parms[name] = self.node.parm(name)
+        return parm
+
+    def _parm_tuple(self, name):
+        parm_tuple = self._parm_tuples.get(name)
+        if parm_tuple is None:
+            parm_tuple = self._parm_tuples[name] = self.node.parmTuple(name)
+        return parm_tuple
+
+    def as_dict(self):
+        return {{name: getattr(self, attr) for name, attr in self.PARMS.items()}}
+
+    def set_many(self, values=None, **kwargs):
+        values = dict(values or {{}}, **kwargs)
+        with hou.undos.group(f"Set {{len(values)}} parms on {{self.node.path()}}"):
+            self.node.setParms(values)
+"""
+    )
+
+    folder_path = ()
+    for parm in wrapper_parms:
+        if parm.folder_path != folder_path and parm.folder_path:
+            writer.write(f"\n    # from folder {'/'.join(parm.folder_path)}\n")
+        folder_path = parm.folder_path
+
+        if "#" in parm.name:
+            writer.write(_render_multiparm_methods(parm, method_bases[parm.name]))
+            continue
+
+        if parm.size > 1:
+            getter = f'self._parm_tuple("{parm.name}").{_TUPLE_EVALS[parm.kind]}()'
+            setter = f'self._parm_tuple("{parm.name}").set(value)'
+        else:
+            getter = f'self._parm("{parm.name}").eval()'
+            setter = f'self._parm("{parm.name}").set(value)'
+        attribute = attribute_name(parm.name)
+        writer.write(
+            f"""
+    @property
+    def {attribute}(self):
+        return {getter}
+
+    @{attribute}.setter
+    def {attribute}(self, value):
+        {setter}
+"""
+        )
+    return writer.getvalue() if owned else None
+
+
+def _render_multiparm_methods(parm, base) -> str:
+    """Render the accessors of one multiparm instance template."""
+    pattern = parm.name.replace("{", "{{").replace("}", "}}").replace("#", "{}")
+    if parm.size > 1:
+        handle = f'self._parm_tuple("{pattern}".format(*index))'
+        getter = f"{handle}.{_TUPLE_EVALS[parm.kind]}()"
+    else:
+        handle = f'self._parm("{pattern}".format(*index))'
+        getter = f"{handle}.eval()"
+    return f"""
+    def {base}_at(self, *index):
+        return {getter}
+
+    def set_{base}_at(self, value, *index):
+        {handle}.set(value)
+"""
+
+
+_STUB_TYPES = {"float": "float", "int": "int", "string": "str", "other": "Any"}
+
+
+def render_wrapper_stub(class_name, wrapper_parms) -> str:
+    """Render a ``.pyi`` stub matching ``render_slots_wrapper`` output.
+
+    Args:
+        class_name (str): Name of the generated class.
+        wrapper_parms (list): ``WrapperParm`` entries to expose.
+
+    Returns:
+        str: Stub source of the class, without imports.
+    """
+    chunks = [
+        f"""class {class_name}:
+    PARMS: Dict[str, str]
+    node: hou.Node
+    def __init__(self, node: hou.Node) -> None: ...
+    def as_dict(self) -> Dict[str, Any]: ...
+    def set_many(self, values: Optional[Dict[str, Any]] = ..., **kwargs: Any) -> None: ...
+"""
+    ]
+    wrapper_parms = list({parm.name: parm for parm in wrapper_parms}.values())
+    method_bases = multiparm_method_bases(wrapper_parms)
+    for parm in wrapper_parms:
+        value_type = _STUB_TYPES[parm.kind]
+        if parm.size > 1:
+            value_type = f"Tuple[{value_type}, ...]"
+        if "#" in parm.name:
+            base = method_bases[parm.name]
+            chunks.append(
+                f"    def {base}_at(self, *index: int) -> {value_type}: ...\n"
+                f"    def set_{base}_at(self, value: {value_type}, *index: int) -> None: ...\n"
+            )
+        else:
+            chunks.append(f"    {attribute_name(parm.name)}: {value_type}\n")
+    return "".join(chunks)
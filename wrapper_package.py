@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from .wrapper_codegen import (
+    GENERATOR_VERSION,
+    WrapperParm,
+    class_name_for,
+    render_slots_wrapper,
+    render_wrapper_stub,
+)
+from .hda_index import HdaIndex
+from .writers import FileWriter
+
+
+MANIFEST = "_manifest.json"
+
+# DialogScript parm types by the way their values are read
+_FLOAT_TYPES = {
+    "float", "vector", "vector2", "vector4", "color", "color4",
+    "uv", "uvw", "direction", "angle", "log",
+}  # fmt: skip
+_INT_TYPES = {"int", "intvector", "intvector2", "intvector4", "toggle", "ordinal"}
+_STRING_TYPES = {
+    "string", "file", "image", "geometry", "directory", "oppath", "oplist", "label",
+}  # fmt: skip
+_SKIPPED_TYPES = {"button", "separator"}
+
+_INIT_TEMPLATE = '''"""Generated HDA wrappers. Do not edit, regenerate instead.
+
+Wrapper modules are imported on first attribute access.
+"""
+import importlib
+
+# Wrapper class name to module name
+_MODULES = {modules}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
+'''
+
+
+def module_name_for(operator) -> str:
+    """Turn an operator name such as ``Sop/studio::foo::2.0`` into a module name."""
+    return re.sub(r"[^0-9a-z]+", "_", operator.lower()).strip("_") or "wrapper"
+
+
+def wrapper_names(operators) -> dict:
+    """Module and class names of the wrappers of many operators.
+
+    Operators whose module or class name would clash with another one's,
+    e.g. ``Sop/foo-bar`` and ``Sop/foo_bar``, get a short hash of their
+    operator name appended to both, so no wrapper overwrites another.
+
+    Args:
+        operators (Iterable): Operator names such as ``Sop/studio::foo::2.0``.
+
+    Returns:
+        dict: ``{operator: (module name, class name)}``.
+    """
+    names = {
+        operator: (module_name_for(operator), class_name_for(operator))
+        for operator in operators
+    }
+    modules = Counter(module for module, _ in names.values())
+    classes = Counter(class_name for _, class_name in names.values())
+    for operator, (module, class_name) in names.items():
+        if modules[module] > 1 or classes[class_name] > 1:
+            suffix = hashlib.sha1(operator.encode("utf-8")).hexdigest()[:8]
+            module = f"{module}_{suffix}"
+            names[operator] = (module, class_name_for(module))
+    return names
+
+
+def _kind(dialog_type):
+    if dialog_type in _FLOAT_TYPES:
+        return "float"
+    if dialog_type in _INT_TYPES:
+        return "int"
+    if dialog_type in _STRING_TYPES:
+        return "string"
+    return "other"
+
+
+def wrapper_parms_from_interface(interface) -> list:
+    """Describe a parsed DialogScript interface for wrapper generation.
+
+    Multiparm block counters are listed before their first instance template.
+
+    Args:
+        interface (hda_index.DialogInterface): Parsed interface.
+
+    Returns:
+        list: ``WrapperParm`` entries in interface order.
+    """
+    multiparm_paths = {
+        folder.folder_path + (folder.name,): folder
+        for folder in interface.folders
+        if folder.is_multiparm
+    }
+
+    wrapper_parms = []
+    emitted_blocks = set()
+    for parm in interface.parms:
+        if parm.type in _SKIPPED_TYPES or not parm.name:
+            continue
+        for depth in range(1, len(parm.folder_path) + 1):
+            folder_path = parm.folder_path[:depth]
+            if folder_path in multiparm_paths and folder_path not in emitted_blocks:
+                emitted_blocks.add(folder_path)
+                wrapper_parms.append(
+                    WrapperParm(
+                        multiparm_paths[folder_path].name, "int", 1, folder_path[:-1]
+                    )
+                )
+        wrapper_parms.append(
+            WrapperParm(parm.name, _kind(parm.type), parm.size, parm.folder_path)
+        )
+    return wrapper_parms
+
+
+@contextmanager
+def _output(path):
+    """``FileWriter`` to a temporary file that replaces ``path`` once complete."""
+    temp_path = path + ".tmp"
+    with FileWriter(temp_path) as writer:
+        yield writer
+    os.replace(temp_path, path)
+
+
+def _write(path, text):
+    with _output(path) as writer:
+        writer.write(text)
+
+
+def generate_wrapper_package(library_paths, package_dir, index=None) -> dict:
+    """Generate an importable package of wrappers for whole HDA libraries.
+
+    Every definition gets a ``<module>.py`` with a ``__slots__`` wrapper (see
+    ``wrapper_codegen.render_slots_wrapper``) and a ``<module>.pyi`` stub.
+    The package ``__init__`` imports wrapper modules lazily through a
+    module-level ``__getattr__``. Definitions whose DialogScript, version and
+    ``GENERATOR_VERSION`` are unchanged since the last run are not parsed
+    nor rewritten; modules of definitions that disappeared are removed. Like
+    Houdini, the first library defining an operator wins.
+
+    Args:
+        library_paths (list): .hda/.otl files to generate wrappers for.
+        package_dir (str): Directory of the generated package.
+        index (hda_index.HdaIndex, optional): Index to read the libraries with.
+
+    Returns:
+        dict: ``{"generated": [...], "unchanged": [...], "removed": [...]}``
+            module names, and ``"shadowed"``: operators skipped because an
+            earlier library defines them too.
+    """
+    os.makedirs(package_dir, exist_ok=True)
+    manifest_path = os.path.join(package_dir, MANIFEST)
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        manifest = {}
+
+    own_index = index is None
+    index = index or HdaIndex()
+    report = {"generated": [], "unchanged": [], "removed": [], "shadowed": []}
+    new_manifest = {}
+    try:
+        libraries = {}
+        for library_path in library_paths:
+            library = index.open(library_path)
+            for operator in library.definitions:
+                if operator in libraries:
+                    report["shadowed"].append(f"{operator} in {library_path}")
+                    continue
+                libraries[operator] = (library_path, library)
+
+        for operator, (module, class_name) in wrapper_names(libraries).items():
+            library_path, library = libraries[operator]
+            definition = library.definitions[operator]
+            dialog_script = library.read_section(operator, "DialogScript") or ""
+            source = f"{GENERATOR_VERSION}\0{definition.version}\0{dialog_script}"
+            digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+            new_manifest[module] = {
+                "operator": operator,
+                "class": class_name,
+                "library": os.path.abspath(library_path),
+                "hash": digest,
+            }
+
+            previous = manifest.get(module)
+            module_path = os.path.join(package_dir, module + ".py")
+            if (
+                previous
+                and previous["hash"] == digest
+                and previous["class"] == class_name
+                and os.path.exists(module_path)
+            ):
+                report["unchanged"].append(module)
+                continue
+
+            wrapper_parms = wrapper_parms_from_interface(library.interface(operator))
+            header = f"# Generated from {operator} in {library_path}\n"
+            with _output(module_path) as writer:
+                writer.write(header + "import hou\n\n\n")
+                render_slots_wrapper(class_name, wrapper_parms, writer)
+            _write(
+                os.path.join(package_dir, module + ".pyi"),
+                header
+                + "from typing import Any, Dict, Optional, Tuple\n\nimport hou\n\n"
+                + render_wrapper_stub(class_name, wrapper_parms),
+            )
+            report["generated"].append(module)
+    finally:
+        if own_index:
+            index.close()
+
+    for module in set(manifest) - set(new_manifest):
+        for extension in (".py", ".pyi"):
+            path = os.path.join(package_dir, module + extension)
+            if os.path.exists(path):
+                os.remove(path)
+        report["removed"].append(module)
+
+    modules = {entry["class"]: module for module, entry in sorted(new_manifest.items())}
+    modules_source = "{" + "".join(
+        f'\n    "{class_name}": "{module}",' for class_name, module in modules.items()
+    ) + ("\n}" if modules else "}")
+    _write(
+        os.path.join(package_dir, "__init__.py"),
+        _INIT_TEMPLATE.format(modules=modules_source),
+    )
+    _write(
+        os.path.join(package_dir, "__init__.pyi"),
+        "".join(
+            f"from .{module} import {class_name} as {class_name}\n"
+            for class_name, module in modules.items()
+        ),
+    )
+    _write(manifest_path, json.dumps(new_manifest, indent=1, sort_keys=True))
+    return report
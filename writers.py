@@ -0,0 +1,85 @@
+from abc import ABCMeta, abstractmethod
+
+
+class TextWriter(metaclass=ABCMeta):
+    """Sink for text produced chunk by chunk.
+
+    Generators write small chunks as they go instead of concatenating
+    strings, so output grows in linear time and can go straight to a file
+    without holding the whole text.
+    """
+
+    def __init__(self):
+        # Characters, not bytes: the encoding is up to the sink
+        self.chars_written = 0
+
+    def write(self, chunk):
+        """Write one chunk of text."""
+        self.chars_written += len(chunk)
+        self._write(chunk)
+
+    @abstractmethod
+    def _write(self, chunk):
+        raise NotImplementedError("This method must be implemented by a subclass")
+
+    def flush(self):
+        """Push out anything held back."""
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BufferWriter(TextWriter):
+    """Collect chunks in memory and join them once."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def _write(self, chunk):
+        self.chunks.append(chunk)
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+
+class FileWriter(TextWriter):
+    """Write chunks to a file path or an open text stream."""
+
+    def __init__(self, path_or_stream, encoding="utf-8"):
+        super().__init__()
+        self.owns_stream = isinstance(path_or_stream, str)
+        self.stream = (
+            open(path_or_stream, "w", encoding=encoding)
+            if self.owns_stream
+            else path_or_stream
+        )
+
+    def _write(self, chunk):
+        self.stream.write(chunk)
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.owns_stream:
+            self.stream.close()
+
+
+def open_writer(writer):
+    """Use the given writer, or a new ``BufferWriter`` if there is none.
+
+    Returns:
+        tuple: ``(writer, owned)``, owned being True for a new buffer whose
+        value the caller should return.
+    """
+    if writer is None:
+        return BufferWriter(), True
+    return writer, False